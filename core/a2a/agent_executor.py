@@ -1,26 +1,18 @@
+import os
+import sys
+
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.types import Message as A2aMessage
 from a2a.utils import new_agent_text_message
-from mcp.client.streamable_http import streamablehttp_client
 from strands import Agent
 from strands.models.openai import OpenAIModel
 from strands.tools.executors import ConcurrentToolExecutor
-from strands.tools.mcp.mcp_client import MCPClient, MCPAgentTool
 from strands.types.content import Message, ContentBlock
 
-
-class ToolService:
-    def __init__(self):
-        self.alpha = MCPClient(lambda: streamablehttp_client("http://localhost:9011/mcp"))
-        self.beta = MCPClient(lambda: streamablehttp_client("http://localhost:9012/mcp"))
-
-    def list_tools(self) -> list[MCPAgentTool]:
-        tools: list[MCPAgentTool] = []
-        with self.alpha, self.beta:
-            tools += self.alpha.list_tools_sync()
-            tools += self.beta.list_tools_sync()
-        return tools
+# the MCP settings and transports are shared with the client app (core/client/common)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'client'))
+from common.mcp.agent_tools import StructuredResultText, ToolService  # noqa: E402
 
 
 class HelloWorldAgent:
@@ -39,6 +31,7 @@ class HelloWorldAgent:
             model=model,
             tools=self.tool_service.list_tools(),
             tool_executor=ConcurrentToolExecutor(),
+            hooks=[StructuredResultText()],
             system_prompt="You are a helpful assistant."
         )
 
@@ -51,7 +44,7 @@ class HelloWorldAgent:
                     ContentBlock(text=part.root.text)
                 )
 
-        with self.tool_service.alpha, self.tool_service.beta:
+        with self.tool_service:
             result = self.llm([message])
 
         # Access metrics through the AgentResult
@@ -0,0 +1,151 @@
+"""
+Scaling benchmark of OpenAIContextManager over long conversations.
+
+Every turn appends a user message, a function call with its tool output and an assistant message, then
+does what a PnE step does with the context: looks up invoked tools, serializes it for the model call,
+reads the last assistant message and logs the repr. Compares the previous implementation, which
+re-serialized and scanned the whole context on each of these, with the incremental one.
+
+usage (run from core/client):
+    python -m benchmark.context_scaling --turns 10 100 1000
+"""
+import argparse
+import json
+import time
+from typing import Any, Optional, Union
+
+from openai.types.responses import ResponseFunctionToolCall, ResponseOutputMessage, ResponseOutputText
+
+from common.llm.model import AvailableTool, McpTool, PlainInputPrompt
+from common.llm.openai_provider.message import OpenAIContextManager
+
+
+class LegacyContextManager:
+    """copy of the previous OpenAIContextManager, kept as the baseline"""
+
+    def __init__(self):
+        self.prompts: list = []
+        self.available_tools: list[AvailableTool] = []
+        self.instruction: Optional[str] = None
+
+    def __add__(self, other: Union[list, Any]) -> 'LegacyContextManager':
+        if isinstance(other, (list, tuple)):
+            for _other in other:
+                self.append(_other)
+        else:
+            self.append(other)
+        return self
+
+    def __repr__(self):
+        _text = "[OpenAIContextManager]\n"
+        _text += "\t" + f"[instruction]: {self.instruction}" + "\n"
+        for prompt in self.to_list():
+            _text += "\t" + repr(prompt) + '\n'
+        _text += "\t" + f"[Available Tools]" + "\n"
+        for tool in self.available_tools:
+            _text += "\t" + repr(tool) + '\n'
+        return _text
+
+    def get_invoked_tools(self) -> list[McpTool]:
+        invoked_tools = []
+        for p in self.prompts:
+            if isinstance(p, McpTool) and (not p.output):
+                invoked_tools.append(p)
+        return invoked_tools
+
+    def get_last_assistant_message(self) -> PlainInputPrompt:
+        message = []
+        for prompt in self.prompts:
+            if isinstance(prompt, PlainInputPrompt) and prompt.role == 'assistant':
+                message.append(prompt)
+        return message[-1]
+
+    def append(self, prompt: Any):
+        prompt_type = getattr(prompt, 'type', None)
+        if (prompt_type is None) or (prompt_type == 'custom_message'):
+            if isinstance(prompt, AvailableTool):
+                self.available_tools.append(prompt)
+            elif isinstance(prompt, PlainInputPrompt) and prompt.role == 'system':
+                self.instruction = prompt.content
+            else:
+                self.prompts.append(prompt)
+        elif prompt_type == 'function_call':
+            self.prompts.append(prompt)
+            self.prompts.append(
+                McpTool(
+                    call_id=prompt.call_id,
+                    function_name=prompt.name,
+                    function_param=json.loads(prompt.arguments),
+                )
+            )
+        elif prompt_type == 'message':
+            self.prompts.append(PlainInputPrompt(role=prompt.role, content=prompt.content[0].text))
+        else:
+            self.prompts.append(prompt)
+
+    def to_list(self):
+        prompts = []
+        for p in self.prompts:
+            if isinstance(p, McpTool):
+                prompts.append({"type": "function_call_output", "call_id": p.call_id, "output": p.function_result})
+            elif isinstance(p, PlainInputPrompt):
+                prompts.append({'role': p.role, 'content': p.content})
+            else:
+                prompts.append(p)
+        return prompts
+
+
+TOOL_OUTPUT = json.dumps({'user_id': 'M4386', 'name': 'Kim', 'orders': [{'id': i, 'price': i * 10} for i in range(20)]})
+
+
+def function_call(turn: int) -> ResponseFunctionToolCall:
+    return ResponseFunctionToolCall(
+        type='function_call', id=f"fc_{turn}", call_id=f"call_{turn}", name='alpha_get_user_name',
+        arguments=json.dumps({'user_id': 'M4386'}), status='completed',
+    )
+
+
+def assistant_message(turn: int) -> ResponseOutputMessage:
+    return ResponseOutputMessage(
+        type='message', id=f"msg_{turn}", role='assistant', status='completed',
+        content=[ResponseOutputText(type='output_text', text=f"step {turn} done", annotations=[])],
+    )
+
+
+def run(context_class: type, turns: int) -> dict:
+    context = context_class()
+    context += PlainInputPrompt(role='system', content='you are a helpful assistant')
+    start = time.perf_counter()
+    for turn in range(turns):
+        context += PlainInputPrompt(role='user', content=f"question {turn}")
+        context += function_call(turn)
+        for tool in context.get_invoked_tools():
+            tool.output.append(TOOL_OUTPUT)
+        context.to_list()
+        context += assistant_message(turn)
+        context.get_last_assistant_message()
+        repr(context)
+    elapsed = time.perf_counter() - start
+    return {
+        'implementation': context_class.__name__,
+        'turns': turns,
+        'total_ms': round(elapsed * 1000, 2),
+        'per_turn_us': round(elapsed / turns * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--turns', type=int, nargs='+', default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    for turns in args.turns:
+        legacy = run(LegacyContextManager, turns)
+        incremental = run(OpenAIContextManager, turns)
+        incremental['speedup'] = round(legacy['total_ms'] / incremental['total_ms'], 1)
+        print(json.dumps(legacy))
+        print(json.dumps(incremental))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+"""
+End-to-end benchmark of the client API routes under concurrency.
+
+Starts the whole stack locally: the LLM stand-in (benchmark/llm_server.py, `--ttft` / `--token-rate`), the MCP
+gateway (core/server/gateway.py, unless `--mcp-transport memory`) and the `client.py` app under uvicorn
+pointed at both. For every route and `--concurrency` level that many clients send requests back to back for
+`--duration` seconds after a `--warmup`, and the run reports:
+- requests per second, errors, time to first byte and total latency (p50 / p95 / p99) seen by the clients
+- model, MCP and overhead time per request from the app's `/metrics/timings` (see common/timing.py),
+  overhead being the request time during which neither a model nor an MCP call was in flight
+- RSS of the app, idle and peak, and the peak growth per concurrent session
+
+The requests repeat the default questions, so after the warmup tool results come from the tool result
+cache; `--no-result-cache` disables it to measure the MCP calls.
+
+Results are written as JSON to `--output/e2e-<git sha>.json` (`-dirty` suffix with uncommitted changes),
+`--compare <sha or file>` prints the change of throughput, p95 and overhead against an earlier run.
+The clients share the machine with the stack, compare runs made on the same host.
+
+usage (run from core/client):
+    python -m benchmark.e2e --concurrency 1 4 16 --duration 10
+    python -m benchmark.e2e --routes chat_stream pne_complete --ttft 0.3 --token-rate 80 --compare 3a3f9ab
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from common.config import McpServerConfig
+
+CLIENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# route name: (method, path, body)
+ROUTES = {
+    'tool_list': ('GET', '/tool/list', None),
+    'chat_complete': ('POST', '/chat/main/complete', {}),
+    'chat_stream': ('POST', '/chat/main/stream', {}),
+    'pne_complete': ('POST', '/pne/complete', {}),
+    'pne_stream': ('POST', '/pne/stream', {}),
+}
+
+
+class Process:
+    """a local server process in its own session, RSS read from /proc"""
+
+    def __init__(self, name: str, command: list[str], port: int, cwd: str, env: dict[str, str]):
+        self.name = name
+        self.port = port
+        self.process = subprocess.Popen(
+            command, cwd=cwd, env={**os.environ, **env}, start_new_session=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def wait_ready(self, timeout: float = 120) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'[{self.name}] exited with {self.process.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=0.5).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise TimeoutError(f'[{self.name}] not listening on {self.port}')
+
+    def rss_mb(self) -> float:
+        total = 0
+        for pid in filter(str.isdigit, os.listdir('/proc')):
+            try:
+                with open(f'/proc/{pid}/stat') as stat:
+                    # fields after the command name: state, ppid, pgrp, session, ...
+                    if int(stat.read().rsplit(')', 1)[1].split()[3]) != self.process.pid:
+                        continue
+                with open(f'/proc/{pid}/statm') as statm:
+                    total += int(statm.read().split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+        return total * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+    def stop(self) -> None:
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def start_stack(args: argparse.Namespace) -> list[Process]:
+    """LLM stand-in, MCP gateway and client app, in start order"""
+    llm_port, mcp_port, app_port = args.port, args.port + 1, args.port + 2
+    processes = [Process('llm', [
+        sys.executable, '-m', 'benchmark.llm_server', '--port', str(llm_port), '--ttft', str(args.ttft),
+        '--prefill-rate', str(args.prefill_rate), '--token-rate', str(args.token_rate),
+        '--answer-tokens', str(args.answer_tokens),
+    ], llm_port, CLIENT_DIR, {})]
+    if args.mcp_transport == 'http':
+        processes.append(Process('gateway', [
+            'fastmcp', 'run', 'gateway.py', '--transport', 'http', '--port', str(mcp_port),
+        ], mcp_port, McpServerConfig.server_path, {'TOOL_LOG_MODE': os.environ.get('TOOL_LOG_MODE', 'sampled')}))
+    processes.append(Process('app', [
+        sys.executable, '-m', 'uvicorn', 'client:main', '--factory', '--port', str(app_port), '--log-level', 'warning',
+    ], app_port, CLIENT_DIR, {
+        'OPENAI_BASE_URL': f'http://127.0.0.1:{llm_port}/v1',
+        'OPENAI_API_KEY': 'stand-in',
+        'MCP_SERVER_MODE': 'gateway',
+        'MCP_TRANSPORT': args.mcp_transport,
+        'MCP_GATEWAY_URL': f'http://127.0.0.1:{mcp_port}/mcp',
+        **({'MCP_TOOL_RESULT_CACHE_SIZE': '0'} if args.no_result_cache else {}),
+    }))
+    try:
+        for process in processes:
+            process.wait_ready()
+    except Exception:
+        stop_stack(processes)
+        raise
+    return processes
+
+
+def stop_stack(processes: list[Process]) -> None:
+    for process in reversed(processes):
+        process.stop()
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def request(client: httpx.AsyncClient, route: str) -> tuple[float, float, bool]:
+    """(time to first byte, total time, failed) of one request, streamed bodies are read to the end"""
+    method, path, body = ROUTES[route]
+    start = time.perf_counter()
+    first_byte = None
+    try:
+        async with client.stream(method, path, json=body) as response:
+            async for chunk in response.aiter_raw():
+                if first_byte is None and chunk:
+                    first_byte = time.perf_counter() - start
+            failed = response.status_code != 200
+    except httpx.HTTPError:
+        failed = True
+    total = time.perf_counter() - start
+    return (first_byte if first_byte is not None else total), total, failed
+
+
+async def route_timings(client: httpx.AsyncClient, path: str) -> dict:
+    response = await client.get('/metrics/timings')
+    return response.json()['routes'].get(path) or {}
+
+
+def timing_delta(before: dict, after: dict) -> dict:
+    """per request means of the app's own timings between two snapshots"""
+    requests = after.get('requests', 0) - before.get('requests', 0)
+    if requests <= 0:
+        return {}
+
+    def mean_ms(field: str) -> float:
+        return round((after[f'{field}_seconds'] - before.get(f'{field}_seconds', 0.0)) / requests * 1000, 2)
+
+    return {
+        'app_total_ms': mean_ms('total'),
+        'model_ms': mean_ms('model'),
+        'mcp_ms': mean_ms('mcp'),
+        'overhead_ms': mean_ms('overhead'),
+        'model_calls': round((after['model_calls'] - before.get('model_calls', 0)) / requests, 2),
+        'mcp_calls': round((after['mcp_calls'] - before.get('mcp_calls', 0)) / requests, 2),
+    }
+
+
+async def run_load(app: Process, route: str, concurrency: int, duration: float, warmup: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{app.port}', limits=limits, timeout=120) as client:
+        samples: list[tuple[float, float, bool]] = []
+        measuring = False
+        stop_at = 0.0
+
+        async def worker():
+            while time.monotonic() < stop_at:
+                sample = await request(client, route)
+                if measuring:
+                    samples.append(sample)
+
+        async def sample_rss(peak: list[float]):
+            while time.monotonic() < stop_at:
+                peak[0] = max(peak[0], app.rss_mb())
+                await asyncio.sleep(0.25)
+
+        stop_at = time.monotonic() + warmup
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+        idle_rss = app.rss_mb()
+        peak_rss = [idle_rss]
+        path = ROUTES[route][1]
+        before = await route_timings(client, path)
+        measuring = True
+        started = time.perf_counter()
+        stop_at = time.monotonic() + duration
+        await asyncio.gather(sample_rss(peak_rss), *[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+        after = await route_timings(client, path)
+
+    first_bytes = sorted(sample[0] for sample in samples)
+    totals = sorted(sample[1] for sample in samples)
+    ms = 1000
+    return {
+        'route': route,
+        'concurrency': concurrency,
+        'requests': len(samples),
+        'errors': sum(sample[2] for sample in samples),
+        'requests_per_s': round(len(samples) / elapsed, 2),
+        'ttfb_p50_ms': round(percentile(first_bytes, 0.50) * ms, 2),
+        'ttfb_p95_ms': round(percentile(first_bytes, 0.95) * ms, 2),
+        'p50_ms': round(percentile(totals, 0.50) * ms, 2),
+        'p95_ms': round(percentile(totals, 0.95) * ms, 2),
+        'p99_ms': round(percentile(totals, 0.99) * ms, 2),
+        'mean_ms': round(statistics.mean(totals) * ms, 2),
+        **timing_delta(before, after),
+        'app_rss_idle_mb': round(idle_rss, 1),
+        'app_rss_peak_mb': round(peak_rss[0], 1),
+        'app_rss_per_session_kb': round((peak_rss[0] - idle_rss) * 1024 / concurrency, 1),
+    }
+
+
+def git_revision() -> str:
+    def git(*args: str) -> str:
+        return subprocess.run(['git', *args], cwd=CLIENT_DIR, capture_output=True, text=True).stdout.strip()
+
+    sha = git('rev-parse', '--short', 'HEAD') or 'unknown'
+    return f'{sha}-dirty' if git('status', '--porcelain', '--untracked-files=no') else sha
+
+
+def load_runs(path: str) -> dict[tuple, dict]:
+    with open(path) as results_file:
+        return {(run['route'], run['concurrency']): run for run in json.load(results_file)['runs']}
+
+
+def compare(results: list[dict], baseline: dict[tuple, dict]) -> None:
+    def change(run: dict, before: dict, field: str):
+        if not before.get(field) or field not in run:
+            return None
+        return round((run[field] / before[field] - 1) * 100, 1)
+
+    for run in results:
+        before = baseline.get((run['route'], run['concurrency']))
+        if before is None:
+            continue
+        print(json.dumps({
+            'route': run['route'], 'concurrency': run['concurrency'],
+            'requests_per_s_change_pct': change(run, before, 'requests_per_s'),
+            'p95_change_pct': change(run, before, 'p95_ms'),
+            'overhead_change_pct': change(run, before, 'overhead_ms'),
+        }))
+
+
+async def main_async(args: argparse.Namespace) -> list[dict]:
+    processes = start_stack(args)
+    app = processes[-1]
+    results = []
+    try:
+        for route in args.routes:
+            for concurrency in args.concurrency:
+                result = await run_load(app, route, concurrency, args.duration, args.warmup)
+                print(json.dumps(result))
+                results.append(result)
+    finally:
+        stop_stack(processes)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--routes', nargs='+', default=list(ROUTES), choices=list(ROUTES))
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--duration', type=float, default=10.0, help='measured seconds per run')
+    parser.add_argument('--warmup', type=float, default=2.0, help='unmeasured seconds before every run')
+    parser.add_argument('--ttft', type=float, default=0.2, help='stand-in seconds before the first token')
+    parser.add_argument('--prefill-rate', type=float, default=0.0, help='stand-in input tokens per second')
+    parser.add_argument('--token-rate', type=float, default=100.0, help='stand-in output tokens per second')
+    parser.add_argument('--answer-tokens', type=int, default=50, help='stand-in length of text answers')
+    parser.add_argument('--mcp-transport', default='http', choices=['http', 'memory'])
+    parser.add_argument('--no-result-cache', action='store_true',
+                        help='disable the tool result cache, every request pays its MCP calls')
+    parser.add_argument('--port', type=int, default=9120, help='stand-in port, gateway and app take the next two')
+    parser.add_argument('--output', default=os.path.join(CLIENT_DIR, 'benchmark', 'results'))
+    parser.add_argument('--compare', help='git sha or JSON file of an earlier run')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        # read before running: a run of the same revision overwrites the file
+        path = args.compare if os.path.exists(args.compare) else os.path.join(args.output, f'e2e-{args.compare}.json')
+        baseline = load_runs(path)
+
+    results = asyncio.run(main_async(args))
+
+    revision = git_revision()
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f'e2e-{revision}.json')
+    with open(path, 'w') as output:
+        json.dump({
+            'revision': revision,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'host': {'cpus': os.cpu_count(), 'python': sys.version.split()[0], 'platform': platform.platform()},
+            'args': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+            'runs': results,
+        }, output, indent=2, ensure_ascii=False)
+    print(f'results written to {path}')
+
+    if baseline is not None:
+        compare(results, baseline)
+
+
+if __name__ == '__main__':
+    main()
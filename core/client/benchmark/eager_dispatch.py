@@ -0,0 +1,101 @@
+"""
+Latency saved by dispatching MCP tool calls while the model is still generating the next parallel call.
+
+The model is a MockTransport streaming `--calls` parallel function calls, each taking `--call-interval`
+seconds to generate, the MCP server is a stub answering after 0.5x to 2x `--tool-latency` seconds
+(fixed seed, the same latencies in both modes).
+
+after_stream: every call is started once the model response finished (previous behaviour)
+eager:        ToolDispatcher starts each call on its `function_call_arguments.done` event
+
+usage (run from core/client):
+    python -m benchmark.eager_dispatch --calls 4 --call-interval 0.15 --tool-latency 0.3
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+from mcp.types import CallToolResult, TextContent
+
+from benchmark.mock_openai import function_call_item, function_call_stream
+from common.config import OpenAIConfig
+from common.llm.model import PlainInputPrompt
+from common.llm.openai_provider.message import OpenAIContextManager
+from common.llm.openai_provider.model import OpenAIProvider
+from common.mcp.dispatch import ToolDispatcher
+
+
+class StubMcpClient:
+    def __init__(self, latency: float, calls: int):
+        rng = random.Random(0)
+        self.latencies = {f"M{i}": latency * rng.uniform(0.5, 2.0) for i in range(calls)}
+
+    async def call_tool_mcp(self, name: str, arguments: dict) -> CallToolResult:
+        await asyncio.sleep(self.latencies[arguments['user_id']])
+        return CallToolResult(content=[TextContent(type='text', text=json.dumps(arguments))])
+
+
+class FunctionCallBenchmarkProvider(OpenAIProvider):
+    calls: int = 4
+    call_interval: float = 0.15
+
+    def _build_http_client(self):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls = [function_call_item(i, 'alpha_get_user_name', {'user_id': f"M{i}"}) for i in range(self.calls)]
+            body = function_call_stream(calls, 0.05, self.call_interval)
+            return httpx.Response(200, headers={'content-type': 'text/event-stream'}, content=body)
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def run(mode: str, calls: int, call_interval: float, tool_latency: float) -> dict:
+    OpenAIConfig.transport = 'async'
+    provider_class = type(f"FunctionCallBenchmarkProvider_{mode}", (FunctionCallBenchmarkProvider,), {
+        'calls': calls, 'call_interval': call_interval,
+    })
+    provider = provider_class(api_key='benchmark')
+    client = StubMcpClient(tool_latency, calls)
+
+    context = OpenAIContextManager()
+    context += PlainInputPrompt(role='user', content='look up these users')
+    dispatcher = ToolDispatcher(client)
+    start = time.perf_counter()
+    async for event in provider.stream_with_tools(context):
+        if isinstance(event, str):
+            continue
+        context += event
+        if event.type == 'function_call' and mode != 'after_stream':
+            dispatcher.submit(context.get_invoked_tool(event.call_id))
+    if mode == 'after_stream':
+        for tool in context.get_invoked_tools():
+            dispatcher.submit(tool)
+    dispatcher.model_done()
+    await dispatcher.join()
+    elapsed = time.perf_counter() - start
+    await provider.aclose()
+
+    # results are merged in call order
+    outputs = [entry['output'] for entry in context.to_list()
+               if isinstance(entry, dict) and entry.get('type') == 'function_call_output']
+    assert outputs == [json.dumps([json.dumps({'user_id': f"M{i}"})]) for i in range(calls)]
+    return {'mode': mode, 'tools_ready_ms': round(elapsed * 1000, 2), **dispatcher.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=4)
+    parser.add_argument('--call-interval', type=float, default=0.15)
+    parser.add_argument('--tool-latency', type=float, default=0.3)
+    args = parser.parse_args()
+
+    # warm up the lazily imported event types
+    asyncio.run(run('warmup', 1, 0.0, 0.0))
+    for mode in ('after_stream', 'eager'):
+        print(json.dumps(asyncio.run(run(mode, args.calls, args.call_interval, args.tool_latency))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Time to first frame of ChatService.stream for a direct answer (no tool needed).
+
+legacy:   blocking `invoke_tools` call, then the whole context again through `chat_stream`
+            (the answer of the first call was thrown away when no tool was called)
+streamed: one `stream_with_tools` call, text deltas of a direct answer are forwarded as they arrive
+
+The model is a MockTransport emitting `--tokens` tokens after `--first-token-delay`, the non streamed
+call answers once the whole text would have been generated.
+
+usage (run from core/client):
+    python -m benchmark.first_turn_latency --tokens 300 --token-interval 0.005
+"""
+import argparse
+import asyncio
+import json
+from typing import AsyncIterable
+
+import httpx
+
+from benchmark.mock_openai import text_body, text_stream
+from common.config import OpenAIConfig
+from common.llm.model import PlainInputPrompt
+from common.llm.openai_provider.message import OpenAIContextManager
+from common.llm.openai_provider.model import OpenAIProvider
+from common.llm.stream import StreamStats, coalesce, to_sse
+
+
+class FirstTurnBenchmarkProvider(OpenAIProvider):
+    tokens: list[str] = []
+    first_token_delay: float = 0.2
+    token_interval: float = 0.005
+    calls: int = 0
+
+    def _build_http_client(self):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.calls += 1
+            if json.loads(request.content).get('stream'):
+                body = text_stream(self.tokens, self.first_token_delay, self.token_interval)
+                return httpx.Response(200, headers={'content-type': 'text/event-stream'}, content=body)
+            await asyncio.sleep(self.first_token_delay + len(self.tokens) * self.token_interval)
+            return httpx.Response(200, json=text_body(self.tokens))
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def new_context() -> OpenAIContextManager:
+    context = OpenAIContextManager()
+    context += PlainInputPrompt(role='system', content='you are a helpful assistant')
+    context += PlainInputPrompt(role='user', content='hello')
+    return context
+
+
+async def legacy(provider: OpenAIProvider) -> AsyncIterable[str]:
+    context = new_context()
+    context += await provider.invoke_tools(context)
+    if not context.get_invoked_tools():
+        async for event in provider.chat_stream(context):
+            yield event
+
+
+async def streamed(provider: OpenAIProvider) -> AsyncIterable[str]:
+    context = new_context()
+    async for event in provider.stream_with_tools(context):
+        if isinstance(event, str):
+            yield event
+        else:
+            context += event
+
+
+async def run(mode: str, tokens: int, first_token_delay: float, token_interval: float) -> dict:
+    OpenAIConfig.transport = 'async'
+    # a class per mode, the provider is a singleton per class
+    provider_class = type(f"FirstTurnBenchmarkProvider_{mode}", (FirstTurnBenchmarkProvider,), {
+        'tokens': [f"tok{i} " for i in range(tokens)],
+        'first_token_delay': first_token_delay,
+        'token_interval': token_interval,
+    })
+    provider = provider_class(api_key='benchmark')
+
+    generate = legacy if mode == 'legacy' else streamed
+    stats = StreamStats()
+    async for _ in to_sse(coalesce(generate(provider)), stats):
+        pass
+    await provider.aclose()
+    return {'mode': mode, 'model_calls': provider.calls, **stats.summary()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=300)
+    parser.add_argument('--first-token-delay', type=float, default=0.2)
+    parser.add_argument('--token-interval', type=float, default=0.005)
+    args = parser.parse_args()
+
+    for mode in ('legacy', 'streamed'):
+        print(json.dumps(asyncio.run(run(mode, args.tokens, args.first_token_delay, args.token_interval))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,558 @@
+"""
+Deterministic local stand-in of the OpenAI Responses and Chat Completions APIs for offline end-to-end runs.
+
+Every client route can run against it instead of OpenAI: `ChatService` and `PlanAndExecuteChatService` use the
+Responses API (`create`, `parse` through json_schema text formats, streaming, function calls and
+`previous_response_id` chains), the LangGraph PnE, strands and a2a agents use Chat Completions. All of them
+read `OPENAI_BASE_URL`, so no code change is needed to point them here.
+
+The "model" is a fixed policy over the request, the same request always gets the same answer:
+- function calls: when tools are offered and nothing was answered since the last user message, the tools
+  named in that message are called, otherwise the tools whose name words (server prefix and verbs removed)
+  all appear in it; identifier parameters (`user_id`, `product_code`, ...) are filled with the identifiers
+  of the message (`M4386`, `JEJU001`) following the parameter's entity word (`user` for `user_id`), a tool
+  whose required identifier is missing is not called.
+  A message containing `DO NOT call function` (the planning prompts) gets no calls
+- structured output: an instance of the requested json_schema is synthesized; in a union the branch holding
+  an array (a plan) is chosen for a fresh question and the other one (a final answer) once the conversation
+  contains answers, tool results or the replanning marker `currently done`; plan arrays hold one step per
+  selected tool, numbered from 1, arrays inside a step (its dependencies) are empty
+- text: a summary of the tool results after the last user message, or an echo of the question, padded or
+  cut to `--answer-tokens` tokens
+
+Tokens are whitespace separated words. A response waits `--ttft` plus its input tokens at `--prefill-rate`
+before the first output token, then emits `--token-rate` tokens per second (also when not streamed).
+`GET /stats` returns the request, token and model time counters, `POST /stats/reset` clears them.
+
+usage (run from core/client):
+    python -m benchmark.llm_server --port 9030 --ttft 0.3 --token-rate 80
+    OPENAI_BASE_URL=http://localhost:9030/v1 OPENAI_API_KEY=stub uvicorn client:main
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+NO_TOOL_MARKER = 'do not call function'
+PROGRESS_MARKER = 'currently done'
+VERBS = {'get', 'find', 'list', 'search', 'set', 'by', 'of', 'for', 'the'}
+IDENTIFIER = re.compile(r'\b(?=[A-Za-z0-9]*\d)[A-Z][A-Za-z0-9]{2,}\b')
+NUMBER = re.compile(r'(?<![\w.])\d+(?:\.\d+)?(?![\w.])')
+IDENTIFIER_PARAMS = ('id', 'code', 'key', 'sku')
+
+
+class Latency:
+    """timing of the stand-in, set from the command line"""
+    ttft = 0.0
+    prefill_rate = 0.0
+    token_rate = 0.0
+    answer_tokens = 50
+    max_tool_calls = 8
+
+
+class Stats:
+    requests = 0
+    streamed = 0
+    function_calls = 0
+    input_tokens = 0
+    output_tokens = 0
+    model_seconds = 0.0
+
+    @classmethod
+    def to_dict(cls) -> dict:
+        return {
+            'requests': cls.requests,
+            'streamed': cls.streamed,
+            'function_calls': cls.function_calls,
+            'input_tokens': cls.input_tokens,
+            'output_tokens': cls.output_tokens,
+            'model_seconds': round(cls.model_seconds, 3),
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.requests = cls.streamed = cls.function_calls = cls.input_tokens = cls.output_tokens = 0
+        cls.model_seconds = 0.0
+
+
+def count_tokens(value: Any) -> int:
+    return len(str(value).split())
+
+
+def prefill_delay(input_tokens: int) -> float:
+    return Latency.ttft + (input_tokens / Latency.prefill_rate if Latency.prefill_rate > 0 else 0.0)
+
+
+def token_delay(tokens: int) -> float:
+    return tokens / Latency.token_rate if Latency.token_rate > 0 else 0.0
+
+
+def split_tokens(text: str) -> list[str]:
+    return re.findall(r'\S+\s*', text) or ['']
+
+
+def _text(content: Any) -> str:
+    """text of a message content, a string or a list of content parts"""
+    if content is None:
+        return ''
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return ' '.join(part.get('text', '') if isinstance(part, dict) else str(part) for part in content)
+    return str(content)
+
+
+def responses_turns(items: Any) -> list[tuple[str, str]]:
+    """(role, text) turns of a Responses input, tool calls and their outputs as `tool_call` / `tool`"""
+    if isinstance(items, str):
+        return [('user', items)]
+    turns = []
+    for item in items:
+        kind = item.get('type')
+        if kind == 'function_call':
+            turns.append(('tool_call', f"{item['name']} {item['arguments']}"))
+        elif kind == 'function_call_output':
+            turns.append(('tool', _text(item.get('output'))))
+        elif 'role' in item:
+            turns.append((item['role'], _text(item.get('content'))))
+    return turns
+
+
+def chat_turns(messages: list[dict]) -> list[tuple[str, str]]:
+    turns = []
+    for message in messages:
+        role = message['role']
+        if role == 'tool':
+            turns.append(('tool', _text(message.get('content'))))
+            continue
+        if message.get('content'):
+            turns.append((role, _text(message['content'])))
+        for call in message.get('tool_calls') or []:
+            turns.append(('tool_call', f"{call['function']['name']} {call['function']['arguments']}"))
+    return turns
+
+
+class Conversation:
+    """what the policy looks at: the last user message and what happened after it"""
+
+    def __init__(self, turns: list[tuple[str, str]], instructions: Optional[str] = None):
+        if instructions:
+            turns = [('system', instructions)] + turns
+        # a prompt made of system messages only (e.g. a replanner template) is asked by its last one
+        last_user = max((i for i, (role, _) in enumerate(turns) if role == 'user'), default=-1)
+        if last_user < 0:
+            last_user = max((i for i, (role, _) in enumerate(turns) if role in ('system', 'developer')), default=-1)
+        self.question = turns[last_user][1] if last_user >= 0 else ''
+        after = turns[last_user + 1:]
+        self.results = [text for role, text in after if role == 'tool']
+        self.answered = any(role in ('assistant', 'tool', 'tool_call') for role, _ in after)
+        prompts = ' '.join(text for role, text in turns if role in ('system', 'developer', 'user')).lower()
+        self.progressed = self.answered or PROGRESS_MARKER in prompts
+        self.no_tools = NO_TOOL_MARKER in prompts
+
+
+def _name_words(name: str) -> list[str]:
+    words = name.lower().split('_')
+    if len(words) > 2 and words[1] in VERBS:
+        words = words[1:]  # server prefix of a mounted tool, e.g. alpha_get_user_name
+    return [word for word in words if word not in VERBS]
+
+
+def _is_identifier_param(name: str) -> bool:
+    return any(name.lower() == hint or name.lower().endswith('_' + hint) for hint in IDENTIFIER_PARAMS)
+
+
+def _resolve(schema: dict, defs: dict) -> dict:
+    while '$ref' in schema:
+        schema = defs[schema['$ref'].rsplit('/', 1)[-1]]
+    return schema
+
+
+def _schema_type(schema: dict) -> Optional[str]:
+    kind = schema.get('type')
+    if isinstance(kind, list):
+        return next((k for k in kind if k != 'null'), 'null')
+    return kind
+
+
+def _is_nullable(schema: dict) -> bool:
+    """strict schemas list optional parameters as required, with null among their types"""
+    kind = schema.get('type')
+    return (isinstance(kind, list) and 'null' in kind) or any(
+        branch.get('type') == 'null' for branch in schema.get('anyOf', []))
+
+
+def identifiers_for(param: str, text: str) -> list[str]:
+    """
+    identifiers of the message for an identifier parameter, `user_id` takes only the identifiers
+    with `user` shortly before them (`user M4386`, `userID M4386`, `"user_id": "M4386"`)
+    """
+    entity = param.lower().rsplit('_', 1)[0] if '_' in param else None
+    return [match.group() for match in IDENTIFIER.finditer(text)
+            if entity is None or entity in text[max(0, match.start() - 30):match.start()].lower()]
+
+
+def tool_arguments(parameters: dict, text: str) -> Optional[dict]:
+    """arguments of a tool filled from the message, None when a required identifier is not there"""
+    defs = parameters.get('$defs', {})
+    numbers = [float(n) if '.' in n else int(n) for n in NUMBER.findall(text)]
+    required = set(parameters.get('required', []))
+    arguments = {}
+    for name, schema in (parameters.get('properties') or {}).items():
+        schema = _resolve(schema, defs)
+        kind = _schema_type(schema)
+        optional = name not in required or _is_nullable(schema)
+        if _is_identifier_param(name):
+            identifiers = identifiers_for(name, text)
+            if not identifiers:
+                if not optional:
+                    return None
+                if name in required:
+                    arguments[name] = None  # left out, the client drops the null again
+                continue
+            arguments[name] = identifiers if kind == 'array' else identifiers[0]
+        elif optional:
+            if name in required:
+                arguments[name] = None  # left out, the client drops the null again
+        elif kind in ('integer', 'number'):
+            value = numbers.pop(0) if numbers else schema.get('default', schema.get('minimum', 1))
+            arguments[name] = int(value) if kind == 'integer' else value
+        elif kind == 'boolean':
+            arguments[name] = schema.get('default', False)
+        elif kind == 'array':
+            arguments[name] = [text[:100]]
+        else:
+            arguments[name] = schema['enum'][0] if 'enum' in schema else text[:100]
+    return arguments
+
+
+def select_tools(conversation: Conversation, tools: list[dict]) -> list[tuple[str, dict]]:
+    """(name, arguments) of the tools the stand-in calls for the last user message"""
+    if not tools or conversation.answered or conversation.no_tools:
+        return []
+    text = conversation.question
+    lowered = text.lower()
+    mentioned = sorted((lowered.find(tool['name'].lower()), tool) for tool in tools if tool['name'].lower() in lowered)
+    if mentioned:
+        candidates = [tool for _, tool in mentioned]
+    else:
+        candidates = [tool for tool in tools if (words := _name_words(tool['name'])) and
+                      all(word in lowered for word in words)]
+    calls = []
+    for tool in candidates:
+        arguments = tool_arguments(tool.get('parameters') or {}, text)
+        if arguments is not None:
+            calls.append((tool['name'], arguments))
+    return calls[:Latency.max_tool_calls]
+
+
+def answer_text(conversation: Conversation) -> str:
+    base = ' '.join(conversation.results) if conversation.results else f"answer to: {conversation.question}"
+    tokens = split_tokens(' '.join(base.split()) + ' ')
+    if Latency.answer_tokens > 0:
+        while len(tokens) < Latency.answer_tokens:
+            tokens += tokens
+        tokens = tokens[:Latency.answer_tokens]
+    return ''.join(tokens).strip()
+
+
+def _has_array(schema: Any, defs: dict, seen: frozenset = frozenset()) -> bool:
+    if not isinstance(schema, dict):
+        return False
+    if '$ref' in schema:
+        name = schema['$ref'].rsplit('/', 1)[-1]
+        return name not in seen and _has_array(defs[name], defs, seen | {name})
+    if _schema_type(schema) == 'array':
+        return True
+    branches = list((schema.get('properties') or {}).values()) + schema.get('anyOf', []) + schema.get('oneOf', [])
+    return any(_has_array(branch, defs, seen) for branch in branches)
+
+
+def synthesize(schema: dict, defs: dict, conversation: Conversation, steps: list[str], item: Optional[int] = None):
+    """instance of a json schema, plan-like branches for a fresh question and answers once it progressed"""
+    schema = _resolve(schema, defs)
+    branches = schema.get('anyOf') or schema.get('oneOf')
+    if branches:
+        branches = [_resolve(branch, defs) for branch in branches]
+        plans = [branch for branch in branches if _has_array(branch, defs)]
+        answers = [branch for branch in branches if not _has_array(branch, defs)]
+        preferred = answers if conversation.progressed else plans
+        return synthesize((preferred or branches)[0], defs, conversation, steps, item)
+    if 'const' in schema:
+        return schema['const']
+    if 'enum' in schema:
+        return schema['enum'][0]
+    kind = _schema_type(schema)
+    if kind == 'object':
+        return {name: synthesize(sub, defs, conversation, steps, item)
+                for name, sub in (schema.get('properties') or {}).items()}
+    if kind == 'array':
+        if item is not None:
+            return []  # arrays inside a step, e.g. its dependencies: independent steps
+        return [synthesize(schema.get('items', {}), defs, conversation, steps, index) for index in range(len(steps))]
+    if kind in ('integer', 'number'):
+        return schema.get('minimum', 0) if item is None else item + 1
+    if kind == 'boolean':
+        return False
+    if kind == 'null':
+        return None
+    return steps[item] if item is not None else answer_text(conversation)
+
+
+def structured_text(schema: dict, conversation: Conversation, tools: list[dict]) -> str:
+    calls = select_tools(Conversation([('user', conversation.question)]), tools)
+    steps = [f"call {name} with {json.dumps(arguments, ensure_ascii=False)}" for name, arguments in calls] or \
+            [f"answer: {conversation.question}"]
+    return json.dumps(synthesize(schema, schema.get('$defs', {}), conversation, steps), ensure_ascii=False)
+
+
+def decide(conversation: Conversation, tools: list[dict], schema: Optional[dict]) \
+        -> tuple[list[tuple[str, dict]], Optional[str]]:
+    """(function calls, text) answering the conversation, exactly one of both is set"""
+    calls = select_tools(conversation, tools)
+    if calls:
+        return calls, None
+    if schema is not None:
+        return [], structured_text(schema, conversation, tools)
+    return [], answer_text(conversation)
+
+
+def _record(input_tokens: int, output_tokens: int, calls: int, started: float, streamed: bool) -> None:
+    Stats.requests += 1
+    Stats.streamed += streamed
+    Stats.function_calls += calls
+    Stats.input_tokens += input_tokens
+    Stats.output_tokens += output_tokens
+    Stats.model_seconds += time.perf_counter() - started
+
+
+def _sse(event: dict, name: Optional[str] = None) -> bytes:
+    prefix = f"event: {name}\n" if name else ''
+    return f"{prefix}data: {json.dumps(event, ensure_ascii=False)}\n\n".encode()
+
+
+def _error(status: int, message: str) -> JSONResponse:
+    return JSONResponse(status_code=status, content={'error': {
+        'message': message, 'type': 'invalid_request_error', 'param': None, 'code': None,
+    }})
+
+
+app = FastAPI(title='llm stand-in')
+# stored Responses conversations for `previous_response_id`, oldest evicted first
+stored: OrderedDict[str, list] = OrderedDict()
+STORE_SIZE = 10_000
+
+
+def responses_tools(tools: Optional[list]) -> list[dict]:
+    return [tool for tool in tools or [] if tool.get('type') == 'function']
+
+
+def responses_body(body: dict, response_id: str, output: list[dict], status: str, usage: Optional[dict]) -> dict:
+    return {
+        'id': response_id, 'object': 'response', 'created_at': int(time.time()), 'status': status,
+        'model': body.get('model'), 'output': output, 'instructions': body.get('instructions'),
+        'parallel_tool_calls': body.get('parallel_tool_calls', True), 'tool_choice': body.get('tool_choice', 'auto'),
+        'tools': body.get('tools') or [], 'text': body.get('text') or {'format': {'type': 'text'}},
+        'previous_response_id': body.get('previous_response_id'), 'store': body.get('store', True),
+        'usage': usage, 'error': None, 'incomplete_details': None, 'metadata': {},
+    }
+
+
+def responses_usage(input_tokens: int, output_tokens: int) -> dict:
+    return {
+        'input_tokens': input_tokens, 'input_tokens_details': {'cached_tokens': 0},
+        'output_tokens': output_tokens, 'output_tokens_details': {'reasoning_tokens': 0},
+        'total_tokens': input_tokens + output_tokens,
+    }
+
+
+def message_item(text: str) -> dict:
+    return {'type': 'message', 'id': f"msg_{uuid.uuid4().hex}", 'status': 'completed', 'role': 'assistant',
+            'content': [{'type': 'output_text', 'text': text, 'annotations': [], 'logprobs': []}]}
+
+
+def function_call_item(name: str, arguments: dict) -> dict:
+    suffix = uuid.uuid4().hex
+    return {'type': 'function_call', 'id': f"fc_{suffix}", 'call_id': f"call_{suffix}", 'name': name,
+            'arguments': json.dumps(arguments, ensure_ascii=False), 'status': 'completed'}
+
+
+@app.post('/v1/responses')
+async def create_response(request: Request):
+    started = time.perf_counter()
+    body = await request.json()
+    previous = body.get('previous_response_id')
+    if previous is not None and previous not in stored:
+        return _error(404, f"Previous response with id '{previous}' not found.")
+
+    items = stored.get(previous, []) + (
+        [{'role': 'user', 'content': body['input']}] if isinstance(body['input'], str) else body['input']
+    )
+    tools = responses_tools(body.get('tools'))
+    text_format = (body.get('text') or {}).get('format') or {}
+    schema = text_format.get('schema') if text_format.get('type') == 'json_schema' else None
+    conversation = Conversation(responses_turns(items), body.get('instructions'))
+    calls, text = decide(conversation, tools, schema)
+    output = [function_call_item(name, arguments) for name, arguments in calls] or [message_item(text)]
+
+    input_tokens = count_tokens(json.dumps(items, ensure_ascii=False)) + count_tokens(body.get('instructions') or '') \
+        + count_tokens(json.dumps(tools, ensure_ascii=False))
+    output_tokens = sum(count_tokens(item['arguments']) for item in output if item['type'] == 'function_call') \
+        + (count_tokens(text) if text is not None else 0)
+    response_id = f"resp_{uuid.uuid4().hex}"
+    if body.get('store', True):
+        stored[response_id] = items + output
+        while len(stored) > STORE_SIZE:
+            stored.popitem(last=False)
+
+    usage = responses_usage(input_tokens, output_tokens)
+    if not body.get('stream'):
+        await asyncio.sleep(prefill_delay(input_tokens) + token_delay(output_tokens))
+        _record(input_tokens, output_tokens, len(calls), started, False)
+        return responses_body(body, response_id, output, 'completed', usage)
+
+    async def events() -> AsyncIterator[bytes]:
+        sequence = iter(range(1_000_000))
+
+        def event(kind: str, **fields) -> bytes:
+            return _sse({'type': kind, 'sequence_number': next(sequence), **fields}, kind)
+
+        yield event('response.created', response=responses_body(body, response_id, [], 'in_progress', None))
+        await asyncio.sleep(prefill_delay(input_tokens))
+        for index, item in enumerate(output):
+            if item['type'] == 'function_call':
+                yield event('response.output_item.added', output_index=index,
+                            item={**item, 'arguments': '', 'status': 'in_progress'})
+                for token in split_tokens(item['arguments']):
+                    await asyncio.sleep(token_delay(1))
+                    yield event('response.function_call_arguments.delta', output_index=index, item_id=item['id'],
+                                delta=token)
+                yield event('response.function_call_arguments.done', output_index=index, item_id=item['id'],
+                            name=item['name'], arguments=item['arguments'])
+            else:
+                yield event('response.output_item.added', output_index=index,
+                            item={**item, 'status': 'in_progress', 'content': []})
+                part = {'type': 'output_text', 'text': '', 'annotations': [], 'logprobs': []}
+                yield event('response.content_part.added', output_index=index, item_id=item['id'],
+                            content_index=0, part=part)
+                for token in split_tokens(text):
+                    await asyncio.sleep(token_delay(1))
+                    yield event('response.output_text.delta', output_index=index, item_id=item['id'],
+                                content_index=0, delta=token, logprobs=[])
+                yield event('response.output_text.done', output_index=index, item_id=item['id'],
+                            content_index=0, text=text, logprobs=[])
+                yield event('response.content_part.done', output_index=index, item_id=item['id'],
+                            content_index=0, part={**part, 'text': text})
+            yield event('response.output_item.done', output_index=index, item=item)
+        yield event('response.completed', response=responses_body(body, response_id, output, 'completed', usage))
+        _record(input_tokens, output_tokens, len(calls), started, True)
+
+    return StreamingResponse(events(), media_type='text/event-stream')
+
+
+@app.post('/v1/chat/completions')
+async def create_chat_completion(request: Request):
+    started = time.perf_counter()
+    body = await request.json()
+    tools = [{**tool['function'], 'type': 'function'} for tool in body.get('tools') or []
+             if tool.get('type') == 'function']
+    response_format = body.get('response_format') or {}
+    schema = response_format['json_schema'].get('schema') if response_format.get('type') == 'json_schema' else None
+    conversation = Conversation(chat_turns(body['messages']))
+    calls, text = decide(conversation, tools, schema)
+    tool_calls = [
+        {'id': f"call_{uuid.uuid4().hex}", 'type': 'function',
+         'function': {'name': name, 'arguments': json.dumps(arguments, ensure_ascii=False)}}
+        for name, arguments in calls
+    ]
+
+    input_tokens = count_tokens(json.dumps(body['messages'], ensure_ascii=False)) \
+        + count_tokens(json.dumps(tools, ensure_ascii=False))
+    output_tokens = sum(count_tokens(call['function']['arguments']) for call in tool_calls) \
+        + (count_tokens(text) if text is not None else 0)
+    usage = {'prompt_tokens': input_tokens, 'completion_tokens': output_tokens,
+             'total_tokens': input_tokens + output_tokens}
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    finish_reason = 'tool_calls' if tool_calls else 'stop'
+    base = {'id': completion_id, 'created': int(time.time()), 'model': body.get('model'), 'system_fingerprint': None}
+
+    if not body.get('stream'):
+        await asyncio.sleep(prefill_delay(input_tokens) + token_delay(output_tokens))
+        _record(input_tokens, output_tokens, len(calls), started, False)
+        message = {'role': 'assistant', 'content': text, 'tool_calls': tool_calls or None, 'refusal': None}
+        return {**base, 'object': 'chat.completion', 'usage': usage,
+                'choices': [{'index': 0, 'message': message, 'finish_reason': finish_reason, 'logprobs': None}]}
+
+    async def chunks() -> AsyncIterator[bytes]:
+        def chunk(delta: dict, finish: Optional[str] = None) -> bytes:
+            return _sse({**base, 'object': 'chat.completion.chunk',
+                         'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish, 'logprobs': None}]})
+
+        yield chunk({'role': 'assistant', 'content': ''})
+        await asyncio.sleep(prefill_delay(input_tokens))
+        for index, call in enumerate(tool_calls):
+            yield chunk({'tool_calls': [{'index': index, 'id': call['id'], 'type': 'function',
+                                         'function': {'name': call['function']['name'], 'arguments': ''}}]})
+            for token in split_tokens(call['function']['arguments']):
+                await asyncio.sleep(token_delay(1))
+                yield chunk({'tool_calls': [{'index': index, 'function': {'arguments': token}}]})
+        if text is not None:
+            for token in split_tokens(text):
+                await asyncio.sleep(token_delay(1))
+                yield chunk({'content': token})
+        yield chunk({}, finish_reason)
+        if (body.get('stream_options') or {}).get('include_usage'):
+            yield _sse({**base, 'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})
+        yield b"data: [DONE]\n\n"
+        _record(input_tokens, output_tokens, len(calls), started, True)
+
+    return StreamingResponse(chunks(), media_type='text/event-stream')
+
+
+@app.get('/v1/models')
+async def list_models():
+    return {'object': 'list', 'data': [
+        {'id': model, 'object': 'model', 'created': 0, 'owned_by': 'stand-in'} for model in ('gpt-4.1-mini', 'gpt-4o-mini')
+    ]}
+
+
+@app.get('/stats')
+async def stats():
+    return Stats.to_dict()
+
+
+@app.post('/stats/reset')
+async def reset_stats():
+    Stats.reset()
+    return Stats.to_dict()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9030)
+    parser.add_argument('--ttft', type=float, default=0.0, help='seconds before the first output token')
+    parser.add_argument('--prefill-rate', type=float, default=0.0, help='input tokens per second, 0: free')
+    parser.add_argument('--token-rate', type=float, default=0.0, help='output tokens per second, 0: instant')
+    parser.add_argument('--answer-tokens', type=int, default=50, help='length of text answers, 0: unpadded')
+    parser.add_argument('--max-tool-calls', type=int, default=8)
+    args = parser.parse_args()
+
+    Latency.ttft = args.ttft
+    Latency.prefill_rate = args.prefill_rate
+    Latency.token_rate = args.token_rate
+    Latency.answer_tokens = args.answer_tokens
+    Latency.max_tool_calls = args.max_tool_calls
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
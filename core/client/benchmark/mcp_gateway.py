@@ -0,0 +1,92 @@
+"""
+MCP latency through the single gateway endpoint versus one connection per server.
+
+direct:  alpha, beta and resource servers on ports 9011-9013, the client prefixes tool names itself
+gateway: core/server/gateway.py mounting the three servers in one process behind one endpoint
+
+For every mode reports the time to open the warm sessions (initialize handshakes), `tools/list` of all
+servers, one `tools/call` and a request's worth of concurrent alpha and beta calls.
+
+Requires both the servers and the gateway to be running:
+    cd core/server && ./run_server.sh direct &  fastmcp run gateway.py --transport http --port 9010
+
+usage (run from core/client):
+    python -m benchmark.mcp_gateway --rounds 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from common.config import McpServerConfig
+from common.mcp.session import McpSessionManager
+
+CALLS = [
+    ('alpha_get_user_name', {'user_id': 'M4386'}),
+    ('alpha_get_user_address', {'user_id': 'M4386'}),
+    ('alpha_get_user_booked_item', {'user_id': 'M4386'}),
+    ('beta_get_product_info', {'product_code': ['BALI004', 'TOKYO002']}),
+]
+
+
+def config(mode: str) -> dict:
+    McpServerConfig.mode = mode
+    return {'mcpServers': McpServerConfig.servers()}
+
+
+async def timed(func, rounds: int) -> dict:
+    latencies = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func()
+        latencies.append(time.perf_counter() - start)
+    return {
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(statistics.quantiles(latencies, n=20)[-1] * 1000, 2),
+    }
+
+
+async def run(mode: str, rounds: int) -> dict:
+    manager = McpSessionManager(config(mode), pool_size=1)
+    start = time.perf_counter()
+    await manager.start()
+    connect_ms = (time.perf_counter() - start) * 1000
+    tools = await manager.list_tools()
+
+    async def call_one():
+        result = await manager.call_tool_mcp(*CALLS[0])
+        assert not result.isError
+
+    async def call_all():
+        results = await asyncio.gather(*[manager.call_tool_mcp(name, params) for name, params in CALLS])
+        assert not any(result.isError for result in results)
+
+    await call_all()  # warm up
+    result = {
+        'mode': mode,
+        'connections': len(manager.pools),
+        'tools': len(tools),
+        'connect_ms': round(connect_ms, 2),
+        'list_tools': await timed(manager.list_tools, rounds),
+        'call_tool': await timed(call_one, rounds),
+        f'call_{len(CALLS)}_concurrent': await timed(call_all, rounds),
+    }
+    await manager.close()
+    return result
+
+
+async def main_async(rounds: int) -> None:
+    for mode in ('direct', 'gateway'):
+        print(json.dumps(await run(mode, rounds)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.rounds))
+
+
+if __name__ == '__main__':
+    main()
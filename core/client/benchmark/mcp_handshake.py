@@ -0,0 +1,88 @@
+"""
+MCP handshake overhead benchmark: per-call `async with Client(config)` versus the warm McpSessionManager.
+
+Requires the MCP servers to be running (see core/server/run_server.sh).
+
+usage (run from core/client):
+    python -m benchmark.mcp_handshake --iterations 50 --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from fastmcp import Client
+
+from common.mcp.session import McpSessionManager
+from common.service import CommonService
+
+TOOL_NAME = 'alpha_get_user_name'
+TOOL_PARAMS = {'user_id': 'M4386'}
+
+
+def summarize(name: str, latencies: list[float], wall: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        'mode': name,
+        'calls': len(latencies),
+        'wall_s': round(wall, 3),
+        'calls_per_s': round(len(latencies) / wall, 2),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+
+async def legacy_call(client: Client) -> float:
+    """the previous pattern: enter the shared multi-server client for every tool call"""
+    start = time.perf_counter()
+    async with client:
+        await client.list_tools()
+        await client.call_tool_mcp(TOOL_NAME, TOOL_PARAMS)
+    return time.perf_counter() - start
+
+
+async def pooled_call(manager: McpSessionManager) -> float:
+    start = time.perf_counter()
+    await manager.list_tools()
+    await manager.call_tool_mcp(TOOL_NAME, TOOL_PARAMS)
+    return time.perf_counter() - start
+
+
+async def run(mode: str, iterations: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    if mode == 'legacy':
+        target = Client(CommonService.config)
+        call = legacy_call
+    else:
+        target = McpSessionManager(CommonService.config)
+        await target.start()
+        call = pooled_call
+
+    async def limited() -> float:
+        async with semaphore:
+            return await call(target)
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*[limited() for _ in range(iterations)])
+    wall = time.perf_counter() - start
+
+    if mode == 'pooled':
+        await target.close()
+    return summarize(mode, latencies, wall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50, help='list_tools + call_tool rounds per mode')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--modes', nargs='+', default=['legacy', 'pooled'])
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        print(json.dumps(asyncio.run(run(mode, args.iterations, args.concurrency))))
+
+
+if __name__ == '__main__':
+    main()
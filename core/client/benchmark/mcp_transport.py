@@ -0,0 +1,112 @@
+"""
+Latency and CPU per MCP tool call over streamable HTTP versus the in-memory transport.
+
+http:   the gateway runs as its own process (started here on `--port`), calls go through HTTP, JSON-RPC
+        framing and SSE parsing
+memory: MCP_TRANSPORT=memory, the gateway server object is imported into the client process and messages
+        go through in-memory streams
+
+CPU per call is the client process CPU time plus, in http mode, the CPU time of the server process
+(utime + stime of its session from /proc), divided by the number of calls.
+
+usage (run from core/client):
+    python -m benchmark.mcp_transport --calls 500 --concurrency 1 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import time
+
+from common.config import McpServerConfig
+from common.mcp.session import McpSessionManager
+
+CALL = ('alpha_get_user_name', {'user_id': 'M4386'})
+
+
+def session_cpu_seconds(sid: int) -> float:
+    """CPU time of every process of a session"""
+    total = 0
+    for pid in filter(str.isdigit, os.listdir('/proc')):
+        try:
+            with open(f'/proc/{pid}/stat') as stat:
+                fields = stat.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        # fields[3] is the session id, fields[11] / fields[12] utime / stime (counted from field 3, state)
+        if int(fields[3]) == sid:
+            total += int(fields[11]) + int(fields[12])
+    return total / os.sysconf('SC_CLK_TCK')
+
+
+def start_gateway(port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        ['fastmcp', 'run', 'gateway.py', '--transport', 'http', '--port', str(port)],
+        cwd=McpServerConfig.server_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    time.sleep(6)
+    return server
+
+
+async def run(transport: str, calls: int, concurrency: int, server_sid: int = None) -> dict:
+    McpServerConfig.transport = transport
+    manager = McpSessionManager({'mcpServers': McpServerConfig.servers()}, pool_size=1)
+    await manager.start()
+    for _ in range(20):  # warm up
+        await manager.call_tool_mcp(*CALL)
+
+    latencies = []
+
+    async def worker(count: int):
+        for _ in range(count):
+            start = time.perf_counter()
+            result = await manager.call_tool_mcp(*CALL)
+            latencies.append(time.perf_counter() - start)
+            assert not result.isError
+
+    server_cpu = session_cpu_seconds(server_sid) if server_sid else 0.0
+    client_cpu = time.process_time()
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(calls // concurrency) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    client_cpu = time.process_time() - client_cpu
+    server_cpu = (session_cpu_seconds(server_sid) - server_cpu) if server_sid else 0.0
+    await manager.close()
+
+    return {
+        'transport': transport,
+        'concurrency': concurrency,
+        'calls': len(latencies),
+        'p50_ms': round(statistics.median(latencies) * 1000, 3),
+        'p95_ms': round(statistics.quantiles(latencies, n=20)[-1] * 1000, 3),
+        'calls_per_s': round(len(latencies) / elapsed, 1),
+        'client_cpu_ms_per_call': round(client_cpu / len(latencies) * 1000, 3),
+        'server_cpu_ms_per_call': round(server_cpu / len(latencies) * 1000, 3),
+        'total_cpu_ms_per_call': round((client_cpu + server_cpu) / len(latencies) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--port', type=int, default=9020, help='port of the gateway started for the http mode')
+    args = parser.parse_args()
+
+    McpServerConfig.mode = 'gateway'
+    McpServerConfig.gateway_url = f'http://localhost:{args.port}/mcp'
+    server = start_gateway(args.port)
+    try:
+        for concurrency in args.concurrency:
+            print(json.dumps(asyncio.run(run('http', args.calls, concurrency, server.pid))))
+            print(json.dumps(asyncio.run(run('memory', args.calls, concurrency))))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Canned Responses API payloads served through httpx.MockTransport by the benchmarks.
+"""
+import asyncio
+import json
+from typing import AsyncIterator
+
+RESPONSE_BODY = {
+    "id": "resp_benchmark",
+    "object": "response",
+    "created_at": 0,
+    "status": "completed",
+    "model": "gpt-4.1-mini",
+    "output": [{
+        "type": "message",
+        "id": "msg_benchmark",
+        "status": "completed",
+        "role": "assistant",
+        "content": [{"type": "output_text", "text": "ok", "annotations": []}],
+    }],
+    "parallel_tool_calls": True,
+    "tool_choice": "auto",
+    "tools": [],
+}
+
+
+def _sse(event: dict) -> bytes:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+
+
+async def text_stream(tokens: list[str], first_token_delay: float, token_interval: float) -> AsyncIterator[bytes]:
+    """SSE body of a streamed text answer, tokens are paced like a model would emit them"""
+    sequence = 0
+    yield _sse({"type": "response.created", "sequence_number": sequence,
+                "response": {**RESPONSE_BODY, "status": "in_progress", "output": []}})
+    await asyncio.sleep(first_token_delay)
+    for token in tokens:
+        sequence += 1
+        yield _sse({"type": "response.output_text.delta", "sequence_number": sequence, "item_id": "msg_benchmark",
+                    "output_index": 0, "content_index": 0, "delta": token, "logprobs": []})
+        await asyncio.sleep(token_interval)
+    message = {**RESPONSE_BODY["output"][0],
+               "content": [{"type": "output_text", "text": "".join(tokens), "annotations": []}]}
+    yield _sse({"type": "response.output_item.done", "sequence_number": sequence + 1, "output_index": 0,
+                "item": message})
+    yield _sse({"type": "response.completed", "sequence_number": sequence + 2,
+                "response": {**RESPONSE_BODY, "output": [message]}})
+
+
+def text_body(tokens: list[str]) -> dict:
+    """non streamed Responses body of the same text answer"""
+    message = {**RESPONSE_BODY["output"][0],
+               "content": [{"type": "output_text", "text": "".join(tokens), "annotations": []}]}
+    return {**RESPONSE_BODY, "output": [message]}
+
+
+def function_call_item(index: int, name: str, arguments: dict) -> dict:
+    return {"type": "function_call", "id": f"fc_{index}", "call_id": f"call_{index}", "name": name,
+            "arguments": json.dumps(arguments), "status": "completed"}
+
+
+async def function_call_stream(calls: list[dict], first_token_delay: float, call_interval: float) \
+        -> AsyncIterator[bytes]:
+    """SSE body of a response made of parallel function calls, each call takes `call_interval` to generate"""
+    sequence = 0
+    yield _sse({"type": "response.created", "sequence_number": sequence,
+                "response": {**RESPONSE_BODY, "status": "in_progress", "output": []}})
+    await asyncio.sleep(first_token_delay)
+    for index, call in enumerate(calls):
+        sequence += 1
+        yield _sse({"type": "response.output_item.added", "sequence_number": sequence, "output_index": index,
+                    "item": {**call, "arguments": "", "status": "in_progress"}})
+        await asyncio.sleep(call_interval)
+        sequence += 1
+        yield _sse({"type": "response.function_call_arguments.done", "sequence_number": sequence,
+                    "output_index": index, "item_id": call["id"], "name": call["name"],
+                    "arguments": call["arguments"]})
+        sequence += 1
+        yield _sse({"type": "response.output_item.done", "sequence_number": sequence, "output_index": index,
+                    "item": call})
+    yield _sse({"type": "response.completed", "sequence_number": sequence + 1,
+                "response": {**RESPONSE_BODY, "output": calls}})
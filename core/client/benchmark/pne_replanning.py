@@ -0,0 +1,120 @@
+"""
+Model calls and tokens per PnE request with PNE_REPLAN_MODE=always against on_demand.
+
+`always` revises the plan with a model call after every plan and has the model summarize the tool results of
+every step in a second call. `on_demand` takes the tool results as the step result and only revises the plan
+when a step failed, returned no data or reported a deviation, a plan done as planned ends with its final step
+(or one answer call when that step only called tools).
+
+The requests run in-process against the LLM stand-in (benchmark/llm_server.py, started here on `--port`) and
+the MCP servers over the in-memory transport. Every request reports its model calls, input and output tokens,
+replans and wall time, the summary the means per mode and the change against `always`.
+The second question asks for an unknown user, its failing tool calls make `on_demand` replan.
+
+usage (run from core/client):
+    python -m benchmark.pne_replanning --repeat 5
+    python -m benchmark.pne_replanning --ttft 0.3 --token-rate 80 --questions "what did userID M4386 book?"
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from benchmark.e2e import CLIENT_DIR, Process
+from common.config import McpConfig, McpServerConfig, OpenAIConfig, PnEConfig
+
+MODES = ('always', 'on_demand')
+QUESTIONS = [
+    'tell me the name, address and booked items for userID M4386',
+    'tell me the name and address for userID Z0000',
+]
+
+
+async def run(modes: list[str], questions: list[str], repeat: int, port: int) -> list[dict]:
+    OpenAIConfig.base_url = f'http://127.0.0.1:{port}/v1'
+    McpServerConfig.mode = 'gateway'
+    McpServerConfig.transport = 'memory'
+    # every request calls its tools
+    McpConfig.tool_result_cache_size = 0
+    # imported here so the session manager is built from the settings above
+    from common.llm.openai_provider.model import OpenAIProvider
+    from common.service import CommonService
+    from models.request import PlanAndExecuteChattingRequest
+    from service.pne import PlanAndExecuteChatService
+
+    await CommonService.mcp_servers.start()
+    rows = []
+    try:
+        for mode in modes:
+            PnEConfig.replan_mode = mode
+            for question in questions:
+                for _ in range(repeat):
+                    service = PlanAndExecuteChatService(PlanAndExecuteChattingRequest(question=question))
+                    start = time.perf_counter()
+                    await service.complete()
+                    plans = service.plan_summary()
+                    rows.append({
+                        'mode': mode,
+                        'question': question,
+                        'seconds': round(time.perf_counter() - start, 3),
+                        'calls': service.usage.calls,
+                        'input_tokens': service.usage.input_tokens,
+                        'output_tokens': service.usage.output_tokens,
+                        'plans': plans['plans'],
+                        'steps': plans['steps'],
+                        'replans': plans['replans'],
+                    })
+                    print(json.dumps(rows[-1], ensure_ascii=False))
+    finally:
+        await CommonService.mcp_servers.close()
+        await OpenAIProvider().aclose()
+    return rows
+
+
+def summarize(rows: list[dict], modes: list[str]) -> list[dict]:
+    fields = ('seconds', 'calls', 'input_tokens', 'output_tokens', 'replans')
+    summary = []
+    for mode in modes:
+        selected = [row for row in rows if row['mode'] == mode]
+        summary.append({
+            'mode': mode, 'requests': len(selected),
+            **{f'{field}_mean': round(statistics.mean(row[field] for row in selected), 2) for field in fields},
+        })
+    baseline = summary[0]
+    for entry in summary[1:]:
+        entry['vs'] = baseline['mode']
+        for field in ('seconds', 'calls', 'input_tokens', 'output_tokens'):
+            before = baseline[f'{field}_mean']
+            entry[f'{field}_change_pct'] = round((entry[f'{field}_mean'] - before) / before * 100, 1) if before else 0.0
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=list(MODES))
+    parser.add_argument('--questions', nargs='+', default=QUESTIONS)
+    parser.add_argument('--repeat', type=int, default=3, help='requests per mode and question')
+    parser.add_argument('--ttft', type=float, default=0.2, help='stand-in seconds before the first token')
+    parser.add_argument('--token-rate', type=float, default=100.0, help='stand-in output tokens per second')
+    parser.add_argument('--port', type=int, default=9130, help='stand-in port')
+    args = parser.parse_args()
+
+    os.environ.setdefault('OPENAI_API_KEY', 'stand-in')
+    llm = Process('llm', [
+        sys.executable, '-m', 'benchmark.llm_server', '--port', str(args.port),
+        '--ttft', str(args.ttft), '--token-rate', str(args.token_rate),
+    ], args.port, CLIENT_DIR, {})
+    try:
+        llm.wait_ready()
+        rows = asyncio.run(run(args.modes, args.questions, args.repeat, args.port))
+    finally:
+        llm.stop()
+    for entry in summarize(rows, args.modes):
+        print(json.dumps(entry))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Concurrency benchmark of OpenAIProvider transports.
+
+The OpenAI endpoint is replaced by an in-process httpx MockTransport answering after a fixed latency,
+so the numbers only show how many model calls a single worker (one event loop) keeps in flight.
+
+modes:
+    blocking: legacy behaviour, the blocking OpenAI client is called on the event loop
+    sync:     blocking OpenAI client offloaded to worker threads (OPENAI_TRANSPORT=sync)
+    async:    AsyncOpenAI on a shared connection pool (OPENAI_TRANSPORT=async, default)
+
+usage (run from core/client):
+    python -m benchmark.provider_concurrency --requests 64 --latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+
+from benchmark.mock_openai import RESPONSE_BODY
+from common.config import OpenAIConfig
+from common.llm.model import PlainInputPrompt
+from common.llm.openai_provider.message import OpenAIContextManager
+from common.llm.openai_provider.model import OpenAIProvider
+
+
+class InFlightCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def enter(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def exit(self):
+        with self._lock:
+            self.current -= 1
+
+
+class BenchmarkProvider(OpenAIProvider):
+    latency: float = 0.5
+    counter: InFlightCounter = None
+
+    def _build_http_client(self):
+        latency, counter = self.latency, self.counter
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            counter.enter()
+            time.sleep(latency)
+            counter.exit()
+            return httpx.Response(200, json=RESPONSE_BODY)
+
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            counter.enter()
+            await asyncio.sleep(latency)
+            counter.exit()
+            return httpx.Response(200, json=RESPONSE_BODY)
+
+        if self.is_async:
+            return httpx.AsyncClient(transport=httpx.MockTransport(async_handler))
+        return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+class BlockingBenchmarkProvider(BenchmarkProvider):
+    async def _create(self, **kwargs):
+        return self.openai.responses.create(**kwargs)
+
+
+async def run(mode: str, requests: int, latency: float) -> dict:
+    OpenAIConfig.transport = 'async' if mode == 'async' else 'sync'
+    provider_class = BlockingBenchmarkProvider if mode == 'blocking' else BenchmarkProvider
+    provider_class = type(f"{provider_class.__name__}_{mode}", (provider_class,), {
+        'latency': latency, 'counter': InFlightCounter()
+    })
+    provider = provider_class(api_key='benchmark')
+
+    conversation = OpenAIContextManager()
+    conversation += PlainInputPrompt(role='user', content='hello')
+
+    start = time.perf_counter()
+    await asyncio.gather(*[provider.invoke_tools(conversation) for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+    await provider.aclose()
+
+    return {
+        'mode': mode,
+        'requests': requests,
+        'latency_s': latency,
+        'wall_s': round(elapsed, 3),
+        'requests_per_s': round(requests / elapsed, 2),
+        'peak_in_flight': provider.counter.peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=64, help='concurrent provider calls per mode')
+    parser.add_argument('--latency', type=float, default=0.5, help='simulated model latency in seconds')
+    parser.add_argument('--modes', nargs='+', default=['blocking', 'sync', 'async'])
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        print(json.dumps(asyncio.run(run(mode, args.requests, args.latency))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Upload savings of response chaining (OPENAI_RESPONSE_CHAINING) in a PnE style replanning loop.
+
+The Responses API is replaced by an in-process stand-in that stores every response, resolves
+`previous_response_id` (404 for unknown ids) and answers with `Action` plans until the last step.
+Each step appends an executed step and a replanning prompt to the main context, like
+PlanAndExecuteChatService.complete does. `--expire-at` drops the stored chain once to exercise
+the fallback to a full resend.
+
+usage (run from core/client):
+    python -m benchmark.response_chaining --steps 5 10 20
+"""
+import argparse
+import asyncio
+import json
+import uuid
+
+import httpx
+
+from benchmark.mock_openai import RESPONSE_BODY
+from common.config import OpenAIConfig
+from common.llm.model import PlainInputPrompt
+from common.llm.openai_provider.model import OpenAIProvider, OpenAIContextManager
+from common.llm.usage import track_usage
+from service.pne import Action
+
+
+class ResponsesStandIn:
+    """minimal stored-response server: keeps the full input of every response to resolve chains"""
+
+    def __init__(self, steps: int, expire_at: int = None):
+        self.steps = steps
+        self.expire_at = expire_at
+        self.calls = 0
+        self.history: dict[str, list] = {}
+
+    def answer(self) -> str:
+        if self.calls >= self.steps:
+            return json.dumps({'response': {'type': 'response', 'message': 'final answer'}})
+        return json.dumps({'response': {'type': 'plan', 'steps': [
+            {'task': f"step {self.calls}", 'type': 'assistant'}
+        ]}})
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        previous = body.get('previous_response_id')
+        if previous is not None and previous not in self.history:
+            return httpx.Response(404, json={'error': {
+                'message': f"Previous response with id '{previous}' not found.", 'type': 'invalid_request_error'
+            }})
+
+        self.calls += 1
+        prior = self.history.get(previous, [])
+        text = self.answer()
+        output = {**RESPONSE_BODY['output'][0], 'id': f"msg_{uuid.uuid4().hex}",
+                  'content': [{'type': 'output_text', 'text': text, 'annotations': []}]}
+        conversation = prior + body['input'] + [output]
+        response_id = f"resp_{uuid.uuid4().hex}"
+        if body.get('store'):
+            self.history[response_id] = conversation
+        if self.calls == self.expire_at:
+            self.history.clear()
+
+        input_tokens = len(json.dumps(prior + body['input'])) // 4
+        return httpx.Response(200, json={
+            **RESPONSE_BODY, 'id': response_id, 'output': [output],
+            'usage': {
+                'input_tokens': input_tokens,
+                'input_tokens_details': {'cached_tokens': len(json.dumps(prior)) // 4},
+                'output_tokens': len(text) // 4,
+                'output_tokens_details': {'reasoning_tokens': 0},
+                'total_tokens': input_tokens + len(text) // 4,
+            },
+        })
+
+
+async def run(chaining: bool, steps: int, expire_at: int = None) -> dict:
+    OpenAIConfig.transport = 'async'
+    OpenAIConfig.response_chaining = chaining
+    stand_in = ResponsesStandIn(steps, expire_at)
+    provider_class = type(f"StandInProvider_{chaining}_{steps}", (OpenAIProvider,), {
+        '_build_http_client': lambda self: httpx.AsyncClient(transport=httpx.MockTransport(stand_in.handle)),
+    })
+    provider = provider_class(api_key='benchmark')
+
+    with track_usage() as usage:
+        context = OpenAIContextManager()
+        context += [PlainInputPrompt(role='user', content='previous question ' * 50)] * 4
+        context += PlainInputPrompt(role='system', content='planning instruction ' * 100)
+        context += PlainInputPrompt(role='user', content='what did user M4386 order?')
+        output, _ = await provider.structured_output_with_tools(context, structure=Action)
+        while output.response.type == 'plan':
+            context += PlainInputPrompt(role='assistant', content=f"{output.response.steps[0].task} result " * 20)
+            context += PlainInputPrompt(role='system', content='replanning instruction ' * 100)
+            output, _ = await provider.structured_output_with_tools(context, structure=Action)
+    await provider.aclose()
+    return {'chaining': chaining, 'steps': steps, **usage.summary()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=int, nargs='+', default=[5, 10, 20])
+    parser.add_argument('--expire-at', type=int, default=None, help='drop the stored chain after this call')
+    args = parser.parse_args()
+
+    for steps in args.steps:
+        for chaining in (False, True):
+            print(json.dumps(asyncio.run(run(chaining, steps, args.expire_at if chaining else None))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Microbenchmark of the tool / structured-output schema compilation cache.
+
+For 10, 100 and 1000 synthetic tools with nested parameters, compares compiling every tool on each
+model call (the previous behaviour) with OpenAIContextManager.get_available_tools() served from the
+content-hash cache, and the strict text format of `Action` compiled per call versus per class.
+
+usage (run from core/client):
+    python -m benchmark.schema_compile --sizes 10 100 1000 --rounds 20
+"""
+import argparse
+import json
+import time
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from common.llm.model import AvailableTool
+from common.llm.openai_provider.message import OpenAIContextManager
+from common.llm.openai_provider.schema import _compile_function_tool, _compile_text_format, clear_cache, text_format
+from service.pne import Action
+
+
+class Address(BaseModel):
+    city: str = Field(..., description='city name')
+    kind: Literal['home', 'work'] = Field(..., description='address kind')
+
+
+class SearchParams(BaseModel):
+    user_ids: list[str] = Field(..., description='user ids to look up')
+    address: Address = Field(..., description='address filter')
+    tags: list[Address] = Field(..., description='nested list of objects')
+
+
+def make_tools(size: int) -> list[AvailableTool]:
+    schema = SearchParams.model_json_schema()
+    return [
+        AvailableTool(name=f"server_tool_{i}", description=f"synthetic tool {i}", input_schema=schema)
+        for i in range(size)
+    ]
+
+
+def timed(func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def run(size: int, rounds: int) -> dict:
+    clear_cache()
+    context = OpenAIContextManager()
+    context += make_tools(size)
+
+    uncached_ms = timed(lambda: [_compile_function_tool(tool) for tool in context.available_tools], rounds)
+    cold_ms = timed(context.get_available_tools, 1)
+    cached_ms = timed(context.get_available_tools, rounds)
+    return {
+        'tools': size,
+        'compile_every_call_ms': round(uncached_ms, 3),
+        'first_call_ms': round(cold_ms, 3),
+        'cached_call_ms': round(cached_ms, 3),
+        'speedup': round(uncached_ms / cached_ms, 1),
+    }
+
+
+def run_text_format(rounds: int) -> dict:
+    clear_cache()
+    uncached_ms = timed(lambda: _compile_text_format(Action), rounds)
+    cached_ms = timed(lambda: text_format(Action), rounds)
+    return {
+        'structure': Action.__name__,
+        'compile_every_call_ms': round(uncached_ms, 4),
+        'cached_call_ms': round(cached_ms, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        print(json.dumps(run(size, args.rounds)))
+    print(json.dumps(run_text_format(args.rounds * 10)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Streaming latency benchmark of OpenAIProvider.chat_stream and the SSE framing pipeline.
+
+A MockTransport emits `response.output_text.delta` events at a fixed token rate, the benchmark reports
+time-to-first-frame, inter-frame latency and the number of SSE frames sent for the whole answer.
+
+usage (run from core/client):
+    python -m benchmark.stream_latency --tokens 500 --token-interval 0.002
+"""
+import argparse
+import asyncio
+import json
+
+import httpx
+
+from benchmark.mock_openai import text_stream
+from common.config import OpenAIConfig
+from common.llm.model import PlainInputPrompt
+from common.llm.openai_provider.message import OpenAIContextManager
+from common.llm.openai_provider.model import OpenAIProvider
+from common.llm.stream import StreamStats, coalesce, to_sse
+
+
+class StreamingBenchmarkProvider(OpenAIProvider):
+    tokens: list[str] = []
+    first_token_delay: float = 0.2
+    token_interval: float = 0.002
+
+    def _build_http_client(self):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            body = text_stream(self.tokens, self.first_token_delay, self.token_interval)
+            return httpx.Response(200, headers={'content-type': 'text/event-stream'}, content=body)
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def run(tokens: int, first_token_delay: float, token_interval: float,
+              max_chars: int, max_delay: float) -> dict:
+    OpenAIConfig.transport = 'async'
+    StreamingBenchmarkProvider.tokens = [f"tok{i} " for i in range(tokens)]
+    StreamingBenchmarkProvider.first_token_delay = first_token_delay
+    StreamingBenchmarkProvider.token_interval = token_interval
+    provider = StreamingBenchmarkProvider(api_key='benchmark')
+
+    conversation = OpenAIContextManager()
+    conversation += PlainInputPrompt(role='user', content='hello')
+
+    # warm up the connection and the lazily imported event types
+    async for _ in provider.chat_stream(conversation):
+        pass
+
+    stats = StreamStats()
+    frames = coalesce(provider.chat_stream(conversation), max_chars=max_chars, max_delay=max_delay)
+    sent_bytes = 0
+    async for event in to_sse(frames, stats):
+        sent_bytes += len(event)
+    await provider.aclose()
+
+    return {
+        'tokens': tokens,
+        'model_first_token_s': first_token_delay,
+        'model_token_interval_s': token_interval,
+        'model_only_total_ms': round((first_token_delay + tokens * token_interval) * 1000, 2),
+        'sse_bytes': sent_bytes,
+        **stats.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=500)
+    parser.add_argument('--first-token-delay', type=float, default=0.2)
+    parser.add_argument('--token-interval', type=float, default=0.002)
+    parser.add_argument('--max-chars', type=int, default=None, help='frame size threshold')
+    parser.add_argument('--max-delay', type=float, default=None, help='frame time threshold in seconds')
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.tokens, args.first_token_delay, args.token_interval, args.max_chars, args.max_delay))
+    print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Round trips and latency of MCP tool calls with and without per-server batching.
+
+Looks up the name, address and booked items of `--users` users (3 alpha calls per user) plus the
+product info of their bookings (1 beta call per user), all issued concurrently like `_execute_tools` does.
+
+unbatched: one `tools/call` request per tool call
+batched:   ToolBatcher groups the calls of each server into one `batch_call` request
+
+Requires the MCP servers to be running (see core/server/run_server.sh).
+
+usage (run from core/client):
+    python -m benchmark.tool_batching --users 1 10 --rounds 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from common.mcp.batch import ToolBatcher
+from common.mcp.catalog import ToolCatalog
+from common.mcp.session import McpSessionManager
+from common.service import CommonService
+
+
+def tool_calls(users: int) -> list[tuple[str, dict]]:
+    calls = []
+    for _ in range(users):
+        calls += [
+            ('alpha_get_user_name', {'user_id': 'M4386'}),
+            ('alpha_get_user_address', {'user_id': 'M4386'}),
+            ('alpha_get_user_booked_item', {'user_id': 'M4386'}),
+            ('beta_get_product_info', {'product_code': ['BALI004', 'TOKYO002']}),
+        ]
+    return calls
+
+
+async def run(mode: str, manager: McpSessionManager, users: int, rounds: int) -> dict:
+    calls = tool_calls(users)
+    latencies = []
+    round_trips = 0
+    for _ in range(rounds):
+        client = ToolBatcher(manager) if mode == 'batched' else manager
+        start = time.perf_counter()
+        results = await asyncio.gather(*[client.call_tool_mcp(name, params) for name, params in calls])
+        latencies.append(time.perf_counter() - start)
+        assert not any(result.isError for result in results)
+        round_trips += client.round_trips if mode == 'batched' else len(calls)
+    return {
+        'mode': mode,
+        'users': users,
+        'tool_calls': len(calls),
+        'round_trips_per_request': round_trips / rounds,
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+    }
+
+
+async def main_async(users: list[int], rounds: int) -> None:
+    manager = McpSessionManager(CommonService.config)
+    await manager.start()
+    # the catalog tells which servers expose a batch entry point
+    await ToolCatalog().get(manager)
+    for count in users:
+        for mode in ('unbatched', 'batched'):
+            print(json.dumps(await run(mode, manager, count, rounds)))
+    await manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.users, args.rounds))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -5,14 +6,28 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from common.llm.openai_provider.model import OpenAIProvider
+from common.service import CommonService
+from common.timing import TimingMiddleware
 from route import ROUTES
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # MCP 세션을 미리 연결
+    await CommonService.mcp_servers.start()
+    yield
+    # 공유 커넥션 풀 정리
+    await CommonService.mcp_servers.close()
+    await OpenAIProvider().aclose()
+
+
 def main():
     app = FastAPI(
         title="MCP Client",
         description="MCP Client",
-        version="1.0"
+        version="1.0",
+        lifespan=lifespan,
     )
 
     # CORS 설정 - 프론트엔드 앱에서 API 호출 허용
@@ -23,6 +38,8 @@ def main():
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    # 요청별 모델 / MCP / 자체 처리 시간 집계 (/metrics/timings)
+    app.add_middleware(TimingMiddleware)
 
     for router in ROUTES:
         app.include_router(router)
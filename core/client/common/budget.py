@@ -0,0 +1,110 @@
+import time
+from typing import Optional
+
+from common.config import PnEConfig
+from common.functional.singleton import Singleton
+
+OUTCOMES = ('completed', 'collapsed_budget', 'collapsed_iterations', 'hard_limit')
+
+
+PARTIAL_ANSWER = "The time limit was reached before the answer was complete, the results found so far:\n"
+NO_ANSWER = "The time limit was reached before any result was found, please try again."
+
+
+class DeadlineExceeded(Exception):
+    """the hard limit of a request was reached"""
+
+
+def partial_answer(results: list[tuple[str, str]]) -> str:
+    """best answer of a request cut off at its hard limit, from the (task, result) of the steps done so far"""
+    if not results:
+        return NO_ANSWER
+    return PARTIAL_ANSWER + '\n'.join(f"- {task}: {message}" for task, message in results)
+
+
+class Deadline:
+    """
+    Latency budget of one plan-and-execute request.
+
+    - budget: seconds the request should take, once less than `reserve` is left the remaining steps are
+              collapsed into one final-answer call
+    - hard_limit: seconds after which the request is cut off with the best partial answer
+    - max_iterations: plans executed per request, the planner's and every revision
+    """
+
+    def __init__(self, budget: float = None, hard_limit: float = None, reserve: float = None,
+                 max_iterations: int = None):
+        self.started = time.monotonic()
+        self.budget = PnEConfig.time_budget if budget is None else budget
+        self.hard_limit = PnEConfig.hard_timeout if hard_limit is None else hard_limit
+        self.reserve = PnEConfig.answer_reserve if reserve is None else reserve
+        self.max_iterations = PnEConfig.max_iterations if max_iterations is None else max_iterations
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        """seconds left of the budget before the final answer has to be asked for"""
+        return self.budget - self.reserve - self.elapsed
+
+    def hard_remaining(self) -> float:
+        return max(0.0, self.hard_limit - self.elapsed)
+
+    def exhausted(self, iterations: int, expected: float = 0.0) -> Optional[str]:
+        """
+        Why no further plan should be executed, None while there is room for one.
+
+        Args:
+            iterations: plans executed so far
+            expected: seconds the next plan is expected to take, e.g. the wall time of the last one
+
+        Returns:
+            Optional[str]: 'collapsed_iterations' or 'collapsed_budget', the outcome of collapsing now
+        """
+        if iterations >= self.max_iterations:
+            return 'collapsed_iterations'
+        if self.remaining() < expected:
+            return 'collapsed_budget'
+        return None
+
+    def summary(self, outcome: str) -> dict:
+        return {
+            'outcome': outcome,
+            'elapsed_s': round(self.elapsed, 3),
+            'budget_s': self.budget,
+            'hard_limit_s': self.hard_limit,
+        }
+
+
+class BudgetOutcomes(metaclass=Singleton):
+    """
+    Process-wide count of the budget outcomes of plan-and-execute requests, per service.
+
+    - completed: answered by the plan within the budget
+    - collapsed_budget / collapsed_iterations: the remaining steps were replaced by one final-answer call because
+      the budget ran low or the iteration cap was reached
+    - hard_limit: cut off at the hard limit and answered with the partial results
+    """
+
+    def __init__(self):
+        self.services: dict[str, dict] = {}
+
+    def add(self, service: str, outcome: str, elapsed: float) -> None:
+        entry = self.services.get(service)
+        if entry is None:
+            entry = self.services[service] = {**dict.fromkeys(OUTCOMES, 0), 'requests': 0, 'elapsed_seconds': 0.0,
+                                              'max_elapsed_s': 0.0}
+        entry[outcome] += 1
+        entry['requests'] += 1
+        entry['elapsed_seconds'] += elapsed
+        entry['max_elapsed_s'] = round(max(entry['max_elapsed_s'], elapsed), 3)
+
+    def stats(self) -> dict:
+        return {
+            service: {**entry, 'elapsed_ms_mean': round(entry['elapsed_seconds'] / entry['requests'] * 1000, 2)}
+            for service, entry in self.services.items()
+        }
+
+    def clear(self) -> None:
+        self.services.clear()
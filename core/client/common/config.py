@@ -0,0 +1,145 @@
+import os
+
+# core/, parent of the client and server directories
+_CORE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.environ.get(name, default)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class OpenAIConfig:
+    """
+    OpenAI transport settings, every value can be overridden by environment variable.
+
+    - transport: 'async' uses AsyncOpenAI on the event loop,
+                 'sync' uses the blocking OpenAI client offloaded to worker threads
+    - base_url: API endpoint, e.g. the local stand-in of benchmark/llm_server.py; None uses api.openai.com
+    - max_connections / max_keepalive_connections / keepalive_expiry: shared httpx connection pool limits
+    - timeout: request timeout in seconds
+    - max_retries: retry count of the openai client
+    - response_chaining: store responses and chain calls of a conversation with `previous_response_id`,
+                         only the new input items are uploaded
+    """
+    transport = _env_str('OPENAI_TRANSPORT', 'async')
+    base_url = os.environ.get('OPENAI_BASE_URL')
+    max_connections = _env_int('OPENAI_MAX_CONNECTIONS', 100)
+    max_keepalive_connections = _env_int('OPENAI_MAX_KEEPALIVE_CONNECTIONS', 20)
+    keepalive_expiry = _env_float('OPENAI_KEEPALIVE_EXPIRY', 30.0)
+    timeout = _env_float('OPENAI_TIMEOUT', 60.0)
+    max_retries = _env_int('OPENAI_MAX_RETRIES', 2)
+    response_chaining = _env_bool('OPENAI_RESPONSE_CHAINING', False)
+
+
+class StreamConfig:
+    """
+    SSE framing settings of streamed answers.
+
+    - frame_max_chars: a frame is flushed once the buffered text reaches this size
+    - frame_max_delay: a frame is flushed once its first delta waited this long (seconds)
+    """
+    frame_max_chars = _env_int('STREAM_FRAME_MAX_CHARS', 64)
+    frame_max_delay = _env_float('STREAM_FRAME_MAX_DELAY', 0.05)
+
+
+class McpServerConfig:
+    """
+    Where the MCP servers are reached.
+
+    - mode: 'gateway' connects to the single gateway endpoint mounting every server (core/server/gateway.py),
+            'direct' connects to the alpha, beta and resource servers one by one
+    - transport: 'http' talks streamable HTTP to the urls below,
+                 'memory' imports the co-located server modules from server_path and calls them in-process
+    - server_path: directory of the MCP server modules for the 'memory' transport
+    - gateway_url: streamable-HTTP endpoint of the gateway
+    - alpha_url / beta_url / resource_url: endpoints of the servers in 'direct' mode
+    """
+    mode = _env_str('MCP_SERVER_MODE', 'gateway')
+    transport = _env_str('MCP_TRANSPORT', 'http')
+    server_path = _env_str('MCP_SERVER_PATH', os.path.join(_CORE_DIR, 'server'))
+    gateway_url = _env_str('MCP_GATEWAY_URL', 'http://localhost:9010/mcp')
+    alpha_url = _env_str('MCP_ALPHA_URL', 'http://localhost:9011/mcp')
+    beta_url = _env_str('MCP_BETA_URL', 'http://localhost:9012/mcp')
+    resource_url = _env_str('MCP_RESOURCE_URL', 'http://localhost:9013/mcp')
+
+    @classmethod
+    def servers(cls) -> dict[str, dict]:
+        """
+        `mcpServers` entries of the selected mode, tool names are `alpha_get_user_name` etc. in both modes.
+        `module` names the server module loaded by the 'memory' transport.
+        """
+        if cls.mode == 'gateway':
+            return {'gateway': {'url': cls.gateway_url, 'module': 'gateway'}}
+        if cls.mode == 'direct':
+            return {
+                'alpha': {'url': cls.alpha_url, 'module': 'alpha'},
+                'beta': {'url': cls.beta_url, 'module': 'beta'},
+                'resource': {'url': cls.resource_url, 'module': 'resource'},
+            }
+        raise ValueError(f"unknown MCP server mode [{cls.mode}]")
+
+
+class McpConfig:
+    """
+    MCP session pool settings.
+
+    - pool_size: warm sessions kept per MCP server
+    - health_check_interval: seconds between background pings of every session
+    - ping_timeout: seconds a ping may take before the session is reconnected
+    - call_timeout: seconds a single MCP request may take
+    - tool_catalog_ttl: seconds the tool catalog is cached, list_changed notifications invalidate it earlier
+    - tool_result_cache_size: results kept by the tool result cache
+    - tool_result_ttl: seconds a result of an `idempotent` tool without its own `cache_ttl` is cached
+    - batch_window: seconds concurrent tool calls of a server are collected into one `batch_call`
+    - batch_max_size: calls of a batch, a full batch is sent without waiting for the window
+    """
+    pool_size = _env_int('MCP_POOL_SIZE', 2)
+    health_check_interval = _env_float('MCP_HEALTH_CHECK_INTERVAL', 30.0)
+    ping_timeout = _env_float('MCP_PING_TIMEOUT', 5.0)
+    call_timeout = _env_float('MCP_CALL_TIMEOUT', 30.0)
+    tool_catalog_ttl = _env_float('MCP_TOOL_CATALOG_TTL', 300.0)
+    tool_result_cache_size = _env_int('MCP_TOOL_RESULT_CACHE_SIZE', 1024)
+    tool_result_ttl = _env_float('MCP_TOOL_RESULT_TTL', 60.0)
+    batch_window = _env_float('MCP_BATCH_WINDOW', 0.005)
+    batch_max_size = _env_int('MCP_BATCH_MAX_SIZE', 32)
+
+
+class PnEConfig:
+    """
+    Plan-and-execute settings.
+
+    - max_parallel_steps: steps of a plan executed at the same time, steps run once the steps they depend on are done
+    - replan_mode: 'always' revises the plan with a model call after every plan,
+                   'on_demand' only when a step failed, returned no data or reported a deviation;
+                   tool results are then taken as the step result without another model call
+    - plan_cache_size: plans kept for questions of the same shape with other ids or values, 0 disables the cache
+    - plan_cache_ttl: seconds a cached plan is reused
+    - time_budget: seconds a request should take, the remaining steps are collapsed into one final-answer call
+                   once the next plan would not fit in it
+    - answer_reserve: seconds of the budget kept for that final-answer call
+    - hard_timeout: seconds after which a request is cut off and answered with its partial results
+    - max_iterations: plans executed per request, the first one and every revision
+    """
+    max_parallel_steps = _env_int('PNE_MAX_PARALLEL_STEPS', 4)
+    replan_mode = _env_str('PNE_REPLAN_MODE', 'always')
+    plan_cache_size = _env_int('PNE_PLAN_CACHE_SIZE', 256)
+    plan_cache_ttl = _env_float('PNE_PLAN_CACHE_TTL', 600.0)
+    time_budget = _env_float('PNE_TIME_BUDGET', 60.0)
+    answer_reserve = _env_float('PNE_ANSWER_RESERVE', 10.0)
+    hard_timeout = _env_float('PNE_HARD_TIMEOUT', 90.0)
+    max_iterations = _env_int('PNE_MAX_ITERATIONS', 5)
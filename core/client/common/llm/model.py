@@ -1,11 +1,13 @@
 import json
-from typing import Any, Literal
+from typing import Any, Literal, Protocol
 
-from fastmcp import Client
 from mcp.types import CallToolResult, TextContent, Tool
 from openai.types.responses import ResponseOutputMessage
 from pydantic import BaseModel, Field
 
+from common.mcp.result import structured_result
+from common.mcp.result_cache import ToolResultCache
+
 
 class AvailableTool(BaseModel):
     """Represents an available MCP tool that can be invoked"""
@@ -43,14 +45,29 @@ class AvailableTool(BaseModel):
         return any(self.has_tag(tag) for tag in tags)
 
 
+class ToolCaller(Protocol):
+    """McpSessionManager or anything routing tool calls to it, e.g. ToolBatcher"""
+
+    async def call_tool_mcp(self, name: str, arguments: dict[str, Any]) -> CallToolResult: ...
+
+
 class McpTool(BaseModel):
     call_id: str = Field(...)
     function_name: str = Field(...)
     function_param: dict[str, Any] = Field(...)
     output: list[Any] = Field(default_factory=list)
-
-    async def call(self, client: Client):
-        output: CallToolResult = await client.call_tool_mcp(self.function_name, self.function_param)
+    is_error: bool = Field(default=False)
+
+    async def call(self, client: ToolCaller):
+        output: CallToolResult = await ToolResultCache().call(
+            self.function_name, self.function_param,
+            lambda: client.call_tool_mcp(self.function_name, self.function_param),
+        )
+        self.is_error = bool(output.isError)
+        if output.structuredContent is not None and not output.isError:
+            # canonical form: kept as data, serialized once as compact JSON for the model
+            self.output.append(structured_result(output.structuredContent))
+            return
         for content in output.content:
             if isinstance(content, TextContent):
                 self.output.append(content.text)
@@ -59,7 +76,7 @@ class McpTool(BaseModel):
     def function_result(self) -> str:
         if not self.output:
             raise RuntimeError(f"function [{self.function_name}] with params [{self.function_param}] is not called yet")
-        return json.dumps(self.output)
+        return json.dumps(self.output, ensure_ascii=False, separators=(',', ':'))
 
 
 class OutputMessage(BaseModel):
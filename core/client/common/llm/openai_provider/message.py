@@ -4,6 +4,7 @@ from typing import Any, TypeAlias, Union, Annotated, Optional
 from openai.types.responses import ResponseFunctionToolCall, FunctionToolParam
 
 from common.llm.model import AvailableTool, McpTool, OutputMessage, PlainInputPrompt
+from common.llm.openai_provider.schema import compile_function_tool, tool_arguments
 
 Prompts: TypeAlias = Annotated[
     Union[
@@ -16,62 +17,34 @@ Prompts: TypeAlias = Annotated[
 ]
 
 
-def _to_open_ai_function_tool_param(param: AvailableTool) -> FunctionToolParam:
-    """
-    parameter schema example:
-        FunctionToolParam(
-            type='function',
-            name="name_of_function",
-            description="description of function",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "paramA": {
-                        "type": "string",
-                        "description": "parameter A",
-                    }
-                },
-                "required": ["paramA"],
-                "additionalProperties": False,
-            },
-            strict=True)
+class OpenAIContextManager:
     """
-    schema = param.input_schema
-    properties = {
-        "name": param.name,
-        "description": param.description,
-        "type": "object",
-        "additionalProperties": False,
-        "properties": {}
-    }
-    for key in schema['properties'].keys():
-        _type = schema['properties'][key].get('type')
-        properties['properties'].update({
-            key: {
-                'type': _type,
-                'description': schema['properties'][key].get('description', '')
-            }
-        })
-        if _type == 'array':
-            properties['properties'][key].update({
-                'items': schema['properties'][key]['items']
-            })
-    properties['required'] = schema.get('required')
-
-    return FunctionToolParam(
-        type='function',
-        name=param.name,
-        description=param.description,
-        parameters=properties,
-        strict=param.strict,
-    )
+    Append-only conversation context of the OpenAI Responses API.
 
+    Every prompt is serialized once when appended, tool calls are serialized when their output arrives,
+    so `to_list()` only copies the cached entries. Pending tool calls and the last assistant message are
+    indexed, and the repr is rebuilt only when the context changed since it was last logged.
+
+    With response chaining the context also remembers the last stored response: `delta()` returns only
+    the entries appended since that response, without the output items the server already holds.
+    """
 
-class OpenAIContextManager:
     def __init__(self):
         self.prompts: list[Prompts] = []
         self.available_tools: list[AvailableTool] = []
+        self._tools_by_name: dict[str, AvailableTool] = {}
         self.instruction: Optional[str] = None
+        self._serialized: list[Any] = []
+        self._repr_lines: list[str] = []
+        self._tool_repr_lines: list[str] = []
+        self._pending: dict[str, int] = {}
+        self._last_assistant: Optional[PlainInputPrompt] = None
+        self._version = 0
+        self._repr_cache: Optional[tuple[int, str]] = None
+        self.response_id: Optional[str] = None
+        self._sent = 0
+        self._response_item_ids: set[str] = set()
+        self._server_known: set[int] = set()
 
     def __add__(self, other: Union[list, Any]) -> 'OpenAIContextManager':
         if isinstance(other, (list, tuple)):
@@ -82,76 +55,135 @@ class OpenAIContextManager:
         return self
 
     def __repr__(self):
-        _text = "[OpenAIContextManager]\n"
-        _text += "\t" + f"[instruction]: {self.instruction}" + "\n"
-        for prompt in self.to_list():
-            _text += "\t" + repr(prompt) + '\n'
-        _text += "\t" + f"[Available Tools]" + "\n"
-        for tool in self.available_tools:
-            _text += "\t" + repr(tool) + '\n'
-        return _text
+        self._resolve_pending()
+        if self._repr_cache is None or self._repr_cache[0] != self._version:
+            lines = ["[OpenAIContextManager]", "\t" + f"[instruction]: {self.instruction}"]
+            lines += self._repr_lines
+            lines.append("\t" + "[Available Tools]")
+            lines += self._tool_repr_lines
+            self._repr_cache = (self._version, '\n'.join(lines) + '\n')
+        return self._repr_cache[1]
 
     def get_invoked_tools(self) -> list[McpTool]:
-        invoked_tools = []
-        for p in self.prompts:
-            if isinstance(p, McpTool) and (not p.output):
-                invoked_tools.append(p)
-        return invoked_tools
+        self._resolve_pending()
+        return [self.prompts[position] for position in self._pending.values()]
+
+    def get_invoked_tool(self, call_id: str) -> Optional[McpTool]:
+        """McpTool of a function call that has not been called yet"""
+        position = self._pending.get(call_id)
+        return None if position is None else self.prompts[position]
 
     def get_available_tools(self) -> list[FunctionToolParam]:
-        function_tool_call_params = []
-        for tool in self.available_tools:
-            function_tool_call_params.append(_to_open_ai_function_tool_param(tool))
-        return function_tool_call_params
+        return [compile_function_tool(tool) for tool in self.available_tools]
 
     def get_last_assistant_message(self) -> PlainInputPrompt:
-        message = []
-        for prompt in self.prompts:
-            if isinstance(prompt, PlainInputPrompt) and prompt.role == 'assistant':
-                message.append(prompt)
-        return message[-1]
+        if self._last_assistant is None:
+            raise IndexError("there is no assistant message in the context")
+        return self._last_assistant
+
+    @staticmethod
+    def _serialize(prompt: Prompts) -> Any:
+        if isinstance(prompt, McpTool):
+            return {
+                "type": "function_call_output",
+                "call_id": prompt.call_id,
+                "output": prompt.function_result,
+            }
+        elif isinstance(prompt, PlainInputPrompt):
+            return {
+                'role': prompt.role, 'content': prompt.content
+            }
+        return prompt
+
+    def _push(self, prompt: Prompts, server_known: bool = False) -> None:
+        position = len(self.prompts)
+        self.prompts.append(prompt)
+        if server_known:
+            self._server_known.add(position)
+        if isinstance(prompt, McpTool) and not prompt.output:
+            # serialized once the tool has been called
+            self._pending[prompt.call_id] = position
+            self._serialized.append(None)
+            self._repr_lines.append("\t" + repr(prompt))
+        else:
+            serialized = self._serialize(prompt)
+            self._serialized.append(serialized)
+            self._repr_lines.append("\t" + repr(serialized))
+        if isinstance(prompt, PlainInputPrompt) and prompt.role == 'assistant':
+            self._last_assistant = prompt
+        self._version += 1
+
+    def _resolve_pending(self) -> None:
+        """Serialize the tool calls whose output arrived since the last look"""
+        for call_id, position in list(self._pending.items()):
+            prompt = self.prompts[position]
+            if prompt.output:
+                serialized = self._serialize(prompt)
+                self._serialized[position] = serialized
+                self._repr_lines[position] = "\t" + repr(serialized)
+                del self._pending[call_id]
+                self._version += 1
 
     def append(self, prompt: Any):
         prompt_type = getattr(prompt, 'type', None)
+        # output items of the chained response are already stored on the server
+        server_known = getattr(prompt, 'id', None) in self._response_item_ids
         if (prompt_type is None) or (prompt_type == 'custom_message'):
             if isinstance(prompt, AvailableTool):
                 self.available_tools.append(prompt)
+                self._tools_by_name[prompt.name] = prompt
+                self._tool_repr_lines.append("\t" + repr(prompt))
+                self._version += 1
             elif isinstance(prompt, PlainInputPrompt) and prompt.role == 'system':
                 self.instruction = prompt.content
+                self._version += 1
             else:
-                self.prompts.append(prompt)
+                self._push(prompt)
 
         elif prompt_type == 'function_call':
-            self.prompts.append(prompt)
-            self.prompts.append(
+            self._push(prompt, server_known)
+            arguments = json.loads(prompt.arguments)
+            tool = self._tools_by_name.get(prompt.name)
+            self._push(
                 McpTool(
                     call_id=prompt.call_id,
                     function_name=prompt.name,
-                    function_param=json.loads(prompt.arguments),
+                    function_param=arguments if tool is None else tool_arguments(tool, arguments),
                 )
             )
         elif prompt_type == 'message':
-            self.prompts.append(
+            self._push(
                 PlainInputPrompt(
                     role=prompt.role, content=prompt.content[0].text
-                )
+                ),
+                server_known,
             )
         else:
-            self.prompts.append(prompt)
+            self._push(prompt, server_known)
 
     def to_list(self):
-        prompts = []
-        for p in self.prompts:
-            if isinstance(p, McpTool):
-                prompts.append({
-                    "type": "function_call_output",
-                    "call_id": p.call_id,
-                    "output": p.function_result,
-                })
-            elif isinstance(p, PlainInputPrompt):
-                prompts.append({
-                    'role': p.role, 'content': p.content
-                })
-            else:
-                prompts.append(p)
-        return prompts
+        self._resolve_pending()
+        for position in self._pending.values():
+            # raises for a tool that has not been called yet
+            _ = self.prompts[position].function_result
+        return list(self._serialized)
+
+    def delta(self) -> list:
+        """entries the server has not seen yet when chaining on `response_id`"""
+        entries = self.to_list()
+        return [
+            entries[position] for position in range(self._sent, len(entries))
+            if position not in self._server_known
+        ]
+
+    def chain(self, response_id: str, output_item_ids: list[str]) -> None:
+        """remember the stored response, everything appended so far is known by the server"""
+        self.response_id = response_id
+        self._sent = len(self.prompts)
+        self._response_item_ids = set(output_item_ids)
+
+    def reset_chain(self) -> None:
+        self.response_id = None
+        self._sent = 0
+        self._response_item_ids = set()
+        self._server_known.clear()
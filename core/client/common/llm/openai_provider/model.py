@@ -1,13 +1,19 @@
 import asyncio
+import json
 import os
-from typing import Optional, AsyncIterable, TypeVar
+from typing import Optional, AsyncIterable, TypeVar, Union
 
+import httpx
 from langchain_openai import ChatOpenAI
-from openai import OpenAI
-from openai.types.responses import (ResponseOutputMessage, ResponseOutputItem, ParsedResponseOutputItem)
+from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, BadRequestError, NotFoundError
+from openai.types.responses import (Response, ResponseOutputMessage, ResponseOutputItem, ResponseFunctionToolCall)
 
+from common.config import OpenAIConfig
 from common.functional.singleton import Singleton
 from common.llm.openai_provider.message import OpenAIContextManager
+from common.llm.openai_provider.schema import text_format
+from common.llm.usage import current_usage
+from common.timing import timed
 from common.utils import get_logger
 
 StructureT = TypeVar('StructureT')
@@ -17,15 +23,147 @@ class OpenAIProvider(metaclass=Singleton):
     def __init__(self, api_key: str = None):
         if api_key is None:
             api_key = os.environ.get('OPENAI_API_KEY')
-        self.openai = OpenAI(api_key=api_key)
+        self.config = OpenAIConfig()
+        self.http_client = self._build_http_client()
+        self.openai = self._build_openai_client(api_key)
         self.model = "gpt-4.1-mini"
         self.logger = get_logger()
 
+    @property
+    def is_async(self) -> bool:
+        return self.config.transport != 'sync'
+
+    def _build_http_client(self) -> Union[httpx.AsyncClient, httpx.Client]:
+        """
+        Build the httpx client shared by every call of this provider.
+        keep-alive connections are reused between requests so the TLS handshake is paid once per connection.
+        """
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+        timeout = httpx.Timeout(self.config.timeout, connect=5.0)
+        if self.is_async:
+            return DefaultAsyncHttpxClient(limits=limits, timeout=timeout)
+        return DefaultHttpxClient(limits=limits, timeout=timeout)
+
+    def _build_openai_client(self, api_key: str) -> Union[AsyncOpenAI, OpenAI]:
+        client_class = AsyncOpenAI if self.is_async else OpenAI
+        return client_class(
+            api_key=api_key, base_url=self.config.base_url, http_client=self.http_client,
+            max_retries=self.config.max_retries,
+        )
+
+    async def _create(self, **kwargs):
+        """
+        call Responses.create without blocking the event loop.
+        A non streamed call is timed as model time here, a stream by its reader until the stream is closed.
+        """
+        if kwargs.get('stream'):
+            return await self._call_create(**kwargs)
+        with timed('model'):
+            return await self._call_create(**kwargs)
+
+    async def _call_create(self, **kwargs):
+        if self.is_async:
+            return await self.openai.responses.create(**kwargs)
+        return await asyncio.to_thread(self.openai.responses.create, **kwargs)
+
+    @staticmethod
+    def _payload_chars(items: list) -> int:
+        return len(json.dumps(
+            [item.model_dump(exclude_none=True) if hasattr(item, 'model_dump') else item for item in items],
+            ensure_ascii=False, default=str,
+        ))
+
+    async def _respond(self, conversation: OpenAIContextManager, **kwargs) -> Response:
+        """
+        Call Responses.create with the conversation as input.
+
+        With response chaining enabled the call continues the conversation's last stored response and
+        uploads only the items appended since, an unknown or invalid chain falls back to a full resend.
+        Usage is added to the usage record of the current request, if any.
+        """
+        usage = current_usage()
+        if not self.config.response_chaining:
+            full = conversation.to_list()
+            response = await self._create(input=full, **kwargs)
+            if usage is not None:
+                usage.add_input(len(full), len(full), 0, 0)
+                usage.add_response(response.usage)
+            return response
+
+        full = conversation.to_list()
+        response = None
+        if conversation.response_id is not None:
+            delta = conversation.delta()
+            try:
+                response = await self._create(
+                    input=delta, previous_response_id=conversation.response_id, store=True, **kwargs
+                )
+            except (BadRequestError, NotFoundError) as e:
+                self.logger.warning(f"response chain [{conversation.response_id}] rejected, resend all: {e}")
+                conversation.reset_chain()
+                if usage is not None:
+                    usage.chain_fallbacks += 1
+            else:
+                if usage is not None:
+                    usage.chained_calls += 1
+                    usage.add_input(len(delta), len(full), self._payload_chars(delta), self._payload_chars(full))
+        if response is None:
+            response = await self._create(input=full, store=True, **kwargs)
+            if usage is not None:
+                chars = self._payload_chars(full)
+                usage.add_input(len(full), len(full), chars, chars)
+
+        conversation.chain(response.id, [output.id for output in response.output if getattr(output, 'id', None)])
+        if usage is not None:
+            usage.add_response(response.usage)
+        return response
+
+    @staticmethod
+    def _parse_output(response: Response, structure: StructureT) -> Optional[StructureT]:
+        """ validate the text output of a json_schema formatted response """
+        text = response.output_text
+        if not text:
+            return None
+        return structure.model_validate_json(text)
+
+    async def _iterate(self, stream) -> AsyncIterable:
+        """ iterate a Responses stream of either transport, the blocking one is read from a worker thread """
+        if self.is_async:
+            async for event in stream:
+                yield event
+            return
+
+        iterator = iter(stream)
+        sentinel = object()
+        while (event := await asyncio.to_thread(next, iterator, sentinel)) is not sentinel:
+            yield event
+
+    async def _close_stream(self, stream) -> None:
+        if self.is_async:
+            await stream.close()
+        else:
+            await asyncio.to_thread(stream.close)
+
+    async def aclose(self) -> None:
+        """ Release the pooled connections """
+        if self.is_async:
+            await self.openai.close()
+        else:
+            self.openai.close()
+
     def get_langchain_object(self, **kwargs) -> ChatOpenAI:
         """ Creates and returns an instance of ChatOpenAI configured with the specified model. """
+        if self.is_async:
+            kwargs.setdefault('http_async_client', self.http_client)
+        if self.config.base_url is not None:
+            kwargs.setdefault('base_url', self.config.base_url)
         return ChatOpenAI(model=self.model, **kwargs)
 
-    def invoke_tools(self, conversation: OpenAIContextManager) -> list[ResponseOutputItem]:
+    async def invoke_tools(self, conversation: OpenAIContextManager) -> list[ResponseOutputItem]:
         """
         Invoke tools using LLM function calling.
 
@@ -37,15 +175,15 @@ class OpenAIProvider(metaclass=Singleton):
                 messages and function tool calls
         """
 
-        response = self.openai.responses.create(
+        response = await self._respond(
+            conversation,
             model=self.model,
             tools=conversation.get_available_tools(),
-            input=conversation.to_list(),
             stream=False,
         )
         return response.output
 
-    def chat_complete(self, conversation: OpenAIContextManager) -> Optional[ResponseOutputMessage]:
+    async def chat_complete(self, conversation: OpenAIContextManager) -> Optional[ResponseOutputMessage]:
         """
         Generate chat response with tool results.
 
@@ -56,10 +194,10 @@ class OpenAIProvider(metaclass=Singleton):
             Optional[ResponseOutputMessage]: Message output from LLM, or None if no message
                 output is found in the response
         """
-        response = self.openai.responses.create(
+        response = await self._respond(
+            conversation,
             model=self.model,
             instructions=conversation.instruction,
-            input=conversation.to_list(),
             stream=False,
         )
         self.logger.info("--------------chat_complete---------------")
@@ -73,33 +211,82 @@ class OpenAIProvider(metaclass=Singleton):
         """
         Generate streaming chat response with tool results.
 
+        Text deltas are passed through as soon as they arrive, closing the generator early
+        (e.g. the client disconnected) closes the underlying HTTP stream.
+
         Yields:
             str: Text chunks from the streaming response
         """
-        stream = self.openai.responses.create(
-            model=self.model,
-            instructions=conversation.instruction,
-            input=conversation.to_list(),
-            stream=True,
-        )
+        with timed('model'):
+            stream = await self._create(
+                model=self.model,
+                instructions=conversation.instruction,
+                input=conversation.to_list(),
+                stream=True,
+            )
+            try:
+                async for event in self._iterate(stream):
+                    if event.type == 'response.output_text.delta':
+                        yield event.delta
+                    elif event.type == 'response.completed':
+                        return
+            finally:
+                await self._close_stream(stream)
+
+    async def stream_with_tools(self, conversation: OpenAIContextManager) \
+            -> AsyncIterable[Union[str, ResponseOutputItem]]:
+        """
+        Stream the first turn of a conversation with its tools available.
 
-        for event in stream:
-            await asyncio.sleep(0.01)
-            if event.type == 'response.created':
-                yield ""
-            elif hasattr(event, 'delta'):
-                yield event.delta
-            elif event.type == 'response.completed':
-                return
-        return
+        Text deltas are yielded as soon as they arrive, so a direct answer needs no second call.
+        Every finished output item (messages and function calls) is yielded once complete; when
+        function calls show up the caller executes them and continues with `chat_stream`.
+        A function call is yielded on `response.function_call_arguments.done`, while the model may still
+        be generating the next parallel call, so it can be dispatched right away.
+
+        Yields:
+            str: text chunks of a direct answer
+            ResponseOutputItem: finished output items of the response
+        """
+        with timed('model'):
+            stream = await self._create(
+                model=self.model,
+                instructions=conversation.instruction,
+                tools=conversation.get_available_tools(),
+                input=conversation.to_list(),
+                stream=True,
+            )
+            function_calls: dict[str, ResponseFunctionToolCall] = {}
+            yielded: set[str] = set()
+            try:
+                async for event in self._iterate(stream):
+                    if event.type == 'response.output_text.delta':
+                        yield event.delta
+                    elif event.type == 'response.output_item.added' and event.item.type == 'function_call':
+                        function_calls[event.item.id] = event.item
+                    elif event.type == 'response.function_call_arguments.done' and event.item_id in function_calls:
+                        item = function_calls.pop(event.item_id)
+                        yielded.add(event.item_id)
+                        yield item.model_copy(update={'arguments': event.arguments, 'status': 'completed'})
+                    elif event.type == 'response.output_item.done':
+                        # function calls were already yielded when their arguments were done
+                        if not (event.item.type == 'function_call' and event.item.id in yielded):
+                            yield event.item
+                    elif event.type == 'response.completed':
+                        usage = current_usage()
+                        if usage is not None:
+                            usage.add_response(event.response.usage)
+                        return
+            finally:
+                await self._close_stream(stream)
 
     async def structured_output(self, conversation: OpenAIContextManager, structure: StructureT) -> StructureT:
         """
         Generate a structured response parsed into the provided schema.
 
-        This calls the OpenAI Responses.parse API to coerce the model output into
-        the shape of the given structure (text_format), such as a Pydantic model
-        or a typed dictionary.
+        This calls the OpenAI Responses API with the strict json_schema text format
+        of the given structure (compiled once per class) and validates the model output
+        into it.
 
         Args:
             conversation: OpenAIContextManager containing conversation history and
@@ -111,23 +298,23 @@ class OpenAIProvider(metaclass=Singleton):
             StructureT: Parsed structured object produced by the model.
         """
         self.logger.info("call structured_output")
-        response = self.openai.responses.parse(
+        response = await self._respond(
+            conversation,
             model=self.model,
             instructions=conversation.instruction,
-            input=conversation.to_list(),
-            text_format=structure,
+            text={'format': text_format(structure)},
         )
-        return response.output_parsed
+        return self._parse_output(response, structure)
 
     async def structured_output_with_tools(self, conversation: OpenAIContextManager, structure: StructureT) \
-            -> tuple[StructureT, list[ParsedResponseOutputItem]]:
+            -> tuple[Optional[StructureT], list[ResponseOutputItem]]:
         """
         Generate a structured response (with tool results) parsed into the provided schema.
 
         Use this when the conversation may include prior tool invocations/results
         and you want the final model response parsed into the specified structure.
-        This also utilizes the OpenAI Responses.parse API, ensuring the output
-        conforms to the given schema.
+        Like structured_output, the output is constrained by the cached strict
+        json_schema text format of the given structure.
 
         Args:
             conversation: OpenAIContextManager containing conversation history,
@@ -136,20 +323,22 @@ class OpenAIProvider(metaclass=Singleton):
                 (e.g., a Pydantic BaseModel or a TypedDict-like structure).
 
         Returns:
-            StructureT: Parsed structured object produced by the model.
+            StructureT: Parsed structured object produced by the model, None when the
+                model only called functions.
+            list[ResponseOutputItem]: function calls requested by the model
         """
         self.logger.info("call structured_output_with_tools")
-        response = self.openai.responses.parse(
+        response = await self._respond(
+            conversation,
             model=self.model,
             instructions=conversation.instruction,
             tools=conversation.get_available_tools(),
-            input=conversation.to_list(),
-            text_format=structure,
+            text={'format': text_format(structure)},
         )
 
-        function_call: list[ParsedResponseOutputItem] = []
+        function_call: list[ResponseOutputItem] = []
         for output in response.output:
             if output.type == 'function_call':
                 function_call.append(output)
 
-        return response.output_parsed, function_call
+        return self._parse_output(response, structure), function_call
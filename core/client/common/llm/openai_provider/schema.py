@@ -0,0 +1,204 @@
+import copy
+import hashlib
+import json
+from typing import Any
+
+from openai import pydantic_function_tool
+from openai.types.responses import FunctionToolParam
+from openai.types.responses.response_format_text_json_schema_config_param import \
+    ResponseFormatTextJSONSchemaConfigParam
+
+from common.llm.model import AvailableTool
+
+# keywords the Responses API does not accept in strict function schemas
+_UNSUPPORTED_KEYWORDS = ('title', 'default', 'examples')
+
+_function_tool_cache: dict[str, FunctionToolParam] = {}
+_text_format_cache: dict[type, ResponseFormatTextJSONSchemaConfigParam] = {}
+
+
+def content_hash(tool: AvailableTool) -> str:
+    """Hash of everything that ends up in the function tool param, computed once per tool object"""
+    cached = getattr(tool, '_content_hash', None)
+    if cached is None:
+        payload = json.dumps(
+            [tool.name, tool.description, tool.input_schema, tool.strict], sort_keys=True, ensure_ascii=False
+        )
+        cached = hashlib.sha256(payload.encode()).hexdigest()
+        tool._content_hash = cached
+    return cached
+
+
+def _nullable(schema: dict) -> dict:
+    """schema also accepting null, for an optional property listed as required"""
+    if 'type' in schema and '$ref' not in schema:
+        types = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+        output = {**schema, 'type': types if 'null' in types else [*types, 'null']}
+        if 'enum' in schema and None not in schema['enum']:
+            output['enum'] = [*schema['enum'], None]
+        return output
+    if 'anyOf' in schema:
+        branches = schema['anyOf']
+        if any(branch.get('type') == 'null' for branch in branches):
+            return schema
+        return {**schema, 'anyOf': [*branches, {'type': 'null'}]}
+    # $ref, allOf, ...: wrapped in a union with null, the description stays on the property
+    inner = {key: value for key, value in schema.items() if key != 'description'}
+    output = {'anyOf': [inner, {'type': 'null'}]}
+    if 'description' in schema:
+        output['description'] = schema['description']
+    return output
+
+
+def _to_strict(schema: Any) -> tuple[Any, bool]:
+    """
+    Rewrite a JSON schema into the strict subset of the Responses API.
+
+    Walks nested objects, arrays, unions and $defs: drops unsupported keywords and closes every object
+    with `additionalProperties: false`. Strict mode needs every property to be required, optional
+    properties are made nullable and listed in `required`, the nulls the model sends for them are dropped
+    again by `tool_arguments`. Free-form maps (objects without properties) cannot be expressed in strict
+    mode, they are kept as they are and the rewritten schema is returned with `False` so the tool is sent
+    non-strict.
+
+    Returns:
+        tuple[Any, bool]: rewritten schema, whether it satisfies strict mode
+    """
+    if isinstance(schema, list):
+        items = [_to_strict(item) for item in schema]
+        return [item for item, _ in items], all(ok for _, ok in items)
+    if not isinstance(schema, dict):
+        return schema, True
+
+    strict = True
+    output = {}
+    for key, value in schema.items():
+        if key in _UNSUPPORTED_KEYWORDS:
+            continue
+        if key in ('properties', '$defs', 'definitions'):
+            output[key] = {}
+            for name, sub_schema in value.items():
+                output[key][name], ok = _to_strict(sub_schema)
+                strict = strict and ok
+        elif key in ('items', 'anyOf', 'allOf', 'oneOf', 'prefixItems', 'not'):
+            output[key], ok = _to_strict(value)
+            strict = strict and ok
+        else:
+            output[key] = copy.deepcopy(value)
+
+    free_form = output.get('type') == 'object' and 'properties' not in output
+    if free_form and output.get('additionalProperties') is not False:
+        return output, False
+    if output.get('type') == 'object' or 'properties' in output:
+        properties = output.setdefault('properties', {})
+        required = set(output.get('required') or [])
+        for name in properties:
+            if name not in required:
+                properties[name] = _nullable(properties[name])
+        output['additionalProperties'] = False
+        output['required'] = list(properties)
+    return output, strict
+
+
+def _resolve(schema: dict, defs: dict) -> dict:
+    ref = schema.get('$ref')
+    return defs.get(ref.rsplit('/', 1)[-1], {}) if ref else schema
+
+
+def _drop_nulls(schema: dict, value: Any, defs: dict) -> Any:
+    schema = _resolve(schema, defs)
+    if isinstance(value, dict):
+        if 'properties' not in schema:
+            # Optional[Model]: the object branch of the union
+            branches = [_resolve(branch, defs) for branch in schema.get('anyOf', [])]
+            schema = next((branch for branch in branches if 'properties' in branch), schema)
+        properties = schema.get('properties')
+        if properties is None:
+            return value
+        required = set(schema.get('required') or [])
+        return {
+            name: _drop_nulls(properties.get(name, {}), item, defs)
+            for name, item in value.items() if item is not None or name in required
+        }
+    if isinstance(value, list) and isinstance(schema.get('items'), dict):
+        return [_drop_nulls(schema['items'], item, defs) for item in value]
+    return value
+
+
+def tool_arguments(tool: AvailableTool, arguments: dict[str, Any]) -> dict[str, Any]:
+    """
+    Arguments of a function call as the MCP tool expects them.
+
+    Strict tools list optional properties as nullable and required, so the model sends null for the ones
+    it leaves out: those are dropped (also in nested objects) for the server to apply its defaults.
+    """
+    if not compile_function_tool(tool)['strict']:
+        return arguments
+    schema = tool.input_schema
+    return _drop_nulls(schema, arguments, {**schema.get('definitions', {}), **schema.get('$defs', {})})
+
+
+def _compile_function_tool(tool: AvailableTool) -> FunctionToolParam:
+    parameters, strict_ok = _to_strict(tool.input_schema)
+    return FunctionToolParam(
+        type='function',
+        name=tool.name,
+        description=tool.description,
+        parameters=parameters,
+        strict=tool.strict and strict_ok,
+    )
+
+
+def compile_function_tool(tool: AvailableTool) -> FunctionToolParam:
+    """
+    OpenAI function tool param of an MCP tool, compiled once per tool content.
+
+    parameter schema example:
+        FunctionToolParam(
+            type='function',
+            name="name_of_function",
+            description="description of function",
+            parameters={
+                "type": "object",
+                "properties": {
+                    "paramA": {
+                        "type": "string",
+                        "description": "parameter A",
+                    }
+                },
+                "required": ["paramA"],
+                "additionalProperties": False,
+            },
+            strict=True)
+    """
+    key = content_hash(tool)
+    compiled = _function_tool_cache.get(key)
+    if compiled is None:
+        compiled = _compile_function_tool(tool)
+        _function_tool_cache[key] = compiled
+    return compiled
+
+
+def _compile_text_format(structure: type) -> ResponseFormatTextJSONSchemaConfigParam:
+    # the strict schema of openai's public pydantic helper, the one `responses.parse` sends as well
+    function = pydantic_function_tool(structure)['function']
+    return ResponseFormatTextJSONSchemaConfigParam(
+        type='json_schema',
+        name=function['name'],
+        schema=function['parameters'],
+        strict=True,
+    )
+
+
+def text_format(structure: type) -> ResponseFormatTextJSONSchemaConfigParam:
+    """strict json_schema text format of a pydantic model, compiled once per model class"""
+    compiled = _text_format_cache.get(structure)
+    if compiled is None:
+        compiled = _compile_text_format(structure)
+        _text_format_cache[structure] = compiled
+    return compiled
+
+
+def clear_cache() -> None:
+    _function_tool_cache.clear()
+    _text_format_cache.clear()
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterable, Awaitable, Callable, Optional
+
+from sse_starlette.sse import ServerSentEvent
+
+from common.config import StreamConfig
+
+
+class StreamStats:
+    """Collects time-to-first-frame and inter-frame latency of a single stream"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.first_frame_at: Optional[float] = None
+        self.last_frame_at: Optional[float] = None
+        self.frames = 0
+        self.chars = 0
+        self.max_gap = 0.0
+
+    def mark_frame(self, frame: str) -> None:
+        now = time.perf_counter()
+        if self.first_frame_at is None:
+            self.first_frame_at = now
+        else:
+            self.max_gap = max(self.max_gap, now - self.last_frame_at)
+        self.last_frame_at = now
+        self.frames += 1
+        self.chars += len(frame)
+
+    def summary(self) -> dict:
+        if self.first_frame_at is None:
+            return {'frames': 0, 'chars': 0}
+        mean_gap = (self.last_frame_at - self.first_frame_at) / (self.frames - 1) if self.frames > 1 else 0.0
+        return {
+            'ttft_ms': round((self.first_frame_at - self.started_at) * 1000, 2),
+            'total_ms': round((self.last_frame_at - self.started_at) * 1000, 2),
+            'frames': self.frames,
+            'chars': self.chars,
+            'mean_inter_frame_ms': round(mean_gap * 1000, 2),
+            'max_inter_frame_ms': round(self.max_gap * 1000, 2),
+        }
+
+
+async def coalesce(deltas: AsyncIterable[str], max_chars: int = None, max_delay: float = None) \
+        -> AsyncIterable[str]:
+    """
+    Merge small text deltas into frames.
+
+    The first delta is flushed right away to keep time-to-first-token low, afterwards a frame is flushed
+    when the buffered text reaches `max_chars` or the oldest buffered delta waited `max_delay` seconds.
+
+    Args:
+        deltas: text deltas from the model
+        max_chars: size threshold of a frame, defaults to StreamConfig.frame_max_chars
+        max_delay: time threshold of a frame in seconds, defaults to StreamConfig.frame_max_delay
+
+    Yields:
+        str: coalesced frames
+    """
+    max_chars = StreamConfig.frame_max_chars if max_chars is None else max_chars
+    max_delay = StreamConfig.frame_max_delay if max_delay is None else max_delay
+    loop = asyncio.get_running_loop()
+    iterator = aiter(deltas)
+
+    buffer: list[str] = []
+    size = 0
+    deadline: Optional[float] = None
+    first = True
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(iterator))
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+            if not done:
+                yield ''.join(buffer)
+                buffer, size, deadline = [], 0, None
+                continue
+
+            task, pending = pending, None
+            try:
+                delta = task.result()
+            except StopAsyncIteration:
+                break
+            if not delta:
+                continue
+
+            if first:
+                first = False
+                yield delta
+                continue
+
+            buffer.append(delta)
+            size += len(delta)
+            if deadline is None:
+                deadline = loop.time() + max_delay
+            if size >= max_chars:
+                yield ''.join(buffer)
+                buffer, size, deadline = [], 0, None
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.wait({pending})
+        if hasattr(iterator, 'aclose'):
+            await iterator.aclose()
+
+    if buffer:
+        yield ''.join(buffer)
+
+
+def encode_frame(frame: str) -> bytes:
+    return ServerSentEvent(event='stream', data=json.dumps({'message': 'response', 'contents': frame})).encode()
+
+
+def encode_done() -> bytes:
+    return ServerSentEvent(event='Done', data=json.dumps({'message': 'Done', 'contents': '.'})).encode()
+
+
+async def to_sse(frames: AsyncIterable[str], stats: StreamStats,
+                 is_disconnected: Callable[[], Awaitable[bool]] = None) -> AsyncIterable[bytes]:
+    """
+    Encode frames as SSE `stream` events followed by a `Done` event.
+
+    Stops reading the upstream as soon as the client is gone, closing `frames` cancels the model stream.
+    """
+    try:
+        async for frame in frames:
+            if is_disconnected is not None and await is_disconnected():
+                return
+            stats.mark_frame(frame)
+            yield encode_frame(frame)
+        yield encode_done()
+    finally:
+        if hasattr(frames, 'aclose'):
+            await frames.aclose()
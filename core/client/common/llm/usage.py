@@ -0,0 +1,72 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_current_usage: ContextVar[Optional['UsageRecord']] = ContextVar('llm_usage', default=None)
+
+
+class UsageRecord:
+    """
+    Model usage of a single request.
+
+    Besides the token counts reported by the API it records how much conversation input was uploaded
+    against what a full resend would have uploaded, which is what response chaining saves.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.chained_calls = 0
+        self.chain_fallbacks = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.output_tokens = 0
+        self.items_sent = 0
+        self.items_full = 0
+        self.chars_sent = 0
+        self.chars_full = 0
+
+    def add_response(self, usage) -> None:
+        self.calls += 1
+        if usage is None:
+            return
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+        if usage.input_tokens_details is not None:
+            self.cached_tokens += usage.input_tokens_details.cached_tokens
+
+    def add_input(self, items_sent: int, items_full: int, chars_sent: int, chars_full: int) -> None:
+        self.items_sent += items_sent
+        self.items_full += items_full
+        self.chars_sent += chars_sent
+        self.chars_full += chars_full
+
+    def summary(self) -> dict:
+        return {
+            'calls': self.calls,
+            'chained_calls': self.chained_calls,
+            'chain_fallbacks': self.chain_fallbacks,
+            'input_tokens': self.input_tokens,
+            'cached_tokens': self.cached_tokens,
+            'output_tokens': self.output_tokens,
+            'items_sent': self.items_sent,
+            'items_full': self.items_full,
+            'chars_sent': self.chars_sent,
+            'chars_full': self.chars_full,
+            # rough 4 characters per token estimate of the input not uploaded again
+            'input_tokens_saved_est': (self.chars_full - self.chars_sent) // 4,
+        }
+
+
+def current_usage() -> Optional[UsageRecord]:
+    return _current_usage.get()
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageRecord]:
+    """Collect the usage of every model call made inside the block (including spawned tasks)"""
+    record = UsageRecord()
+    token = _current_usage.set(record)
+    try:
+        yield record
+    finally:
+        _current_usage.reset(token)
@@ -0,0 +1,96 @@
+"""
+Strands `MCPClient`s to the MCP servers, shared by the strands (core/strands_agent) and a2a (core/a2a) agents.
+
+The settings are the client's `McpServerConfig` (MCP_TRANSPORT, MCP_SERVER_PATH, ...), the 'memory' transport
+loads the co-located server modules with `common.mcp.local.load_server` like the client's session pools do.
+"""
+from contextlib import ExitStack, asynccontextmanager
+from typing import Callable
+
+import anyio
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.memory import create_client_server_memory_streams
+from mcp.types import CallToolResult
+from strands.hooks import AfterToolCallEvent, HookProvider, HookRegistry
+from strands.tools.mcp.mcp_client import MCPClient, MCPAgentTool
+
+from common.config import McpServerConfig
+from common.mcp.local import load_server
+from common.mcp.result import result_text
+
+
+@asynccontextmanager
+async def memory_transport(module: str):
+    """MCP transport to a server object of this process: (read, write) streams of a server task"""
+    server = load_server(module)._mcp_server
+    async with create_client_server_memory_streams() as (client_streams, (server_read, server_write)):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(lambda: server.run(server_read, server_write, server.create_initialization_options()))
+            try:
+                yield client_streams
+            finally:
+                tg.cancel_scope.cancel()
+
+
+def mcp_transport(module: str, url: str) -> Callable:
+    """transport factory of a strands `MCPClient` for the server module at the url"""
+    if McpServerConfig.transport == 'memory':
+        return lambda: memory_transport(module)
+    return lambda: streamablehttp_client(url)
+
+
+def is_batch_tool(tool: MCPAgentTool) -> bool:
+    """`batch_call` entry point of a server, every server registers one under the same name"""
+    return bool((tool.mcp_tool.meta or {}).get('batch'))
+
+
+class StructuredResultText(HookProvider):
+    """
+    Adds the text of structured tool results for the model: strands only hands it the text blocks of a result,
+    the servers send structured content only by default (TOOL_RESULT_ENCODING=structured_only).
+    """
+
+    def register_hooks(self, registry: HookRegistry, **kwargs) -> None:
+        registry.add_callback(AfterToolCallEvent, self.add_text)
+
+    @staticmethod
+    def add_text(event: AfterToolCallEvent) -> None:
+        result = event.result
+        structured = result.get('structuredContent')
+        if structured is None or any('text' in content for content in result.get('content', [])):
+            return
+        text = result_text(CallToolResult(content=[], structuredContent=structured))
+        event.result = {**result, 'content': [*result.get('content', []), {'text': text}]}
+
+
+class ToolService:
+    """
+    One strands `MCPClient` per server of `McpServerConfig.servers()`: the gateway (default), or alpha, beta
+    and resource in 'direct' mode. Tool names are `alpha_get_user_name` etc. in both modes, the gateway
+    prefixes them itself, in 'direct' mode the client prefixes them with its server name.
+    Entering the service opens every client.
+    """
+
+    def __init__(self):
+        tool_filters = {'rejected': [is_batch_tool]}
+        self.clients: dict[str, MCPClient] = {
+            name: MCPClient(mcp_transport(server['module'], server['url']), tool_filters=tool_filters,
+                            prefix=None if McpServerConfig.mode == 'gateway' else name)
+            for name, server in McpServerConfig.servers().items()
+        }
+        self._stack: ExitStack = None
+
+    def __enter__(self) -> 'ToolService':
+        with ExitStack() as stack:
+            for client in self.clients.values():
+                stack.enter_context(client)
+            self._stack = stack.pop_all()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        stack, self._stack = self._stack, None
+        stack.__exit__(*exc_info)
+
+    def list_tools(self) -> list[MCPAgentTool]:
+        with self:
+            return [tool for client in self.clients.values() for tool in client.list_tools_sync()]
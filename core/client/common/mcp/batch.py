@@ -0,0 +1,104 @@
+import asyncio
+from typing import Any, Optional
+
+from mcp.types import CallToolResult, ContentBlock, TextContent
+from pydantic import TypeAdapter
+
+from common.config import McpConfig
+from common.mcp.catalog import ToolCatalog
+from common.mcp.session import McpSessionManager
+
+BATCH_TOOL_NAME = 'batch_call'
+
+_content_adapter = TypeAdapter(list[ContentBlock])
+
+
+class ToolBatcher:
+    """
+    Groups concurrent tool calls per MCP server into one `batch_call` request.
+
+    Calls arriving within `window` seconds of the first pending call of a server are sent together,
+    a batch is flushed early once it reaches `max_size`. Servers without a batch entry point in the
+    tool catalog, and batches of a single call, go through `call_tool_mcp` unchanged.
+    Exposes `call_tool_mcp` so it can stand in for the session manager in `McpTool.call`.
+    """
+
+    def __init__(self, client: McpSessionManager, window: float = None, max_size: int = None):
+        self.client = client
+        self.window = McpConfig.batch_window if window is None else window
+        self.max_size = McpConfig.batch_max_size if max_size is None else max_size
+        self.round_trips = 0
+        self.calls = 0
+        self._pending: dict[str, list[tuple[str, dict[str, Any], asyncio.Future]]] = {}
+        self._flush_tasks: dict[str, asyncio.Task] = {}
+        self._send_tasks: set[asyncio.Task] = set()
+
+    def _batch_tool(self, server: str) -> Optional[str]:
+        name = self.client.tool_name(server, BATCH_TOOL_NAME)
+        return name if name in ToolCatalog().batch_tools else None
+
+    async def call_tool_mcp(self, name: str, arguments: dict[str, Any]) -> CallToolResult:
+        self.calls += 1
+        server, tool_name = self.client.route(name)
+        if self._batch_tool(server) is None:
+            self.round_trips += 1
+            return await self.client.call_tool_mcp(name, arguments)
+
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(server, [])
+        pending.append((tool_name, arguments, future))
+        if len(pending) >= self.max_size:
+            self._flush(server)
+        elif server not in self._flush_tasks:
+            self._flush_tasks[server] = asyncio.create_task(self._flush_later(server))
+        return await future
+
+    async def _flush_later(self, server: str) -> None:
+        await asyncio.sleep(self.window)
+        self._flush(server)
+
+    def _flush(self, server: str) -> None:
+        batch = self._pending.pop(server, [])
+        task = self._flush_tasks.pop(server, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        if batch:
+            task = asyncio.create_task(self._send(server, batch))
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_tasks.discard)
+
+    async def _send(self, server: str, batch: list[tuple[str, dict[str, Any], asyncio.Future]]) -> None:
+        self.round_trips += 1
+        try:
+            if len(batch) == 1:
+                tool_name, arguments, future = batch[0]
+                result = await self.client.call_tool_mcp(self.client.tool_name(server, tool_name), arguments)
+                if not future.done():
+                    future.set_result(result)
+                return
+
+            output = await self.client.call_tool_mcp(self._batch_tool(server), {
+                'calls': [{'tool': tool_name, 'arguments': arguments} for tool_name, arguments, _ in batch]
+            })
+            if output.isError:
+                raise RuntimeError(f"batch_call of [{server}] failed: {output.content}")
+            for (_, _, future), item in zip(batch, output.structuredContent['results']):
+                if not future.done():
+                    future.set_result(self._to_result(item))
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    @staticmethod
+    def _to_result(item: dict[str, Any]) -> CallToolResult:
+        if item['isError']:
+            return CallToolResult(content=[TextContent(type='text', text=item.get('error', ''))], isError=True)
+        return CallToolResult(
+            content=_content_adapter.validate_python(item['content']),
+            structuredContent=item.get('structuredContent'),
+            isError=False,
+        )
+
+    def stats(self) -> dict:
+        return {'calls': self.calls, 'round_trips': self.round_trips}
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import Optional
+
+from common.config import McpConfig
+from common.functional.singleton import Singleton
+from common.llm.model import AvailableTool
+from common.mcp.result_cache import ToolResultCache
+from common.mcp.session import McpSessionManager
+from common.utils import get_logger
+
+
+class ToolCatalog(metaclass=Singleton):
+    """
+    Process-wide cache of the tools exposed by the MCP servers.
+
+    The catalog is fetched once and kept for `ttl` seconds, a `notifications/tools/list_changed`
+    (or a reconnected server) invalidates it right away. Tag filtering is served from a tag index.
+    Batch entry points (meta `batch: true`) are kept apart, they are used by ToolBatcher and never
+    offered to the model.
+    """
+
+    def __init__(self, ttl: float = None):
+        self.ttl = McpConfig.tool_catalog_ttl if ttl is None else ttl
+        self.tools: list[AvailableTool] = []
+        self.by_name: dict[str, AvailableTool] = {}
+        self.by_tag: dict[str, list[int]] = {}
+        self.batch_tools: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._subscribed: set[int] = set()
+        self.logger = get_logger()
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and (time.monotonic() - self._loaded_at) < self.ttl
+
+    def invalidate(self, server: str = None) -> None:
+        if self._loaded_at is not None:
+            self.invalidations += 1
+            self.logger.info(f"tool catalog invalidated by [{server or 'manual'}]")
+        self._generation += 1
+        self._loaded_at = None
+
+    def _index(self, tools: list[AvailableTool]) -> None:
+        self.batch_tools = {tool.name for tool in tools if tool.meta.get('batch')}
+        tools = [tool for tool in tools if tool.name not in self.batch_tools]
+        by_tag: dict[str, list[int]] = {}
+        for position, tool in enumerate(tools):
+            for tag in tool.tags:
+                by_tag.setdefault(tag, []).append(position)
+        self.tools = tools
+        self.by_name = {tool.name: tool for tool in tools}
+        self.by_tag = by_tag
+        ToolResultCache().configure(tools)
+
+    async def _refresh(self, client: McpSessionManager) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # another request may have refreshed the catalog while waiting for the lock
+            if self.is_fresh:
+                return
+            generation = self._generation
+            loaded_at = time.monotonic()
+            self._index([AvailableTool(tool) for tool in await client.list_tools()])
+            # a list_changed arriving during the fetch keeps the catalog stale
+            if generation == self._generation:
+                self._loaded_at = loaded_at
+
+    async def get(self, client: McpSessionManager, tags: list[str] = None) -> list[AvailableTool]:
+        """
+        Return the available tools, optionally only those having any of the given tags.
+
+        Args:
+            client: MCP session manager used to (re)load the catalog
+            tags: tag filter, every tool is returned when empty
+
+        Returns:
+            list[AvailableTool]: tools in the order the servers listed them
+        """
+        if id(client) not in self._subscribed:
+            client.on_tool_list_changed(self.invalidate)
+            self._subscribed.add(id(client))
+
+        if self.is_fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+            await self._refresh(client)
+
+        if not tags:
+            return list(self.tools)
+        positions = set()
+        for tag in tags:
+            positions.update(self.by_tag.get(tag, ()))
+        return [self.tools[position] for position in sorted(positions)]
+
+    def find(self, name: str) -> Optional[AvailableTool]:
+        return self.by_name.get(name)
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'size': len(self.tools),
+            'age_s': None if self._loaded_at is None else round(time.monotonic() - self._loaded_at, 3),
+            'ttl_s': self.ttl,
+        }
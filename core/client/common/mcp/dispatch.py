@@ -0,0 +1,68 @@
+import asyncio
+import time
+from typing import Optional
+
+from common.llm.model import McpTool, ToolCaller
+
+
+class ToolDispatcher:
+    """
+    Starts MCP tool calls while the model is still generating.
+
+    Every function call is dispatched as soon as its arguments are complete, the results land in the
+    McpTool objects of the conversation, so they are merged back in call order whatever order they finish in.
+    `saved_ms` compares the wait after the model finished against starting every call at that moment.
+    """
+
+    def __init__(self, client: ToolCaller):
+        self.client = client
+        self.tools: list[McpTool] = []
+        self._tasks: list[asyncio.Task] = []
+        self._durations: list[float] = []
+        self._first_dispatch_at: Optional[float] = None
+        self._model_done_at: Optional[float] = None
+        self._joined_at: Optional[float] = None
+
+    async def _call(self, tool: McpTool) -> None:
+        start = time.perf_counter()
+        try:
+            await tool.call(client=self.client)
+        finally:
+            self._durations.append(time.perf_counter() - start)
+
+    def submit(self, tool: McpTool) -> None:
+        if self._first_dispatch_at is None:
+            self._first_dispatch_at = time.perf_counter()
+        self.tools.append(tool)
+        self._tasks.append(asyncio.create_task(self._call(tool)))
+
+    def model_done(self) -> None:
+        self._model_done_at = time.perf_counter()
+
+    async def join(self) -> list[McpTool]:
+        """Wait for every dispatched call, the first failure is raised"""
+        if self._model_done_at is None:
+            self.model_done()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            self._joined_at = time.perf_counter()
+        return self.tools
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+    def stats(self) -> dict:
+        if not self._tasks or self._joined_at is None:
+            return {'calls': len(self._tasks)}
+        waited = self._joined_at - self._model_done_at
+        # started after the model finished, the calls would have run for the longest of them
+        saved = max(max(self._durations, default=0.0) - waited, 0.0)
+        return {
+            'calls': len(self._tasks),
+            'started_before_model_done_ms': round((self._model_done_at - self._first_dispatch_at) * 1000, 2),
+            'wait_after_model_ms': round(waited * 1000, 2),
+            'longest_call_ms': round(max(self._durations, default=0.0) * 1000, 2),
+            'saved_ms': round(saved * 1000, 2),
+        }
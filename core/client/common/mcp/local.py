@@ -0,0 +1,33 @@
+import importlib.util
+import os
+import sys
+
+from fastmcp import FastMCP
+
+from common.config import McpServerConfig
+
+
+def load_server(module: str) -> FastMCP:
+    """
+    Import a co-located MCP server module (`alpha`, `beta`, `resource`, `gateway`) from MCP_SERVER_PATH
+    and return its `FastMCP` instance, for the in-memory transport.
+
+    The server directory is put on sys.path like `fastmcp run` does, so the servers' own imports
+    (`from batch import ...`) resolve. The module is loaded under a private name: `resource` would
+    otherwise resolve to the standard library module once that is imported.
+    """
+    name = f"mcp_server_{module}"
+    if name not in sys.modules:
+        if McpServerConfig.server_path not in sys.path:
+            sys.path.insert(0, McpServerConfig.server_path)
+        spec = importlib.util.spec_from_file_location(name, os.path.join(McpServerConfig.server_path, f"{module}.py"))
+        if spec is None:
+            raise ValueError(f"MCP server module [{module}] not found in [{McpServerConfig.server_path}]")
+        server = importlib.util.module_from_spec(spec)
+        sys.modules[name] = server
+        try:
+            spec.loader.exec_module(server)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return sys.modules[name].mcp
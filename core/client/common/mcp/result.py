@@ -0,0 +1,22 @@
+import json
+from typing import Any
+
+from mcp.types import CallToolResult, TextContent
+
+
+def structured_result(structured: dict[str, Any]) -> Any:
+    """value of a structured tool result: the `result` field when it is the only one, else the whole object"""
+    return structured['result'] if structured.keys() == {'result'} else structured
+
+
+def result_text(output: CallToolResult) -> str:
+    """
+    Text of a tool result for frameworks handing the model text only (LangChain tools, strands).
+
+    The servers send structured content only by default (TOOL_RESULT_ENCODING=structured_only), its value is
+    serialized here as compact JSON, text values as they are; results without one are their text blocks.
+    """
+    if output.structuredContent is not None:
+        value = structured_result(output.structuredContent)
+        return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return '\n'.join(content.text for content in output.content if isinstance(content, TextContent))
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from mcp.types import CallToolResult
+
+from common.config import McpConfig
+from common.functional.singleton import Singleton
+
+
+class ToolResultCache(metaclass=Singleton):
+    """
+    Process-wide cache of MCP tool results, keyed by tool name and canonical parameters.
+
+    Only tools declaring themselves cacheable in their `meta` are cached: `idempotent: true` (with the
+    default TTL) or an explicit `cache_ttl` in seconds. Entries are evicted least recently used first
+    and expire after their TTL. Identical calls in flight at the same time share one MCP request.
+    """
+
+    def __init__(self, max_entries: int = None, default_ttl: float = None):
+        self.max_entries = McpConfig.tool_result_cache_size if max_entries is None else max_entries
+        self.default_ttl = McpConfig.tool_result_ttl if default_ttl is None else default_ttl
+        self.policies: dict[str, float] = {}
+        self.entries: OrderedDict[tuple[str, str], tuple[float, CallToolResult]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+
+    def ttl_of(self, meta: dict[str, Any]) -> Optional[float]:
+        """cache TTL declared by a tool meta, None when the tool must not be cached"""
+        if not meta:
+            return None
+        if meta.get('cache_ttl') is not None:
+            return float(meta['cache_ttl'])
+        if meta.get('idempotent'):
+            return self.default_ttl
+        return None
+
+    def configure(self, tools: list) -> None:
+        """(re)load the cache policies from the tool catalog, results of tools no longer cacheable are dropped"""
+        policies = {}
+        for tool in tools:
+            ttl = self.ttl_of(tool.meta)
+            if ttl is not None and ttl > 0:
+                policies[tool.name] = ttl
+        self.policies = policies
+        for key in [key for key in self.entries if key[0] not in policies]:
+            del self.entries[key]
+
+    @staticmethod
+    def key(name: str, params: dict[str, Any]) -> tuple[str, str]:
+        return name, json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+    def _lookup(self, key: tuple[str, str]) -> Optional[CallToolResult]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return result
+
+    def _store(self, key: tuple[str, str], result: CallToolResult, ttl: float) -> None:
+        self.entries[key] = (time.monotonic() + ttl, result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    async def call(self, name: str, params: dict[str, Any],
+                   loader: Callable[[], Awaitable[CallToolResult]]) -> CallToolResult:
+        """
+        Return the cached result of a tool call, or load it with `loader`.
+
+        Args:
+            name: tool name as exposed to the model
+            params: tool parameters
+            loader: performs the MCP call on a miss
+
+        Returns:
+            CallToolResult: result of the call, error results are never cached
+        """
+        ttl = self.policies.get(name)
+        if ttl is None:
+            return await loader()
+
+        key = self.key(name, params)
+        result = self._lookup(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.ensure_future(loader())
+        self._inflight[key] = future
+
+        def _done(done: asyncio.Future) -> None:
+            self._inflight.pop(key, None)
+            if not done.cancelled() and done.exception() is None and not done.result().isError:
+                self._store(key, done.result(), ttl)
+
+        future.add_done_callback(_done)
+        # the call keeps running for the coalesced callers when this one is cancelled
+        return await asyncio.shield(future)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'cacheable_tools': sorted(self.policies),
+        }
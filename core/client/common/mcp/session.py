@@ -0,0 +1,267 @@
+import asyncio
+import itertools
+from typing import Any, Callable, Optional
+
+import anyio
+import httpx
+import mcp.types
+from fastmcp import Client
+from fastmcp.client.messages import MessageHandler
+from mcp.shared.exceptions import McpError
+from mcp.types import CallToolResult, Tool
+
+from common.config import McpConfig, McpServerConfig
+from common.mcp.local import load_server
+from common.timing import timed
+from common.utils import get_logger
+
+# errors meaning the session itself is broken, the call is retried once on another session
+# failures of the session itself, a request that failed with one of them never reached the server's tool
+CONNECTION_ERRORS = (httpx.TransportError, anyio.ClosedResourceError, anyio.BrokenResourceError, McpError)
+CONNECTION_ERROR_CODES = {mcp.types.CONNECTION_CLOSED}
+
+
+def is_connection_error(e: Exception) -> bool:
+    if isinstance(e, McpError):
+        return e.error.code in CONNECTION_ERROR_CODES
+    return isinstance(e, CONNECTION_ERRORS)
+
+
+class ToolListChangedHandler(MessageHandler):
+    """Forwards `notifications/tools/list_changed` of a server to the registered listeners"""
+
+    def __init__(self, server: str, listeners: list[Callable[[str], None]]):
+        self.server = server
+        self.listeners = listeners
+
+    def notify(self) -> None:
+        for listener in self.listeners:
+            listener(self.server)
+
+    async def on_tool_list_changed(self, message: mcp.types.ToolListChangedNotification) -> None:
+        self.notify()
+
+
+class McpServerPool:
+    """
+    Warm sessions to a single MCP server.
+
+    Every session is connected once and shared by concurrent requests (JSON-RPC requests are multiplexed
+    over one session), calls are spread over the healthy sessions in round-robin order.
+    """
+
+    def __init__(self, name: str, transport: Any, size: int, timeout: float = None,
+                 message_handler: ToolListChangedHandler = None):
+        self.name = name
+        self.size = size
+        self._transport = transport
+        self._message_handler = message_handler
+        self._clients: list[Client] = [
+            Client(transport, timeout=timeout, message_handler=message_handler) for _ in range(size)
+        ]
+        self._healthy: list[bool] = [False] * size
+        self._entered: list[bool] = [False] * size
+        self._cursor = itertools.count()
+        self._locks = [asyncio.Lock() for _ in range(size)]
+        # background reconnects, referenced until done so they are not garbage collected mid-flight
+        self._reconnects: set[asyncio.Task] = set()
+        self.logger = get_logger()
+
+    @property
+    def healthy_count(self) -> int:
+        return sum(self._healthy)
+
+    async def start(self) -> None:
+        await asyncio.gather(*[self.reconnect(index, notify=False) for index in range(self.size)])
+
+    def acquire(self) -> tuple[int, Client]:
+        """Pick the next healthy session"""
+        for _ in range(self.size):
+            index = next(self._cursor) % self.size
+            if self._healthy[index]:
+                return index, self._clients[index]
+        raise RuntimeError(f"no healthy session for MCP server [{self.name}]")
+
+    def mark_unhealthy(self, index: int) -> None:
+        self._healthy[index] = False
+
+    def schedule_reconnect(self, index: int) -> None:
+        """Reopen the session of the given slot in the background"""
+        task = asyncio.create_task(self.reconnect(index))
+        self._reconnects.add(task)
+        task.add_done_callback(self._reconnects.discard)
+
+    async def reconnect(self, index: int, notify: bool = True) -> bool:
+        """(Re)open the session of the given slot, returns whether it is usable"""
+        async with self._locks[index]:
+            self._healthy[index] = False
+            client = self._clients[index]
+            if self._entered[index]:
+                # a dead session keeps its nesting state, start over from a fresh client
+                try:
+                    await client.close()
+                except Exception as e:
+                    self.logger.debug(f"closing broken MCP session [{self.name}#{index}]: {e!r}")
+                client = client.new()
+                self._clients[index] = client
+                self._entered[index] = False
+            try:
+                await client.__aenter__()
+            except Exception as e:
+                self.logger.warning(f"failed to connect MCP server [{self.name}#{index}]: {e}")
+                return False
+            self._entered[index] = True
+            self._healthy[index] = True
+        if notify and self._message_handler is not None:
+            # a (re)connected server may expose another tool set than the cached one
+            self._message_handler.notify()
+        return True
+
+    async def health_check(self, ping_timeout: float) -> None:
+        async def check(index: int):
+            client = self._clients[index]
+            if self._healthy[index] and client.is_connected():
+                try:
+                    with anyio.fail_after(ping_timeout):
+                        if await client.ping():
+                            return
+                except Exception as e:
+                    self.logger.warning(f"MCP session [{self.name}#{index}] ping failed: {e!r}")
+            await self.reconnect(index)
+
+        await asyncio.gather(*[check(index) for index in range(self.size)])
+
+    async def close(self) -> None:
+        for task in list(self._reconnects):
+            task.cancel()
+        self._reconnects.clear()
+        for index, client in enumerate(self._clients):
+            self._healthy[index] = False
+            if self._entered[index]:
+                self._entered[index] = False
+                try:
+                    await client.close()
+                except Exception as e:
+                    self.logger.debug(f"closing MCP session [{self.name}#{index}]: {e!r}")
+
+
+class McpSessionManager:
+    """
+    Long-lived sessions to every configured MCP server.
+
+    Replaces entering a multi-server `fastmcp.Client` per call: the initialize handshake is done once per
+    session, sessions are health-checked and reconnected in the background.
+    Tool names are prefixed with the server name (`alpha_get_user_name`) when more than one server is
+    configured, the same naming as `fastmcp.Client(config)`.
+    """
+
+    def __init__(self, config: dict, pool_size: int = None, health_check_interval: float = None):
+        self.config = config
+        self.pool_size = McpConfig.pool_size if pool_size is None else pool_size
+        self.health_check_interval = (McpConfig.health_check_interval
+                                      if health_check_interval is None else health_check_interval)
+        self.pools: dict[str, McpServerPool] = {}
+        self._started = False
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._tool_list_listeners: list[Callable[[str], None]] = []
+        self.logger = get_logger()
+
+    def on_tool_list_changed(self, listener: Callable[[str], None]) -> None:
+        """Register a callback receiving the server name whenever its tool list changed"""
+        if listener not in self._tool_list_listeners:
+            self._tool_list_listeners.append(listener)
+
+    @property
+    def prefixed(self) -> bool:
+        return len(self.config['mcpServers']) > 1
+
+    def _transport(self, server: dict) -> Any:
+        if McpServerConfig.transport == 'memory':
+            # co-located server object: no HTTP, JSON-RPC messages go through in-memory streams
+            return load_server(server['module'])
+        if McpServerConfig.transport != 'http':
+            raise ValueError(f"unknown MCP transport [{McpServerConfig.transport}]")
+        return server['url']
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._started:
+                return
+            self.pools = {
+                name: McpServerPool(
+                    name, self._transport(server), self.pool_size, timeout=McpConfig.call_timeout,
+                    message_handler=ToolListChangedHandler(name, self._tool_list_listeners)
+                )
+                for name, server in self.config['mcpServers'].items()
+            }
+            await asyncio.gather(*[pool.start() for pool in self.pools.values()])
+            self._health_task = asyncio.create_task(self._health_loop())
+            self._started = True
+            self.logger.info(f"MCP sessions ready: { {name: pool.healthy_count for name, pool in self.pools.items()} }")
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await asyncio.gather(
+                *[pool.health_check(McpConfig.ping_timeout) for pool in self.pools.values()],
+                return_exceptions=True
+            )
+
+    async def close(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for pool in self.pools.values():
+            await pool.close()
+        self.pools = {}
+        self._started = False
+
+    def tool_name(self, server: str, name: str) -> str:
+        """Name of a server's tool as exposed to the model"""
+        return f"{server}_{name}" if self.prefixed else name
+
+    def route(self, name: str) -> tuple[str, str]:
+        """Resolve a (prefixed) tool name to its server and the name known by that server"""
+        if not self.prefixed:
+            return next(iter(self.config['mcpServers'])), name
+        for server in self.config['mcpServers']:
+            if name.startswith(f"{server}_"):
+                return server, name[len(server) + 1:]
+        raise ValueError(f"tool [{name}] does not belong to any MCP server")
+
+    async def _request(self, server: str, method: str, *args, **kwargs) -> Any:
+        await self.start()
+        pool = self.pools[server]
+        index, client = pool.acquire()
+        with timed('mcp'):
+            try:
+                return await getattr(client, method)(*args, **kwargs)
+            except CONNECTION_ERRORS as e:
+                if not is_connection_error(e):
+                    raise
+                self.logger.warning(f"MCP session [{server}#{index}] failed on {method}, retrying: {e}")
+                pool.mark_unhealthy(index)
+                pool.schedule_reconnect(index)
+                _, client = pool.acquire()
+                return await getattr(client, method)(*args, **kwargs)
+
+    async def list_tools_of(self, server: str) -> list[Tool]:
+        tools = await self._request(server, 'list_tools')
+        if not self.prefixed:
+            return tools
+        return [tool.model_copy(update={'name': self.tool_name(server, tool.name)}) for tool in tools]
+
+    async def list_tools(self) -> list[Tool]:
+        await self.start()
+        servers = [server for server, pool in self.pools.items() if pool.healthy_count]
+        results = await asyncio.gather(*[self.list_tools_of(server) for server in servers])
+        return [tool for tools in results for tool in tools]
+
+    async def call_tool_mcp(self, name: str, arguments: dict[str, Any]) -> CallToolResult:
+        server, tool_name = self.route(name)
+        return await self._request(server, 'call_tool_mcp', tool_name, arguments)
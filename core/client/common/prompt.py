@@ -13,7 +13,7 @@ class PromptManager(metaclass=Singleton):
     system_prompt = _chat.get('system_prompt').get('v1')
 
     _chat = _prompt.get('pne')
-    planning_instruction_prompt = _chat.get('planning_instruction_prompt').get('v3')
+    planning_instruction_prompt = _chat.get('planning_instruction_prompt').get('v4')
     replanning_sys_prompt = _chat.get('replanning_prompt').get('system_prompt')
     replanning_user_prompt = _chat.get('replanning_prompt').get('user_prompt')
     plan_execute_system_prompt = _chat.get('plan_executor').get('system_prompt')
@@ -1,25 +1,15 @@
-from fastmcp import Client
-
+from common.config import McpServerConfig
+from common.mcp.session import McpSessionManager
 from common.prompt import PromptManager
 from common.utils import get_logger
 
 
 class CommonService:
     config = {
-        "mcpServers": {
-            "alpha": {
-                "url": "http://localhost:9011/mcp"
-            },
-            "beta": {
-                "url": "http://localhost:9012/mcp"
-            },
-            "resource": {
-                "url": "http://localhost:9013/mcp"
-            }
-        }
+        "mcpServers": McpServerConfig.servers()
     }
 
-    mcp_servers = Client(config)
+    mcp_servers = McpSessionManager(config)
 
     def __init__(self, room_id: str = None):
         self.logger = get_logger(room_id)
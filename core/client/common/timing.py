@@ -0,0 +1,170 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from common.functional.singleton import Singleton
+
+_current_timing: ContextVar[Optional['RequestTiming']] = ContextVar('request_timing', default=None)
+
+KINDS = ('model', 'mcp')
+
+
+class RequestTiming:
+    """
+    Wall time of a single request split into model time, MCP time and the rest, our own overhead.
+
+    A kind counts the time at least one of its calls was in flight, so concurrent tool calls are not added up.
+    `external` is the time any model or MCP call was in flight, the overhead is the request time outside of it.
+    Streamed model calls count until their stream is closed.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_byte: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.calls = dict.fromkeys(KINDS, 0)
+        self.seconds = dict.fromkeys(KINDS + ('external',), 0.0)
+        self._active = dict.fromkeys(KINDS + ('external',), 0)
+        self._since = dict.fromkeys(KINDS + ('external',), 0.0)
+
+    def enter(self, kind: str) -> None:
+        self.calls[kind] += 1
+        now = time.perf_counter()
+        for key in (kind, 'external'):
+            if self._active[key] == 0:
+                self._since[key] = now
+            self._active[key] += 1
+
+    def exit(self, kind: str) -> None:
+        now = time.perf_counter()
+        for key in (kind, 'external'):
+            self._active[key] -= 1
+            if self._active[key] == 0:
+                self.seconds[key] += now - self._since[key]
+
+    def mark_first_byte(self) -> None:
+        if self.first_byte is None:
+            self.first_byte = time.perf_counter()
+
+    def finish(self) -> None:
+        self.finished = time.perf_counter()
+
+    @property
+    def total(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary(self) -> dict:
+        return {
+            'total_ms': round(self.total * 1000, 2),
+            'model_ms': round(self.seconds['model'] * 1000, 2),
+            'mcp_ms': round(self.seconds['mcp'] * 1000, 2),
+            'overhead_ms': round((self.total - self.seconds['external']) * 1000, 2),
+            'model_calls': self.calls['model'],
+            'mcp_calls': self.calls['mcp'],
+        }
+
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current_timing.get()
+
+
+@contextmanager
+def track_timing() -> Iterator[RequestTiming]:
+    """Time every model and MCP call made inside the block (including spawned tasks)"""
+    record = RequestTiming()
+    token = _current_timing.set(record)
+    try:
+        yield record
+    finally:
+        _current_timing.reset(token)
+        record.finish()
+
+
+@contextmanager
+def timed(kind: str) -> Iterator[None]:
+    """Count the block as `model` or `mcp` time of the current request, if any"""
+    record = current_timing()
+    if record is None:
+        yield
+        return
+    record.enter(kind)
+    try:
+        yield
+    finally:
+        record.exit(kind)
+
+
+# key of the requests no route matched (404s, static files), kept in one entry whatever their path
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+class RouteTimings(metaclass=Singleton):
+    """
+    Running sums of the request timings per route path template (not per concrete request path),
+    diffs of two snapshots give the means of a run.
+    """
+
+    FIELDS = ('total', 'first_byte', 'model', 'mcp', 'overhead')
+
+    def __init__(self):
+        self.routes: dict[str, dict] = {}
+
+    def add(self, path: str, record: RequestTiming) -> None:
+        route = self.routes.get(path)
+        if route is None:
+            route = self.routes[path] = {
+                'requests': 0, 'model_calls': 0, 'mcp_calls': 0, **{f'{f}_seconds': 0.0 for f in self.FIELDS}
+            }
+        total = record.total
+        route['requests'] += 1
+        route['model_calls'] += record.calls['model']
+        route['mcp_calls'] += record.calls['mcp']
+        route['total_seconds'] += total
+        route['first_byte_seconds'] += (record.first_byte or record.finished or time.perf_counter()) - record.started
+        route['model_seconds'] += record.seconds['model']
+        route['mcp_seconds'] += record.seconds['mcp']
+        route['overhead_seconds'] += total - record.seconds['external']
+
+    def stats(self) -> dict:
+        """sums and per request means in milliseconds of every route"""
+        stats = {}
+        for path, route in self.routes.items():
+            requests = route['requests']
+            stats[path] = {
+                **route,
+                **{f'{f}_ms_mean': round(route[f'{f}_seconds'] / requests * 1000, 2) for f in self.FIELDS},
+            }
+        return stats
+
+    def clear(self) -> None:
+        self.routes.clear()
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware timing every HTTP request until its last body chunk is sent, streamed responses included,
+    and adding it to `RouteTimings` under the path template of the route that handled it (set in the scope by
+    the router), requests no route matched share `UNMATCHED_ROUTE`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_timed(message):
+            if message['type'] == 'http.response.body' and message.get('body'):
+                record.mark_first_byte()
+            await send(message)
+
+        with track_timing() as record:
+            try:
+                await self.app(scope, receive, send_timed)
+            finally:
+                record.finish()
+                route = scope.get('route')
+                RouteTimings().add(route.path if route is not None else UNMATCHED_ROUTE, record)
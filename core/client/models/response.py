@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 from common.llm.model import AvailableTool
@@ -7,6 +9,73 @@ class ToolListResponse(BaseModel):
     tools: list[AvailableTool] = Field(default_factory=list, description="Tool list")
 
 
+class ToolResultCacheStats(BaseModel):
+    hits: int = Field(..., description="Tool calls served from cache")
+    misses: int = Field(..., description="Tool calls of cacheable tools sent to the MCP server")
+    coalesced: int = Field(..., description="Tool calls that joined an identical call in flight")
+    evictions: int = Field(..., description="Results evicted by the LRU limit")
+    size: int = Field(..., description="Number of cached results")
+    cacheable_tools: list[str] = Field(default_factory=list, description="Tools declaring a cache policy")
+
+
+class ToolCacheStatsResponse(BaseModel):
+    hits: int = Field(..., description="Catalog requests served from cache")
+    misses: int = Field(..., description="Catalog requests that reloaded the tool list")
+    invalidations: int = Field(..., description="Invalidations by list_changed notifications or reconnects")
+    size: int = Field(..., description="Number of cached tools")
+    age_s: Optional[float] = Field(default=None, description="Seconds since the catalog was loaded")
+    ttl_s: float = Field(..., description="Catalog TTL in seconds")
+    results: ToolResultCacheStats = Field(..., description="Tool result cache")
+
+
+class PlanCacheStatsResponse(BaseModel):
+    hits: int = Field(..., description="PnE requests planned from a cached plan")
+    misses: int = Field(..., description="PnE requests without a usable cached plan")
+    stored: int = Field(..., description="Plans cached after they were done as planned")
+    skipped: int = Field(..., description="Plans not cached, the values of their question are not in their steps")
+    evictions: int = Field(..., description="Plans evicted by the LRU limit")
+    invalidations: int = Field(..., description="Plans dropped for missing tools or a failed reuse")
+    size: int = Field(..., description="Number of cached plans")
+    planner_calls_saved: int = Field(..., description="Planning model calls replaced by cached plans")
+
+
+class BudgetOutcomeStats(BaseModel):
+    requests: int = Field(..., description="Requests of the service since start")
+    completed: int = Field(..., description="Requests answered by their plan within the budget")
+    collapsed_budget: int = Field(..., description="Requests collapsed into a final answer as the budget ran low")
+    collapsed_iterations: int = Field(..., description="Requests collapsed into a final answer at the iteration cap")
+    hard_limit: int = Field(..., description="Requests cut off at the hard limit with a partial answer")
+    elapsed_seconds: float = Field(..., description="Sum of the request times")
+    elapsed_ms_mean: float = Field(..., description="Mean request time")
+    max_elapsed_s: float = Field(..., description="Longest request time")
+
+
+class BudgetStatsResponse(BaseModel):
+    services: dict[str, BudgetOutcomeStats] = Field(
+        default_factory=dict, description="Budget outcomes per plan-and-execute service, `pne` and `langgraph`"
+    )
+
+
 class ChatResponse(BaseModel):
     roomId: str = Field(..., description="Room ID")
     message: str = Field(..., description="Message")
+
+
+class RouteTiming(BaseModel):
+    requests: int = Field(..., description="Requests of the route since start")
+    model_calls: int = Field(..., description="Model calls made by those requests")
+    mcp_calls: int = Field(..., description="MCP requests made by those requests")
+    total_seconds: float = Field(..., description="Sum of the request times, until the last byte was sent")
+    first_byte_seconds: float = Field(..., description="Sum of the times to the first body byte")
+    model_seconds: float = Field(..., description="Sum of the times a model call was in flight")
+    mcp_seconds: float = Field(..., description="Sum of the times an MCP request was in flight")
+    overhead_seconds: float = Field(..., description="Sum of the times neither was in flight")
+    total_ms_mean: float = Field(..., description="Mean request time")
+    first_byte_ms_mean: float = Field(..., description="Mean time to the first body byte")
+    model_ms_mean: float = Field(..., description="Mean model time per request")
+    mcp_ms_mean: float = Field(..., description="Mean MCP time per request")
+    overhead_ms_mean: float = Field(..., description="Mean time spent outside model and MCP calls")
+
+
+class TimingStatsResponse(BaseModel):
+    routes: dict[str, RouteTiming] = Field(default_factory=dict, description="Timings per route path template, `<unmatched>` for requests no route matched")
@@ -1,4 +1,5 @@
 from .chat import chat_router
+from .metrics import metrics_router
 from .pne import pne_router
 from .test import test_router
 from .tool import tool_router
@@ -8,4 +9,5 @@ ROUTES = [
     chat_router,
     test_router,
     pne_router,
+    metrics_router,
 ]
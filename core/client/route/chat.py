@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import StreamingResponse
 
 from models.request import ChattingRequest
@@ -15,9 +15,9 @@ async def get_chatting_message(request: ChattingRequest) -> ChatResponse:
 
 
 @chat_router.post('/main/stream')
-async def get_chatting_message_in_stream(request: ChattingRequest) -> StreamingResponse:
+async def get_chatting_message_in_stream(request: ChattingRequest, http_request: Request) -> StreamingResponse:
     return StreamingResponse(
-        ChatService(request).stream(),
+        ChatService(request).stream(is_disconnected=http_request.is_disconnected),
         media_type="text/event-stream"
     )
 
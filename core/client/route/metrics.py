@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+
+from common.budget import BudgetOutcomes
+from common.timing import RouteTimings
+from models.response import BudgetStatsResponse, TimingStatsResponse
+
+metrics_router = APIRouter(prefix='/metrics', tags=['metrics'])
+
+
+@metrics_router.get('/timings')
+async def get_route_timings():
+    return TimingStatsResponse(routes=RouteTimings().stats())
+
+
+@metrics_router.get('/pne')
+async def get_pne_budget_outcomes():
+    return BudgetStatsResponse(services=BudgetOutcomes().stats())
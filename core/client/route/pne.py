@@ -2,7 +2,8 @@ from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 
 from models.request import PlanAndExecuteChattingRequest
-from models.response import ChatResponse
+from models.response import ChatResponse, PlanCacheStatsResponse
+from service.plan_cache import PlanCache
 from service.pne import PlanAndExecuteChatService
 
 pne_router = APIRouter(prefix='/pne', tags=['pne'])
@@ -20,3 +21,8 @@ async def get_chatting_message_in_stream(request: PlanAndExecuteChattingRequest)
         PlanAndExecuteChatService(request).stream(),
         media_type="text/event-stream"
     )
+
+
+@pne_router.get('/plan-cache')
+async def get_plan_cache_stats():
+    return PlanCacheStatsResponse(**PlanCache().stats())
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Query
 
-from models.response import ToolListResponse
+from models.response import ToolListResponse, ToolCacheStatsResponse
 from service.tool import ToolListService
 
 tool_router = APIRouter(prefix='/tool', tags=['tool'])
@@ -10,3 +10,8 @@ tool_router = APIRouter(prefix='/tool', tags=['tool'])
 async def get_tool_list(tags: list[str] = Query(default=[])):
     tool_list = await ToolListService().run(tags=tags)
     return ToolListResponse(tools=tool_list)
+
+
+@tool_router.get('/cache')
+async def get_tool_cache_stats():
+    return ToolCacheStatsResponse(**ToolListService().cache_stats())
@@ -1,9 +1,12 @@
 import asyncio
-from typing import AsyncIterable
+from typing import AsyncIterable, Awaitable, Callable
 
 from common.llm.model import McpTool, PlainInputPrompt
 from common.llm.openai_provider.message import OpenAIContextManager
 from common.llm.openai_provider.model import OpenAIProvider
+from common.llm.stream import StreamStats, coalesce, to_sse
+from common.mcp.batch import ToolBatcher
+from common.mcp.dispatch import ToolDispatcher
 from common.service import CommonService
 from models.request import ChattingRequest
 from service.tool import ToolListService
@@ -25,11 +28,12 @@ class ChatService(CommonService):
         ]
 
     async def _execute_tools(self, invoked_tools: list[McpTool]) -> None:
-        """Execute invoked MCP tools in parallel and log results"""
-        async with self.mcp_servers:
-            await asyncio.gather(
-                *[tool.call(client=self.mcp_servers) for tool in invoked_tools]
-            )
+        """Execute invoked MCP tools in parallel, batched per server, and log results"""
+        batcher = ToolBatcher(self.mcp_servers)
+        await asyncio.gather(
+            *[tool.call(client=batcher) for tool in invoked_tools]
+        )
+        self.logger.info(f"tool batching: {batcher.stats()}")
 
         for tool in invoked_tools:
             self.logger.info(f"tool result: {tool}")
@@ -45,10 +49,14 @@ class ChatService(CommonService):
             OpenAIContextManager: Context manager containing conversation history,
                 available tools, and invoked tool calls
         """
+        context = await self._build_context()
+        context += await self.llm.invoke_tools(context)
+        return context
+
+    async def _build_context(self) -> OpenAIContextManager:
         context = OpenAIContextManager()
         context += self._initialize_conversation()
         context += await ToolListService().run(tags=[])
-        context += self.llm.invoke_tools(context)
         return context
 
     async def complete(self) -> str:
@@ -61,19 +69,50 @@ class ChatService(CommonService):
 
         await self._execute_tools(invoked_tools)
         self.logger.info(context)
-        output = self.llm.chat_complete(context)
+        output = await self.llm.chat_complete(context)
         return output.content[0].text
 
-    async def stream(self) -> AsyncIterable[str]:
-        context = await self._process_request()
-        invoked_tools = context.get_invoked_tools()
-        if not invoked_tools:
-            self.logger.info(context)
-            last_assistant_message = context.get_last_assistant_message()
-            yield last_assistant_message.content
-            return
+    async def stream(self, is_disconnected: Callable[[], Awaitable[bool]] = None) -> AsyncIterable[bytes]:
+        """
+        Stream the answer as SSE `stream` events, deltas are coalesced into frames.
 
-        await self._execute_tools(invoked_tools)
+        Args:
+            is_disconnected: awaitable check of the client connection, the model stream is closed once it is gone
+        """
+        stats = StreamStats()
+        async for frame in to_sse(coalesce(self._generate()), stats, is_disconnected):
+            yield frame
+        self.logger.info(f"stream stats: {stats.summary()}")
+
+    async def _generate(self) -> AsyncIterable[str]:
+        """
+        Stream the first turn with the tools available: a direct answer is passed through as it is generated,
+        function calls are dispatched as soon as their arguments are complete and the answer is streamed by
+        a second call once every tool returned.
+        """
+        context = await self._build_context()
+        batcher = ToolBatcher(self.mcp_servers)
+        dispatcher = ToolDispatcher(batcher)
+        try:
+            async for event in self.llm.stream_with_tools(context):
+                if isinstance(event, str):
+                    yield event
+                    continue
+                context += event
+                if event.type == 'function_call':
+                    # 모델이 다음 호출을 생성하는 동안 tool 실행 시작
+                    dispatcher.submit(context.get_invoked_tool(event.call_id))
+            dispatcher.model_done()
+
+            if not dispatcher.tools:
+                self.logger.info(context)
+                return
+
+            for tool in await dispatcher.join():
+                self.logger.info(f"tool result: {tool}")
+        finally:
+            dispatcher.cancel()
+        self.logger.info(f"tool dispatch stats: {dispatcher.stats()}, batching: {batcher.stats()}")
         self.logger.info(context)
         self.logger.info("start generating message")
         async for event in self.llm.chat_stream(context):
@@ -0,0 +1,138 @@
+import re
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from common.config import PnEConfig
+from common.functional.singleton import Singleton
+
+if TYPE_CHECKING:
+    from service.pne import Plan
+
+# quoted values and tokens holding a digit (ids, codes, amounts) are the entity values of a question
+ENTITY = re.compile(r"(?<!\w)'([^']+)'(?!\w)|(?<!\w)\"([^\"]+)\"(?!\w)|(?<![\w-])((?=[\w-]*\d)[\w-]+)(?![\w-])")
+
+
+def template_of(question: str) -> tuple[str, list[str]]:
+    """
+    Shape of a question and its entity values: every distinct value is replaced by its placeholder `{n}`,
+    the rest is lower-cased with its whitespace collapsed,
+    e.g. "Tell me the name of user 'M4386'" -> ('tell me the name of user {0}', ['M4386'])
+    """
+    values: list[str] = []
+
+    def placeholder(match: re.Match) -> str:
+        value = next(group for group in match.groups() if group is not None)
+        if value not in values:
+            values.append(value)
+        return f'\x00{values.index(value)}\x00'
+
+    shape = ' '.join(ENTITY.sub(placeholder, question).lower().split())
+    return re.sub(r'\x00(\d+)\x00', r'{\1}', shape), values
+
+
+def rebind(plan: 'Plan', old: list[str], new: list[str]) -> 'Plan':
+    """copy of the plan with the entity values of its question replaced by the ones of another question"""
+    mapping = dict(zip(old, new))
+    if not mapping:
+        return plan
+    pattern = re.compile(
+        r'(?<![\w-])(' + '|'.join(re.escape(value) for value in sorted(mapping, key=len, reverse=True)) + r')(?![\w-])'
+    )
+    return plan.model_copy(update={'steps': [
+        step.model_copy(update={'task': pattern.sub(lambda match: mapping[match.group(1)], step.task)})
+        for step in plan.steps
+    ]})
+
+
+class PlanCache(metaclass=Singleton):
+    """
+    Process-wide cache of successful plans, keyed by the shape of their question (see `template_of`).
+
+    A plan is stored once it was executed with every step done and no revision, and only if every entity value
+    of its question appears in its steps, so rebinding the values of a new question covers the whole plan.
+    Entries are evicted least recently used first and expire after `PnEConfig.plan_cache_ttl`; an entry whose
+    tools are no longer in the catalog, or whose rebound plan did not succeed, is dropped.
+    """
+
+    def __init__(self, max_entries: int = None, ttl: float = None):
+        self.max_entries = PnEConfig.plan_cache_size if max_entries is None else max_entries
+        self.ttl = PnEConfig.plan_cache_ttl if ttl is None else ttl
+        # template: (expires_at, plan, entity values of its question, tools its execution called)
+        self.entries: OrderedDict[str, tuple[float, 'Plan', list[str], frozenset[str]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.skipped = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def lookup(self, question: str, available_tools: Iterable[str]) -> Optional['Plan']:
+        """
+        Cached plan of a question of the same shape, rebound to the entity values of this one.
+
+        Args:
+            question: question to plan
+            available_tools: names of the tools currently in the catalog
+
+        Returns:
+            Optional[Plan]: rebound plan, None when the planner has to be called
+        """
+        if self.max_entries <= 0:
+            return None
+        template, values = template_of(question)
+        entry = self.entries.get(template)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self.entries[template]
+            entry = None
+        if entry is not None and not entry[3] <= set(available_tools):
+            del self.entries[template]
+            self.invalidations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(template)
+        self.hits += 1
+        _, plan, old, _ = entry
+        return rebind(plan, old, values)
+
+    def store(self, question: str, plan: 'Plan', tools: Iterable[str]) -> bool:
+        """keep the plan of a question for questions of the same shape, False when its values are not in it"""
+        if self.max_entries <= 0:
+            return False
+        template, values = template_of(question)
+        tasks = '\n'.join(step.task for step in plan.steps)
+        if not all(re.search(r'(?<![\w-])' + re.escape(value) + r'(?![\w-])', tasks) for value in values):
+            self.skipped += 1
+            return False
+
+        self.entries[template] = (time.monotonic() + self.ttl, plan, values, frozenset(tools))
+        self.entries.move_to_end(template)
+        self.stored += 1
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def invalidate(self, question: str) -> None:
+        """drop the entry of the shape of a question, its plan did not succeed"""
+        if self.entries.pop(template_of(question)[0], None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stored': self.stored,
+            'skipped': self.skipped,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'size': len(self.entries),
+            # every hit replaces the planning call of its request
+            'planner_calls_saved': self.hits,
+        }
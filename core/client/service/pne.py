@@ -1,36 +1,53 @@
 import asyncio
 import json
-from typing import Union, Literal, List, AsyncIterable
+import time
+from typing import Union, Literal, List, AsyncIterable, Awaitable, Callable, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 from sse_starlette.sse import ServerSentEvent
 
+from common.budget import Deadline, DeadlineExceeded, BudgetOutcomes, partial_answer
+from common.config import PnEConfig
 from common.llm.model import McpTool
 from common.llm.model import PlainInputPrompt
 from common.llm.openai_provider.model import OpenAIProvider, OpenAIContextManager
+from common.llm.usage import track_usage, UsageRecord
+from common.mcp.batch import ToolBatcher
 from common.service import CommonService
 from models.request import PlanAndExecuteChattingRequest
+from service.plan_cache import PlanCache
 from service.tool import ToolListService
 
+T = TypeVar('T')
+
+NO_REPLY = "No answer could be produced for this request, please try again."
+
 
 class Step(BaseModel):
     """A class representing a single step in a multi-step plan.
 
     This class defines a single step or action in a larger plan, containing:
+    - An id other steps refer to
     - A task explaining what this step accomplishes
     - A type of Step that describes what kind of step this step is.
+    - The ids of the steps whose results this step needs
     """
+    id: int = Field(default=0, description='id of this step, 1 for the first step, unique in the plan')
     task: str = Field(..., description='task of this step')
     type: Literal['tool_call', 'assistant'] = Field(
         default='assistant',
         description='type of Step,\nwhen calling a function is needed: tool_call\n'
                     'when assistant message is needed: assistant')
+    depends_on: List[int] = Field(
+        default_factory=list,
+        description='ids of the steps whose results this step needs, empty when it can run right away')
 
 
 class Plan(BaseModel):
     """
     Represents a structured plan consisting of multiple steps.
-    The steps must be executed in sequential order, with each step building upon the completion of the previous step.
+    A step runs once every step in its `depends_on` is done, steps without dependencies between them run
+    concurrently.
     """
     steps: List[Step] = Field(..., description='List of steps to execute')
     type: Literal['plan'] = Field(default="plan",
@@ -50,6 +67,26 @@ class Response(BaseModel):
                                       description="A marker indicating this object is an instance of the Response class")
 
 
+class StepResult(BaseModel):
+    """
+    Result of executing one step of the plan.
+
+    - message: what the step found or produced
+    - status: whether the rest of the plan still holds, anything but `done` has the plan revised
+      in the `on_demand` replan mode
+    """
+    message: str = Field(..., description='result of this step')
+    status: Literal['done', 'failed', 'deviation'] = Field(
+        default='done',
+        description='status of this step,\nwhen the task is achieved and the plan can go on: done\n'
+                    'when the task could not be achieved: failed\n'
+                    'when the result shows the remaining plan no longer fits: deviation')
+
+
+class ToolResults(StepResult):
+    """Step result made of the tool outputs as they are, no model call summarized them"""
+
+
 class Action(BaseModel):
     """A class representing the action response in a plan-and-execute workflow.
 
@@ -57,55 +94,362 @@ class Action(BaseModel):
     1. A Plan object: When a structured plan with multiple steps is needed to complete the task
     2. A Response object: When no more planning is required, and a final answer can be returned to the user
 
-    Each Plan object contains sequential steps that need to be executed in order,
+    Each Plan object contains steps executed in the order of their dependencies,
     while a Response object contains the final answer to be returned to the user.
     """
     response: Union[Plan, Response] = Field(..., description="Plan or Response to this action")
 
 
+class PlanRun:
+    """
+    Execution record of one plan: the wall time of the plan against the time its steps would have taken
+    one after another.
+    """
+
+    def __init__(self, steps: int):
+        self.steps = steps
+        self.started = time.perf_counter()
+        self.wall_seconds = 0.0
+        self.step_seconds = 0.0
+        self.active = 0
+        self.max_parallel = 0
+
+    def step_started(self) -> float:
+        self.active += 1
+        self.max_parallel = max(self.max_parallel, self.active)
+        return time.perf_counter()
+
+    def step_finished(self, started: float) -> None:
+        self.active -= 1
+        self.step_seconds += time.perf_counter() - started
+
+    def finish(self) -> None:
+        self.wall_seconds = time.perf_counter() - self.started
+
+    def summary(self) -> dict:
+        return {
+            'steps': self.steps,
+            'max_parallel': self.max_parallel,
+            'wall_s': round(self.wall_seconds, 3),
+            'sequential_s': round(self.step_seconds, 3),
+            'saved_s': round(self.step_seconds - self.wall_seconds, 3),
+        }
+
+
+def step_dependencies(plan: Plan) -> list[tuple[Step, list[int]]]:
+    """
+    Steps of a plan with their effective dependencies.
+
+    Dependencies on unknown ids and on the step itself are dropped, a dependency on a step listed later is kept
+    and waits for it. A plan without unique ids (e.g. from a planner that does not fill them) or with a
+    dependency cycle runs one step after another, in the listed order.
+    """
+    def sequential() -> list[tuple[Step, list[int]]]:
+        return [(step.model_copy(update={'id': i + 1, 'depends_on': [i] if i else []}), [i] if i else [])
+                for i, step in enumerate(plan.steps)]
+
+    ids = [step.id for step in plan.steps]
+    if len(set(ids)) != len(ids) or 0 in ids:
+        return sequential()
+
+    known = set(ids)
+    graph = [(step, [dep for dep in dict.fromkeys(step.depends_on) if dep in known and dep != step.id])
+             for step in plan.steps]
+    done: set[int] = set()
+    remaining = list(graph)
+    while remaining:
+        ready = [entry for entry in remaining if all(dep in done for dep in entry[1])]
+        if not ready:
+            return sequential()
+        done.update(step.id for step, _ in ready)
+        remaining = [entry for entry in remaining if entry[0].id not in done]
+    return graph
+
+
+def is_empty(value) -> bool:
+    """no data: None, blank text or containers holding nothing but empty values"""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    if isinstance(value, dict):
+        return all(is_empty(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return all(is_empty(item) for item in value)
+    return False
+
+
+def tool_results(tools: list[McpTool]) -> ToolResults:
+    """result of a step from the outputs of its tool calls, failed when a call errored or returned no data"""
+    lines = [
+        f"{tool.function_name}({json.dumps(tool.function_param, ensure_ascii=False, separators=(',', ':'))}): "
+        + json.dumps(tool.output, ensure_ascii=False, separators=(',', ':'))
+        for tool in tools
+    ]
+    failed = any(tool.is_error or is_empty(tool.output) for tool in tools)
+    return ToolResults(message='\n'.join(lines), status='failed' if failed else 'done')
+
+
 class PlanAndExecuteChatService(CommonService):
 
     def __init__(self, request: PlanAndExecuteChattingRequest):
         super().__init__(room_id=request.roomId)
         self.llm = OpenAIProvider()
         self.request = request
+        self.plan_runs: list[PlanRun] = []
+        self.replans = 0
+        self.usage: Optional[UsageRecord] = None
+        # first plan of the request, whether it came from the plan cache and whether every step of it was done
+        self.first_plan: Optional[Plan] = None
+        self.plan_cached = False
+        self.first_plan_done = False
+        self.tools_used: set[str] = set()
+        # every step result of the request as it finished, the partial answer when the hard limit is hit
+        self.step_results: list[tuple[str, StepResult]] = []
+        self.deadline: Optional[Deadline] = None
+        self.outcome = 'completed'
         self.logger.info(f"Initializing Service, Request: {request}")
 
     async def _execute_tools(self, invoked_tools: list[McpTool]) -> None:
-        """Execute invoked MCP tools in parallel and log results"""
-        async with self.mcp_servers:
-            await asyncio.gather(
-                *[tool.call(client=self.mcp_servers) for tool in invoked_tools]
-            )
+        """Execute invoked MCP tools in parallel, batched per server, and log results"""
+        batcher = ToolBatcher(self.mcp_servers)
+        await asyncio.gather(
+            *[tool.call(client=batcher) for tool in invoked_tools]
+        )
+        self.logger.info(f"tool batching: {batcher.stats()}")
 
         for tool in invoked_tools:
             self.logger.info(f"tool result: {tool}")
 
-    async def execute_task(self, response: Plan) -> tuple[str, str]:
-        step: Step = response.steps[0]
+    async def execute_task(self, plan: Plan, step: Step, dependencies: list[tuple[Step, str]]) \
+            -> tuple[str, StepResult]:
+        """
+        Execute one step of the plan, the results of the steps it depends on are part of its prompt.
+
+        In the `on_demand` replan mode the outputs of the tools the step called are its result, otherwise
+        the model summarizes them in a second call.
+        """
         self.logger.info(f"\tL current step: {step}")
-        org_plan = [f"{i + 1}.{step.task}\n" for i, step in enumerate(response.steps)]
+        org_plan = [
+            f"{planned.id}.{planned.task}"
+            + (f" (after {', '.join(map(str, planned.depends_on))})" if planned.depends_on else '')
+            for planned in plan.steps
+        ]
+        inputs = ''
+        if dependencies:
+            inputs = "Results of the steps it depends on:\n" + '\n'.join(
+                f"- step {dependency.id}, {dependency.task}: {message}" for dependency, message in dependencies
+            )
 
         sub_context = OpenAIContextManager()
         user_prompt = self.prompt_manager.plan_execute_user_prompt.format(
-            org_plan='\n'.join(org_plan), task=step.task
+            org_plan='\n'.join(org_plan), step_id=step.id, task=step.task, dependencies=inputs
         )
         sub_context += (
             PlainInputPrompt(role='system', content=self.prompt_manager.plan_execute_system_prompt),
             PlainInputPrompt(role='user', content=user_prompt)
         )
         sub_context += await ToolListService().run(tags=[])
-        output, function_calls = await self.llm.structured_output_with_tools(sub_context, structure=Response)
+        output, function_calls = await self.llm.structured_output_with_tools(sub_context, structure=StepResult)
         if function_calls:
             sub_context += function_calls
             self.logger.info("\t\tL invoke tool")
-            await self._execute_tools(sub_context.get_invoked_tools())
-
-            output = await self.llm.structured_output(sub_context, structure=Response)
-
-        return step.task, output.message
+            invoked_tools = sub_context.get_invoked_tools()
+            self.tools_used.update(tool.function_name for tool in invoked_tools)
+            await self._execute_tools(invoked_tools)
+            results = tool_results(invoked_tools)
+            if PnEConfig.replan_mode == 'on_demand':
+                return step.task, results
+
+            output = await self.llm.structured_output(sub_context, structure=StepResult)
+            if output is None:
+                # no parsable summary, the tool outputs are the result
+                output = results
+            elif results.status == 'failed' and output.status == 'done':
+                output.status = 'failed'
+
+        if output is None:
+            # neither a parsable reply nor function calls, e.g. an empty answer
+            return step.task, StepResult(message='', status='failed')
+        if is_empty(output.message):
+            output.status = 'failed'
+        return step.task, output
+
+    async def execute_plan(self, plan: Plan, on_start: Callable[[Step], None] = None) \
+            -> list[tuple[str, StepResult]]:
+        """
+        Execute every step of the plan, each one as soon as the steps it depends on are done,
+        at most `PnEConfig.max_parallel_steps` at a time.
+        In the `on_demand` replan mode a step whose dependencies did not succeed is not executed, the plan
+        is revised anyway.
+
+        Args:
+            plan: plan to execute
+            on_start: called with every step when it starts
+
+        Returns:
+            list[tuple[str, StepResult]]: (task, result) of every step, in plan order
+        """
+        graph = step_dependencies(plan)
+        run = PlanRun(len(graph))
+        results: dict[int, tuple[str, StepResult]] = {}
+        finished = {step.id: asyncio.Event() for step, _ in graph}
+        steps = {step.id: step for step, _ in graph}
+        semaphore = asyncio.Semaphore(max(1, PnEConfig.max_parallel_steps))
+
+        async def execute(step: Step, dependencies: list[int]) -> None:
+            for dependency in dependencies:
+                await finished[dependency].wait()
+            unsuccessful = [dependency for dependency in dependencies if results[dependency][1].status != 'done']
+            if unsuccessful and PnEConfig.replan_mode == 'on_demand':
+                results[step.id] = step.task, StepResult(
+                    message=f"not executed, step {', '.join(map(str, unsuccessful))} did not succeed",
+                    status='failed',
+                )
+                finished[step.id].set()
+                return
+            async with semaphore:
+                if on_start is not None:
+                    on_start(step)
+                started = run.step_started()
+                try:
+                    results[step.id] = await self.execute_task(
+                        plan, step,
+                        [(steps[dependency], results[dependency][1].message) for dependency in dependencies]
+                    )
+                finally:
+                    run.step_finished(started)
+            self.step_results.append(results[step.id])
+            finished[step.id].set()
+
+        async with asyncio.TaskGroup() as group:
+            for step, dependencies in graph:
+                group.create_task(execute(step, dependencies))
+        run.finish()
+        self.plan_runs.append(run)
+        self.logger.info(f"plan execution: {run.summary()}")
+        if self.first_plan is None:
+            self.first_plan = plan
+            self.first_plan_done = all(results[step.id][1].status == 'done' for step, _ in graph)
+        return [results[step.id] for step, _ in graph]
+
+    def conclusion(self, results: list[tuple[str, StepResult]]) -> Optional[type[BaseModel]]:
+        """
+        What follows an executed plan: `Action` revises it, `Response` only asks the model for the final answer
+        and None takes the result of the final step as the answer.
+
+        Only the `on_demand` replan mode skips the revision, when every step is done.
+        """
+        if PnEConfig.replan_mode != 'on_demand' or not results \
+                or any(result.status != 'done' for _, result in results):
+            return Action
+        if isinstance(results[-1][1], ToolResults):
+            return Response
+        return None
+
+    def collapse(self) -> bool:
+        """
+        Whether the remaining steps are replaced by one final-answer call: the iteration cap is reached or
+        another plan, expected to take as long as the last one, would not fit in the budget.
+        """
+        outcome = self.deadline.exhausted(
+            len(self.plan_runs), self.plan_runs[-1].wall_seconds if self.plan_runs else 0.0
+        )
+        if outcome is None:
+            return False
+        self.outcome = outcome
+        self.logger.info(f"collapsing the remaining steps into the final answer: {self.deadline.summary(outcome)}")
+        return True
+
+    async def within_deadline(self, awaitable: Awaitable[T]) -> T:
+        """await within the hard limit of the request, DeadlineExceeded once it is reached"""
+        limit = asyncio.timeout(self.deadline.hard_remaining())
+        try:
+            async with limit:
+                return await awaitable
+        except TimeoutError:
+            if limit.expired():
+                raise DeadlineExceeded(f"hard limit of {self.deadline.hard_limit}s reached") from None
+            raise
+
+    def partial_answer(self) -> str:
+        """best answer once the hard limit cut the request off: the results of the steps done so far"""
+        self.outcome = 'hard_limit'
+        return partial_answer([(task, result.message) for task, result in self.step_results if result.status == 'done'])
+
+    async def next_action(self, context: OpenAIContextManager, structure: type[BaseModel], tools: bool = True) \
+            -> Action:
+        """
+        Plan or answer of the planner (`structure` Action) or the final-answer call (`structure` Response).
+
+        A reply without a parsable structure, e.g. function calls only while tools are offered, is asked for once
+        more without tools. When that fails too, the results of the steps done so far are the answer.
+        """
+        if tools:
+            output, _ = await self.llm.structured_output_with_tools(context, structure=structure)
+        else:
+            output = await self.llm.structured_output(context, structure=structure)
+        if output is None and tools:
+            self.logger.warning(f"no {structure.__name__} in the reply, asking again without tools")
+            output = await self.llm.structured_output(context, structure=structure)
+        if output is None:
+            done = [f"- {task}: {result.message}" for task, result in self.step_results if result.status == 'done']
+            return Action(response=Response(message='\n'.join(done) or NO_REPLY))
+        return output if structure is Action else Action(response=output)
+
+    def finish(self) -> None:
+        BudgetOutcomes().add('pne', self.outcome, self.deadline.elapsed)
+        self.logger.info(f"budget: {self.deadline.summary(self.outcome)}")
+
+    def plan_summary(self) -> dict:
+        """wall time saved by running independent steps concurrently, over every plan of the request"""
+        return {
+            'plans': len(self.plan_runs),
+            'steps': sum(run.steps for run in self.plan_runs),
+            'wall_s': round(sum(run.wall_seconds for run in self.plan_runs), 3),
+            'saved_s': round(sum(run.step_seconds - run.wall_seconds for run in self.plan_runs), 3),
+            'replans': self.replans,
+            'plan_cached': self.plan_cached,
+        }
+
+    def cached_plan(self, context: OpenAIContextManager) -> Optional[Action]:
+        """plan of an earlier question of the same shape from the plan cache, questions with history are planned"""
+        if self.request.history:
+            return None
+        plan = PlanCache().lookup(self.request.question, [tool.name for tool in context.available_tools])
+        if plan is None:
+            return None
+        self.plan_cached = True
+        self.logger.info(f"plan from cache: {plan}")
+        return Action(response=plan)
+
+    def update_plan_cache(self) -> None:
+        """
+        Cache the first plan once it was done as planned, without a revision, drop a cached plan that was not.
+        """
+        if self.request.history or self.first_plan is None:
+            return
+        succeeded = self.first_plan_done and len(self.plan_runs) == 1
+        if self.plan_cached:
+            if not succeeded:
+                PlanCache().invalidate(self.request.question)
+        elif succeeded:
+            PlanCache().store(self.request.question, self.first_plan, self.tools_used)
+        self.logger.info(f"plan cache: {PlanCache().stats()}")
 
     async def complete(self) -> str:
+        self.deadline = Deadline()
+        with track_usage() as usage:
+            try:
+                message = await self.within_deadline(self._complete())
+            except DeadlineExceeded:
+                message = self.partial_answer()
+        self.usage = usage
+        self.finish()
+        self.logger.info(f"model usage: {usage.summary()}, plans: {self.plan_summary()}")
+        return message
+
+    async def _complete(self) -> str:
         # 계획 수립을 위한 프롬프트 템플릿 생성
         main_context = OpenAIContextManager()
         main_context += [PlainInputPrompt(role=role, content=message) for role, message in self.request.history]
@@ -114,7 +458,9 @@ class PlanAndExecuteChatService(CommonService):
             PlainInputPrompt(role='user', content=self.request.question)
         )
         main_context += await ToolListService().run(tags=[])
-        output, _ = await self.llm.structured_output_with_tools(main_context, structure=Action)
+        output = self.cached_plan(main_context)
+        if output is None:
+            output = await self.next_action(main_context, Action)
 
         past_step = []
         self.logger.info(f"execution plan")
@@ -124,22 +470,54 @@ class PlanAndExecuteChatService(CommonService):
             for step in output.response.steps:
                 self.logger.info(f"\t\tL step: {step}")
 
-            task, message = await self.execute_task(output.response)
-            past_step.append((task, message))
-            main_context.append(PlainInputPrompt(role='assistant', content=message))
+            if self.collapse():
+                structure = Response
+            else:
+                results = await self.execute_plan(output.response)
+                for task, result in results:
+                    past_step.append((task, result.message))
+                    main_context.append(PlainInputPrompt(role='assistant', content=result.message))
+
+                structure = self.conclusion(results)
+                if structure is None:
+                    output = Action(response=Response(message=results[-1][1].message))
+                    break
+                if structure is Action and self.collapse():
+                    structure = Response
+            if structure is Action:
+                self.replans += 1
 
             replanning_prompt = self.prompt_manager.replanning_sys_prompt.format(
+                tools=main_context.get_available_tools()
+            )
+            replanning_user = self.prompt_manager.replanning_user_prompt.format(
                 input=self.request.question,
                 plan=output.response.steps, past_step='\n'.join([str(s) for s in past_step])
             )
-            main_context += [PlainInputPrompt(role='system', content=replanning_prompt)]
+            main_context += [
+                PlainInputPrompt(role='system', content=replanning_prompt),
+                PlainInputPrompt(role='user', content=replanning_user),
+            ]
             self.logger.info(f"current prompt")
             self.logger.info(main_context)
-            output, _ = await self.llm.structured_output_with_tools(main_context, structure=Action)
+            output = await self.next_action(main_context, structure)
 
+        self.update_plan_cache()
         print(output.response.message)
         return output.response.message
 
+    @staticmethod
+    async def _next_started(started: asyncio.Queue, execution: asyncio.Task) -> Optional[Step]:
+        """next step started by the plan execution, None once the execution finished"""
+        if not started.empty():
+            return started.get_nowait()
+        getter = asyncio.ensure_future(started.get())
+        await asyncio.wait({getter, execution}, return_when=asyncio.FIRST_COMPLETED)
+        if getter.done():
+            return getter.result()
+        getter.cancel()
+        return None
+
     async def stream(self) -> AsyncIterable[bytes]:
         # 계획 수립을 위한 프롬프트 템플릿 생성
         main_context = OpenAIContextManager()
@@ -154,41 +532,79 @@ class PlanAndExecuteChatService(CommonService):
 
         self.logger.info(main_context)
         yield ServerSentEvent(event='planning', data=json.dumps({'message': '생각중', 'contents': None})).encode()
-        output = await self.llm.structured_output(main_context, structure=Action)
-
-        past_step = []
-        self.logger.info(f"execution plan")
-        while output.response.type == 'plan':
-            self.logger.info("-------------------step-execute------------------")
-            self.logger.info("\tL current plan")
-            for step in output.response.steps:
-                self.logger.info(f"\t\tL step: {step}")
-
-            step = output.response.steps[0]
-            yield ServerSentEvent(event='executing', data=json.dumps({'message': step.task, 'contents': None})).encode()
-
-            task, message = await self.execute_task(output.response)
-            past_step.append((task, message))
-
-            temp_context = OpenAIContextManager()
-            replanning_prompt = self.prompt_manager.replanning_sys_prompt.format(
-                tools=main_context.get_available_tools()
-            )
-            replanning_user = self.prompt_manager.replanning_user_prompt.format(
-                input=self.request.question,
-                plan=output.response.steps,
-                past_step='\n'.join([str(s) for s in past_step]),
-            )
-            temp_context += [
-                PlainInputPrompt(role='system', content=replanning_prompt),
-                PlainInputPrompt(role='user', content=replanning_user),
-            ]
-            self.logger.info(f"current prompt")
-            self.logger.info(temp_context)
-            output = await self.llm.structured_output(temp_context, structure=Action)
-
-        print(output.response.message)
-        for char in output.response.message:
+        self.deadline = Deadline()
+        # the context variable is set and reset in the task iterating the stream, the model calls of the
+        # step tasks are recorded as they copy the context when they are created
+        with track_usage() as usage:
+            try:
+                output = self.cached_plan(main_context)
+                if output is None:
+                    output = await self.within_deadline(self.next_action(main_context, Action, tools=False))
+
+                past_step = []
+                self.logger.info(f"execution plan")
+                while output.response.type == 'plan':
+                    self.logger.info("-------------------step-execute------------------")
+                    self.logger.info("\tL current plan")
+                    for step in output.response.steps:
+                        self.logger.info(f"\t\tL step: {step}")
+
+                    if self.collapse():
+                        structure = Response
+                    else:
+                        started: asyncio.Queue[Step] = asyncio.Queue()
+                        execution = asyncio.create_task(
+                            self.within_deadline(self.execute_plan(output.response, on_start=started.put_nowait))
+                        )
+                        try:
+                            while not (execution.done() and started.empty()):
+                                step = await self._next_started(started, execution)
+                                if step is not None:
+                                    yield ServerSentEvent(
+                                        event='executing', data=json.dumps({'message': step.task, 'contents': None})
+                                    ).encode()
+                        finally:
+                            if not execution.done():
+                                execution.cancel()
+                        results = execution.result()
+                        past_step += [(task, result.message) for task, result in results]
+
+                        structure = self.conclusion(results)
+                        if structure is None:
+                            output = Action(response=Response(message=results[-1][1].message))
+                            break
+                        if structure is Action and self.collapse():
+                            structure = Response
+                    if structure is Action:
+                        self.replans += 1
+
+                    temp_context = OpenAIContextManager()
+                    replanning_prompt = self.prompt_manager.replanning_sys_prompt.format(
+                        tools=main_context.get_available_tools()
+                    )
+                    replanning_user = self.prompt_manager.replanning_user_prompt.format(
+                        input=self.request.question,
+                        plan=output.response.steps,
+                        past_step='\n'.join([str(s) for s in past_step]),
+                    )
+                    temp_context += [
+                        PlainInputPrompt(role='system', content=replanning_prompt),
+                        PlainInputPrompt(role='user', content=replanning_user),
+                    ]
+                    self.logger.info(f"current prompt")
+                    self.logger.info(temp_context)
+                    output = await self.within_deadline(self.next_action(temp_context, structure, tools=False))
+
+                self.update_plan_cache()
+                message = output.response.message
+            except DeadlineExceeded:
+                message = self.partial_answer()
+        self.usage = usage
+        self.finish()
+        self.logger.info(f"model usage: {usage.summary()}, plans: {self.plan_summary()}")
+
+        print(message)
+        for char in message:
             await asyncio.sleep(0.01)
             yield ServerSentEvent(event='stream', data=json.dumps({'message': 'response', 'contents': char})).encode()
         yield ServerSentEvent(event='Done', data=json.dumps({'message': 'Done', 'contents': '.'})).encode()
@@ -1,18 +1,24 @@
 import asyncio
 import operator
+import time
 from typing import Annotated, List, Tuple
 
 from langchain.agents import create_agent
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_core.tools import StructuredTool, ToolException
 from langgraph.graph import END
 from langgraph.graph import StateGraph, START
 from langgraph.graph.state import CompiledStateGraph
 from pydantic import BaseModel, Field
 from typing_extensions import TypedDict
 
-from common.llm.model import McpTool
+from common.budget import Deadline, BudgetOutcomes, partial_answer
+from common.llm.model import AvailableTool, McpTool
 from common.llm.openai_provider.model import OpenAIProvider
+from common.mcp.batch import ToolBatcher
+from common.mcp.catalog import ToolCatalog
+from common.mcp.result import result_text
+from common.mcp.result_cache import ToolResultCache
 from common.prompt import PromptManager
 from common.service import CommonService
 from models.request import PlanAndExecuteChattingRequest
@@ -48,30 +54,33 @@ class Act(BaseModel):
     )
 
 
+def langchain_tool(tool: AvailableTool) -> StructuredTool:
+    """
+    LangChain tool calling an MCP tool through the shared session pools and the tool result cache.
+    The result is handed to the model as text derived from its structured content (`result_text`), a failed call
+    as its error message.
+    """
+    async def call(**arguments) -> str:
+        output = await ToolResultCache().call(
+            tool.name, arguments, lambda: CommonService.mcp_servers.call_tool_mcp(tool.name, arguments)
+        )
+        if output.isError:
+            raise ToolException(result_text(output))
+        return result_text(output)
+
+    return StructuredTool(name=tool.name, description=tool.description or '', args_schema=tool.input_schema,
+                          coroutine=call, metadata={'_meta': tool.meta}, handle_tool_error=True)
+
+
 class AgentBuilder:
 
     def __init__(self, prompt_manager: PromptManager):
         self.prompt_manager = prompt_manager
-        self.client = MultiServerMCPClient(
-            {
-                "alpha": {
-                    "url": "http://localhost:9011/mcp",
-                    "transport": "streamable_http",
-                },
-                "beta": {
-                    "url": "http://localhost:9012/mcp",
-                    "transport": "streamable_http",
-                },
-                "resource": {
-                    "url": "http://localhost:9013/mcp",
-                    "transport": "streamable_http",
-                }
-            }
-        )
 
     async def build_task_execute_agent(self) -> CompiledStateGraph:
         llm = OpenAIProvider().get_langchain_object(temperature=0)
-        tools = await self.client.get_tools()
+        # the catalog leaves out the batch entry points, they are for the client's batcher only
+        tools = [langchain_tool(tool) for tool in await ToolCatalog().get(CommonService.mcp_servers)]
         return create_agent(llm, tools=tools, system_prompt=self.prompt_manager.langchain_task_executor)
 
     async def build_planning_agent(self):
@@ -98,6 +107,19 @@ class AgentBuilder:
         )
         return re_planner_prompt | llm.with_structured_output(Act)
 
+    async def build_final_answer_agent(self):
+        """the re-planner restricted to a Response, used once the budget leaves no room for another step"""
+        llm = OpenAIProvider().get_langchain_object(temperature=0)
+        final_answer_prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system", self.prompt_manager.langchain_replanner,
+                ),
+                ("placeholder", "{messages}"),
+            ]
+        )
+        return final_answer_prompt | llm.with_structured_output(Response)
+
 
 class PlanAndExecuteChatService(CommonService):
 
@@ -108,21 +130,28 @@ class PlanAndExecuteChatService(CommonService):
         self.logger.info(f"Initializing Service, Request: {request}")
 
     async def _execute_tools(self, invoked_tools: list[McpTool]) -> None:
-        """Execute invoked MCP tools in parallel and log results"""
-        async with self.mcp_servers:
-            await asyncio.gather(
-                *[tool.call(client=self.mcp_servers) for tool in invoked_tools]
-            )
+        """Execute invoked MCP tools in parallel, batched per server, and log results"""
+        batcher = ToolBatcher(self.mcp_servers)
+        await asyncio.gather(
+            *[tool.call(client=batcher) for tool in invoked_tools]
+        )
+        self.logger.info(f"tool batching: {batcher.stats()}")
 
         for tool in invoked_tools:
             self.logger.info(f"tool result: {tool}")
 
     async def complete(self) -> str:
+        deadline = Deadline()
+        outcome = 'completed'
+        step_seconds = 0.0
         executor = await self.builder.build_task_execute_agent()
         planner = await self.builder.build_planning_agent()
         re_planner = await self.builder.build_re_planning_agent()
+        final_answer = await self.builder.build_final_answer_agent()
 
         async def execute_step(state: PlanExecute):
+            nonlocal step_seconds
+            started = time.monotonic()
             plan = state["plan"]
             plan_str = "\n".join(f"{i + 1}. {step}" for i, step in enumerate(plan))
             task = plan[0]
@@ -132,6 +161,7 @@ class PlanAndExecuteChatService(CommonService):
                 {"messages": [("user", task_formatted)]}
             )
             print("\t" + repr(agent_response))
+            step_seconds = time.monotonic() - started
             return {
                 "past_steps": [(task, agent_response["messages"][-1].content)],
             }
@@ -141,6 +171,14 @@ class PlanAndExecuteChatService(CommonService):
             return {"plan": plan.steps}
 
         async def replan_step(state: PlanExecute):
+            nonlocal outcome
+            # every executed step is followed by a revision, the steps done are the iterations
+            collapsed = deadline.exhausted(len(state["past_steps"]), step_seconds)
+            if collapsed is not None:
+                outcome = collapsed
+                self.logger.info(f"collapsing the remaining steps into the final answer: {deadline.summary(outcome)}")
+                output = await final_answer.ainvoke(state)
+                return {"response": output.response}
             output = await re_planner.ainvoke(state)
             if isinstance(output.action, Response):
                 return {"response": output.action.response}
@@ -183,12 +221,26 @@ class PlanAndExecuteChatService(CommonService):
         # This compiles it into a LangChain Runnable,
         # meaning you can use it as you would any other runnable
         app = workflow.compile()
-        config = {"recursion_limit": 50}
+        # planner, then an agent and a replan node per iteration, the iteration cap ends the graph first
+        config = {"recursion_limit": max(50, 2 * deadline.max_iterations + 5)}
         inputs = {"input": self.request.question}
-        async for event in app.astream(inputs, config=config):
-            for k, v in event.items():
-                print("================================================")
-                print(k, v)
-                # if k != "__end__":
-                #     print(v)
-        return v['response']
+        past_steps = []
+        limit = asyncio.timeout(deadline.hard_remaining())
+        try:
+            async with limit:
+                async for event in app.astream(inputs, config=config):
+                    for k, v in event.items():
+                        print("================================================")
+                        print(k, v)
+                        past_steps += (v or {}).get("past_steps", [])
+                        # if k != "__end__":
+                        #     print(v)
+            message = v['response']
+        except TimeoutError:
+            if not limit.expired():
+                raise
+            outcome = 'hard_limit'
+            message = partial_answer(past_steps)
+        BudgetOutcomes().add('langgraph', outcome, deadline.elapsed)
+        self.logger.info(f"budget: {deadline.summary(outcome)}")
+        return message
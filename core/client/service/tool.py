@@ -1,4 +1,6 @@
 from common.llm.model import AvailableTool
+from common.mcp.catalog import ToolCatalog
+from common.mcp.result_cache import ToolResultCache
 from common.service import CommonService
 
 
@@ -8,14 +10,7 @@ class ToolListService(CommonService):
         super().__init__()
 
     async def run(self, tags: list[str] = None) -> list[AvailableTool]:
-        tool_list = []
-        async with self.mcp_servers:
-            available_tools = [AvailableTool(tool) for tool in await self.mcp_servers.list_tools()]
+        return await ToolCatalog().get(self.mcp_servers, tags=tags)
 
-            if tags:
-                available_tools = [tool for tool in available_tools if tool.has_any_tags(tags)]
-
-            for tool in available_tools:
-                tool_list.append(tool)
-
-        return tool_list
+    def cache_stats(self) -> dict:
+        return {**ToolCatalog().stats(), 'results': ToolResultCache().stats()}
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the client imports its packages (`common`, `service`, ...) as top-level modules from core/client
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
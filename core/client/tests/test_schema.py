@@ -0,0 +1,115 @@
+from typing import Literal, Optional
+
+import pytest
+from pydantic import BaseModel, Field
+
+from common.llm.model import AvailableTool
+from common.llm.openai_provider.schema import (
+    _to_strict, clear_cache, compile_function_tool, text_format, tool_arguments
+)
+
+# input schema of beta's find_products_by_price, as fastmcp lists it
+PRICE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'min_price': {'type': 'integer', 'title': 'Min Price'},
+        'max_price': {'type': 'integer', 'title': 'Max Price'},
+        'limit': {'type': 'integer', 'title': 'Limit', 'default': 20},
+        'cursor': {'anyOf': [{'type': 'string'}, {'type': 'null'}], 'title': 'Cursor', 'default': None},
+    },
+    'required': ['min_price', 'max_price'],
+}
+
+
+class Address(BaseModel):
+    city: str = Field(..., description='city name')
+    kind: Literal['home', 'work'] = Field(..., description='address kind')
+    zip_code: str = Field('', description='postal code')
+
+
+class SearchParams(BaseModel):
+    user_ids: list[str] = Field(..., description='user ids to look up')
+    address: Address = Field(..., description='address filter')
+    previous: Optional[Address] = Field(None, description='previous address')
+    order: Literal['asc', 'desc'] = Field('asc', description='sort order')
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def tool(schema: dict) -> AvailableTool:
+    return AvailableTool(name='search', description='search tool', input_schema=schema)
+
+
+def test_optional_properties_keep_the_tool_strict():
+    compiled = compile_function_tool(tool(PRICE_SCHEMA))
+    parameters = compiled['parameters']
+    assert compiled['strict'] is True
+    assert parameters['required'] == ['min_price', 'max_price', 'limit', 'cursor']
+    assert parameters['additionalProperties'] is False
+    assert parameters['properties']['min_price'] == {'type': 'integer'}
+    assert parameters['properties']['limit'] == {'type': ['integer', 'null']}
+    assert parameters['properties']['cursor'] == {'anyOf': [{'type': 'string'}, {'type': 'null'}]}
+
+
+def test_nested_objects_and_enums():
+    parameters, strict = _to_strict(SearchParams.model_json_schema())
+    address = parameters['$defs']['Address']
+    properties = parameters['properties']
+    assert strict is True
+    assert address['additionalProperties'] is False
+    assert address['required'] == ['city', 'kind', 'zip_code']
+    assert address['properties']['kind'] == {'description': 'address kind', 'enum': ['home', 'work'],
+                                             'type': 'string'}
+    assert address['properties']['zip_code']['type'] == ['string', 'null']
+    assert properties['address'] == {'$ref': '#/$defs/Address', 'description': 'address filter'}
+    assert properties['previous']['anyOf'] == [{'$ref': '#/$defs/Address'}, {'type': 'null'}]
+    assert properties['order']['type'] == ['string', 'null']
+    assert properties['order']['enum'] == ['asc', 'desc', None]
+    assert parameters['required'] == ['user_ids', 'address', 'previous', 'order']
+
+
+def test_free_form_maps_are_sent_non_strict():
+    schema = {
+        'type': 'object',
+        'properties': {'filters': {'type': 'object', 'additionalProperties': {'type': 'string'}}},
+        'required': ['filters'],
+    }
+    compiled = compile_function_tool(tool(schema))
+    assert compiled['strict'] is False
+    assert compiled['parameters']['properties']['filters'] == schema['properties']['filters']
+
+
+def test_nulls_of_optional_properties_are_dropped():
+    price = tool(PRICE_SCHEMA)
+    assert tool_arguments(price, {'min_price': 1, 'max_price': 2, 'limit': None, 'cursor': None}) == {
+        'min_price': 1, 'max_price': 2,
+    }
+    assert tool_arguments(price, {'min_price': 1, 'max_price': 2, 'limit': 5, 'cursor': 'c'})['cursor'] == 'c'
+
+    search = tool(SearchParams.model_json_schema())
+    arguments = tool_arguments(search, {
+        'user_ids': ['u1'],
+        'address': {'city': 'Seoul', 'kind': 'home', 'zip_code': None},
+        'previous': {'city': 'Busan', 'kind': 'work', 'zip_code': None},
+        'order': None,
+    })
+    assert arguments == {
+        'user_ids': ['u1'],
+        'address': {'city': 'Seoul', 'kind': 'home'},
+        'previous': {'city': 'Busan', 'kind': 'work'},
+    }
+    SearchParams.model_validate(arguments)
+
+
+def test_text_format_is_strict_json_schema():
+    compiled = text_format(SearchParams)
+    assert compiled['type'] == 'json_schema'
+    assert compiled['name'] == 'SearchParams'
+    assert compiled['strict'] is True
+    assert compiled['schema']['additionalProperties'] is False
+    assert text_format(SearchParams) is compiled
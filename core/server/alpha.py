@@ -1,5 +1,11 @@
 from fastmcp import FastMCP, Context
-from fastmcp.tools.tool import ToolResult, TextContent
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.tool import ToolResult
+
+from batch import register_batch_tool
+from encoding import tool_result
+from metrics import log_info, register_metrics
+from users import BatchedUserLookup, User, load_user_store
 
 mcp = FastMCP(
     name="MCP server Alpha 🚀",
@@ -8,9 +14,24 @@ mcp = FastMCP(
     """,
 )
 
+SEED_USERS = [
+    User(user_id='M4386', name='D.B.Cooper', address='Seattle Tacoma International Airport',
+         booked_items=["BALI004", "TOKYO002"]),
+]
+
+users = BatchedUserLookup(load_user_store(SEED_USERS))
+
+
+async def get_user(user_id: str) -> User:
+    user = await users.get(user_id)
+    if user is None:
+        raise ToolError(f"unknown user [{user_id}]")
+    return user
+
+
 @mcp.tool(
     tags={'alpha'},
-    meta={'author': 'anonymous'},
+    meta={'author': 'anonymous', 'idempotent': True, 'cache_ttl': 300},
     enabled=True
 )
 async def get_user_name(user_id: str, ctx: Context = None) -> ToolResult:
@@ -18,32 +39,24 @@ async def get_user_name(user_id: str, ctx: Context = None) -> ToolResult:
     Retrieves a user's name based on their user ID.
 
     This function takes a user ID string and returns the corresponding user name
-    from a predefined mapping. If the user ID is not found, returns None.
+    from the shared user store. If the user ID is not found, the tool fails.
 
     Args:
         user_id (str): The ID of the user to look up
         ctx : internal use only, ignore this parameter
 
     Returns:
-        ToolResult: Result object containing:
-            - Text content with the user's name
-            - Structured content with the name result
+        ToolResult: The user's name as `result`, in the wire form set by TOOL_RESULT_ENCODING
     """
-    await ctx.info('get_user_name tool invoked')
-    nams_space = {
-        'M4386': 'D.B.Cooper'
-    }
-    user_name = nams_space.get(user_id)
-    await ctx.info(f'get_user_name return value [{user_name}]')
-    return ToolResult(
-        content=TextContent(type="text", text=user_name),
-        structured_content={"result": user_name}
-    )
+    await log_info(ctx, 'get_user_name tool invoked')
+    user_name = (await get_user(user_id)).name
+    await log_info(ctx, f'get_user_name return value [{user_name}]')
+    return tool_result(user_name)
 
 
 @mcp.tool(
     tags={'alpha'},
-    meta={'author': 'anonymous'},
+    meta={'author': 'anonymous', 'idempotent': True, 'cache_ttl': 300},
     enabled=True
 )
 async def get_user_address(user_id: str, ctx: Context = None) -> ToolResult:
@@ -51,32 +64,24 @@ async def get_user_address(user_id: str, ctx: Context = None) -> ToolResult:
     Retrieves a user's address based on their user ID.
 
     This function takes a user ID string and returns the corresponding address
-    from a predefined mapping. If the user ID is not found, returns None.
+    from the shared user store. If the user ID is not found, the tool fails.
 
     Args:
         user_id (str): The ID of the user to look up
         ctx : internal use only, ignore this parameter
 
     Returns:
-        ToolResult: Result object containing:
-            - Text content with the user's address
-            - Structured content with the address result
+        ToolResult: The user's address as `result`, in the wire form set by TOOL_RESULT_ENCODING
     """
-    await ctx.info('get_user_address tool invoked')
-    nams_space = {
-        'M4386': 'Seattle Tacoma International Airport'
-    }
-    user_address = nams_space.get(user_id)
-    await ctx.info(f'get_user_address return value [{user_address}]')
-    return ToolResult(
-        content=TextContent(type="text", text=user_address),
-        structured_content={"result": user_address}
-    )
+    await log_info(ctx, 'get_user_address tool invoked')
+    user_address = (await get_user(user_id)).address
+    await log_info(ctx, f'get_user_address return value [{user_address}]')
+    return tool_result(user_address)
 
 
 @mcp.tool(
     tags={'alpha'},
-    meta={'author': 'anonymous'},
+    meta={'author': 'anonymous', 'idempotent': True, 'cache_ttl': 300},
     enabled=True
 )
 async def get_user_booked_item(user_id: str, ctx: Context = None) -> ToolResult:
@@ -84,27 +89,23 @@ async def get_user_booked_item(user_id: str, ctx: Context = None) -> ToolResult:
     Retrieves a list of items booked by a user based on their user ID.
 
     This function takes a user ID string and returns the corresponding list of booked items
-    from a predefined mapping. If the user ID is not found, returns None.
+    from the shared user store. If the user ID is not found, the tool fails.
 
     Args:
         user_id (str): The ID of the user to look up
         ctx : internal use only, ignore this parameter
 
     Returns:
-        ToolResult: Result object containing:
-            - Text content with the list of items booked by the user
-            - Structured content with the booked items result
+        ToolResult: The list of items booked by the user as `result`, in the wire form set by TOOL_RESULT_ENCODING
     """
-    await ctx.info('get_user_booked_item tool invoked')
-    nams_space = {
-        'M4386': ["BALI004", "TOKYO002"]
-    }
-    booked_item = nams_space.get(user_id)
-    await ctx.info(f'get_user_booked_item return value [{booked_item}]')
-    return ToolResult(
-        content=TextContent(type="text", text=f"{booked_item}"),
-        structured_content={"result": booked_item}
-    )
+    await log_info(ctx, 'get_user_booked_item tool invoked')
+    booked_item = (await get_user(user_id)).booked_items
+    await log_info(ctx, f'get_user_booked_item return value [{booked_item}]')
+    return tool_result(booked_item)
+
+
+register_batch_tool(mcp)
+register_metrics(mcp)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+import asyncio
+from typing import Any
+
+from fastmcp import FastMCP, Context
+from fastmcp.tools.tool import ToolResult
+from pydantic import BaseModel, Field
+
+from metrics import log_info
+
+BATCH_TOOL_NAME = 'batch_call'
+
+
+class BatchCall(BaseModel):
+    tool: str = Field(..., description='name of the tool to call')
+    arguments: dict[str, Any] = Field(default_factory=dict, description='arguments of the tool')
+
+
+def register_batch_tool(mcp: FastMCP) -> None:
+    """
+    Add the `batch_call` tool to a server: runs many invocations of the server's own tools in one request.
+
+    The tool is meant for clients grouping tool calls, not for the model: its meta carries `batch: True`
+    so the client keeps it out of the tool list offered to the model.
+    """
+
+    async def run(call: BatchCall) -> dict[str, Any]:
+        if call.tool == BATCH_TOOL_NAME:
+            return {'tool': call.tool, 'isError': True, 'content': [], 'error': 'nested batch_call is not allowed'}
+        try:
+            # goes through the server middleware like a regular tools/call
+            result: ToolResult = await mcp._call_tool(call.tool, call.arguments)
+        except Exception as e:
+            return {'tool': call.tool, 'isError': True, 'content': [], 'error': str(e)}
+        return {
+            'tool': call.tool,
+            'isError': False,
+            'content': [block.model_dump(mode='json', exclude_none=True) for block in result.content],
+            'structuredContent': result.structured_content,
+        }
+
+    @mcp.tool(
+        name=BATCH_TOOL_NAME,
+        tags={'batch'},
+        meta={'author': 'anonymous', 'batch': True},
+        enabled=True
+    )
+    async def batch_call(calls: list[BatchCall], ctx: Context = None) -> ToolResult:
+        """
+        Runs several tool invocations of this server in one request.
+
+        Args:
+            calls (list[BatchCall]): tool name and arguments of every invocation
+            ctx : internal use only, ignore this parameter
+
+        Returns:
+            ToolResult: Structured content with one result per call, in call order
+        """
+        await log_info(ctx, f'batch_call invoked with {len(calls)} calls')
+        results = await asyncio.gather(*[run(call) for call in calls])
+        # read by ToolBatcher only, structured content without a text copy in every encoding
+        return ToolResult(content=[], structured_content={"results": results})
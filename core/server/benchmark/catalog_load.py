@@ -0,0 +1,120 @@
+"""
+Load and query benchmark of the beta product catalog backends.
+
+Builds a catalog of `--products` synthetic packages with each backend and reports build time, resident
+memory growth and the latency of code lookups, price-range and name-prefix queries. `scan` is the previous
+approach, a plain dict filtered with a linear scan.
+
+usage (run from core/server):
+    python -m benchmark.catalog_load --products 1000000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from catalog import InMemoryProductCatalog, Product, ProductCatalog, SqliteProductCatalog, name_key
+
+DESTINATIONS = ['제주도', '도쿄', '오사카', '파리', '로마', '바르셀로나', '발리', '다낭', '방콕', '뉴욕', 'Hawaii', 'Sydney']
+
+
+def rss_mb() -> float:
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def make_products(count: int) -> list[Product]:
+    rng = random.Random(0)
+    return [
+        Product(
+            code=f"P{i:07d}",
+            name=f"{rng.choice(DESTINATIONS)} {rng.randint(2, 9)}일 패키지 {i}",
+            price=rng.randrange(100_000, 5_000_000, 1_000),
+            description=f"synthetic travel package {i}",
+        )
+        for i in range(count)
+    ]
+
+
+class ScanCatalog:
+    """previous behaviour: module dict, every query walks all products"""
+
+    def __init__(self, products: list[Product]):
+        self.products = {product.code: product for product in products}
+
+    def get_many(self, codes: list[str]) -> dict[str, Product]:
+        return {code: self.products[code] for code in codes if code in self.products}
+
+    def price_range(self, min_price: int, max_price: int, limit: int = 20) -> list[Product]:
+        found = sorted((p for p in self.products.values() if min_price <= p.price <= max_price),
+                       key=lambda p: (p.price, p.code))
+        return found[:limit]
+
+    def name_prefix(self, prefix: str, limit: int = 20) -> list[Product]:
+        key = name_key(prefix)
+        found = sorted((p for p in self.products.values() if name_key(p.name).startswith(key)),
+                       key=lambda p: (name_key(p.name), p.code))
+        return found[:limit]
+
+
+def timed_ms(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return round((time.perf_counter() - start) / repeat * 1000, 4)
+
+
+def build(backend: str, products: list[Product], directory: str) -> ProductCatalog:
+    if backend == 'scan':
+        return ScanCatalog(products)
+    if backend == 'memory':
+        catalog = InMemoryProductCatalog(products)
+        catalog.price_range(0, 0)  # sort the indexes as part of the build
+        return catalog
+    catalog = SqliteProductCatalog(os.path.join(directory, 'products.db'))
+    catalog.add_many(products)
+    return catalog
+
+
+def run(backend: str, products: list[Product], repeat: int, directory: str) -> dict:
+    rng = random.Random(1)
+    codes = [product.code for product in rng.sample(products, 10)]
+    # scans are slow, a few rounds are enough
+    repeat = max(1, repeat // 100) if backend == 'scan' else repeat
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    catalog = build(backend, products, directory)
+    build_s = time.perf_counter() - start
+    result = {
+        'backend': backend,
+        'products': len(products),
+        'build_s': round(build_s, 2),
+        'rss_growth_mb': round(rss_mb() - rss_before, 1),
+        'get_10_codes_ms': timed_ms(lambda: catalog.get_many(codes), repeat),
+        'price_range_ms': timed_ms(lambda: catalog.price_range(1_290_000, 1_300_000, 20), repeat),
+        'name_prefix_ms': timed_ms(lambda: catalog.name_prefix('발리 5일', 20), repeat),
+    }
+    assert len(catalog.price_range(1_290_000, 1_300_000, 20)) == 20
+    if hasattr(catalog, 'close'):
+        catalog.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=1000)
+    parser.add_argument('--backends', nargs='+', default=['scan', 'memory', 'sqlite'])
+    args = parser.parse_args()
+
+    products = make_products(args.products)
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in args.backends:
+            print(json.dumps(run(backend, products, args.repeat, directory), ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
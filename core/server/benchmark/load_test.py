@@ -0,0 +1,320 @@
+"""
+Concurrent load test of the MCP servers over streamable HTTP.
+
+Starts every `--servers` entry (alpha, beta, gateway) as a local `fastmcp run` process, then for every
+`--sessions` count opens that many `fastmcp.Client` sessions that call tools of the selected `--mix` back
+to back for `--duration` seconds. Reports throughput, p50/p95/p99 latency, errors and the server's CPU
+(utime + stime of its process session, as % of one core) and peak RSS sampled from /proc.
+
+Beta serves a synthetic catalog of `--products` packages (SQLite file, built once) so `large` mixes can ask
+`get_product_info` for `--codes` products per call.
+
+Results are written as JSON to `--output/<git sha>.json` (`-dirty` suffix with uncommitted changes),
+`--compare <sha or file>` prints the change of throughput and p95 against an earlier run.
+The load generator shares the machine with the servers, compare runs made on the same host.
+
+usage (run from core/server):
+    python -m benchmark.load_test --servers alpha beta --sessions 1 8 32 --duration 10
+    python -m benchmark.load_test --servers beta --mix large --codes 200 --compare 3a3f9ab
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from fastmcp import Client
+
+from benchmark.catalog_load import make_products
+from catalog import SqliteProductCatalog
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# tool name prefix of each server when called through the gateway
+GATEWAY_PREFIX = {'alpha': 'alpha_', 'beta': 'beta_'}
+
+
+def mixes(codes: list[str], large: int) -> dict[str, dict[str, list[tuple[str, dict]]]]:
+    """tool calls of every mix per server, a session picks one at random for every call"""
+    return {
+        'lookup': {
+            'alpha': [
+                ('get_user_name', {'user_id': 'M4386'}),
+                ('get_user_address', {'user_id': 'M4386'}),
+                ('get_user_booked_item', {'user_id': 'M4386'}),
+            ],
+            'beta': [
+                ('get_product_info', {'product_code': [code]}) for code in codes[:50]
+            ],
+        },
+        'large': {
+            'alpha': [('get_user_booked_item', {'user_id': 'M4386'})],
+            'beta': [
+                ('get_product_info', {'product_code': codes[i:i + large]}) for i in range(0, 5 * large, large)
+            ],
+        },
+        'search': {
+            'alpha': [('get_user_name', {'user_id': 'M4386'})],
+            'beta': [
+                ('find_products_by_price', {'min_price': 500_000, 'max_price': 1_500_000, 'limit': 20}),
+                ('find_products_by_name', {'prefix': '발리', 'limit': 20}),
+                ('search_products', {'query': '온천 휴양', 'k': 5}),
+            ],
+        },
+    }
+
+
+def calls_for(server: str, mix: dict[str, list[tuple[str, dict]]]) -> list[tuple[str, dict]]:
+    if server != 'gateway':
+        return mix[server]
+    return [(GATEWAY_PREFIX[name] + tool, arguments) for name, calls in mix.items() for tool, arguments in calls]
+
+
+class ServerProcess:
+    """a `fastmcp run` server in its own process session, CPU and RSS read from /proc"""
+
+    def __init__(self, name: str, port: int, env: dict[str, str]):
+        self.name = name
+        self.port = port
+        self.process = subprocess.Popen(
+            ['fastmcp', 'run', f'{name}.py', '--transport', 'http', '--port', str(port)],
+            cwd=SERVER_DIR, env={**os.environ, **env}, start_new_session=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.port}/mcp'
+
+    def wait_ready(self, timeout: float = 120) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'server [{self.name}] exited with {self.process.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=0.5).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise TimeoutError(f'server [{self.name}] not listening on {self.port}')
+
+    def _pids(self) -> list[str]:
+        pids = []
+        for pid in filter(str.isdigit, os.listdir('/proc')):
+            try:
+                with open(f'/proc/{pid}/stat') as stat:
+                    # fields after the command name: state, ppid, pgrp, session, ...
+                    if int(stat.read().rsplit(')', 1)[1].split()[3]) == self.process.pid:
+                        pids.append(pid)
+            except (OSError, IndexError, ValueError):
+                continue
+        return pids
+
+    def cpu_seconds(self) -> float:
+        total = 0
+        for pid in self._pids():
+            try:
+                with open(f'/proc/{pid}/stat') as stat:
+                    fields = stat.read().rsplit(')', 1)[1].split()
+                total += int(fields[11]) + int(fields[12])
+            except OSError:
+                continue
+        return total / os.sysconf('SC_CLK_TCK')
+
+    def rss_mb(self) -> float:
+        total = 0
+        for pid in self._pids():
+            try:
+                with open(f'/proc/{pid}/statm') as statm:
+                    total += int(statm.read().split()[1])
+            except OSError:
+                continue
+        return total * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+    def stop(self) -> None:
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+async def ignore_log(message) -> None:
+    """server log notifications are not printed by the load generator"""
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run_load(server: ServerProcess, calls: list[tuple[str, dict]], sessions: int, duration: float,
+                   warmup: float) -> dict:
+    clients = [Client(server.url, timeout=60, log_handler=ignore_log) for _ in range(sessions)]
+    await asyncio.gather(*[client.__aenter__() for client in clients])
+    latencies: list[float] = []
+    errors = 0
+    measuring = False
+    stop_at = 0.0
+
+    async def session(client: Client, seed: int):
+        nonlocal errors
+        rng = random.Random(seed)
+        while time.monotonic() < stop_at:
+            name, arguments = rng.choice(calls)
+            start = time.perf_counter()
+            try:
+                result = await client.call_tool_mcp(name, arguments)
+                failed = result.isError
+            except Exception:
+                failed = True
+            if measuring:
+                latencies.append(time.perf_counter() - start)
+                errors += failed
+
+    async def sample_rss(peak: list[float]):
+        while time.monotonic() < stop_at:
+            peak[0] = max(peak[0], server.rss_mb())
+            await asyncio.sleep(0.25)
+
+    try:
+        stop_at = time.monotonic() + warmup
+        await asyncio.gather(*[session(client, i) for i, client in enumerate(clients)])
+
+        measuring = True
+        peak_rss = [server.rss_mb()]
+        cpu_before = server.cpu_seconds()
+        started = time.perf_counter()
+        stop_at = time.monotonic() + duration
+        await asyncio.gather(sample_rss(peak_rss), *[session(client, 1000 + i) for i, client in enumerate(clients)])
+        elapsed = time.perf_counter() - started
+        cpu = server.cpu_seconds() - cpu_before
+    finally:
+        await asyncio.gather(*[client.__aexit__(None, None, None) for client in clients], return_exceptions=True)
+
+    latencies.sort()
+    ms = 1000
+    return {
+        'sessions': sessions,
+        'calls': len(latencies),
+        'errors': errors,
+        'throughput_per_s': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * ms, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * ms, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * ms, 2),
+        'mean_ms': round(statistics.mean(latencies) * ms, 2),
+        'server_cpu_pct': round(cpu / elapsed * 100, 1),
+        'server_cpu_ms_per_call': round(cpu / len(latencies) * ms, 3),
+        'server_rss_peak_mb': round(peak_rss[0], 1),
+    }
+
+
+def git_revision() -> str:
+    def git(*args: str) -> str:
+        return subprocess.run(['git', *args], cwd=SERVER_DIR, capture_output=True, text=True).stdout.strip()
+
+    sha = git('rev-parse', '--short', 'HEAD') or 'unknown'
+    return f'{sha}-dirty' if git('status', '--porcelain', '--untracked-files=no') else sha
+
+
+def load_runs(path: str) -> dict[tuple, dict]:
+    with open(path) as results_file:
+        return {(run['server'], run['mix'], run['sessions']): run for run in json.load(results_file)['runs']}
+
+
+def compare(results: list[dict], baseline: dict[tuple, dict]) -> None:
+    for run in results:
+        before = baseline.get((run['server'], run['mix'], run['sessions']))
+        if before is None:
+            continue
+        print(json.dumps({
+            'server': run['server'], 'mix': run['mix'], 'sessions': run['sessions'],
+            'throughput_change_pct': round((run['throughput_per_s'] / before['throughput_per_s'] - 1) * 100, 1),
+            'p95_change_pct': round((run['p95_ms'] / before['p95_ms'] - 1) * 100, 1),
+        }))
+
+
+def prepare_catalog(directory: str, products: int) -> dict[str, str]:
+    """environment of a beta server backed by a synthetic SQLite catalog of `products` packages"""
+    path = os.path.join(directory, f'products-{products}.db')
+    if not os.path.exists(path):
+        catalog = SqliteProductCatalog(path)
+        catalog.add_many(make_products(products))
+        catalog.close()
+    return {
+        'PRODUCT_CATALOG': 'sqlite',
+        'PRODUCT_CATALOG_PATH': path,
+        'PRODUCT_INDEX_PATH': os.path.join(directory, f'index-{products}'),
+        'TOOL_LOG_MODE': os.environ.get('TOOL_LOG_MODE', 'sampled'),
+    }
+
+
+async def main_async(args: argparse.Namespace) -> list[dict]:
+    cache = args.data or os.path.join(tempfile.gettempdir(), 'mcp-load-test')
+    os.makedirs(cache, exist_ok=True)
+    env = prepare_catalog(cache, args.products)
+    codes = [f'P{i:07d}' for i in range(args.products)]
+    mix = mixes(codes, args.codes)[args.mix]
+
+    results = []
+    for offset, name in enumerate(args.servers):
+        server = ServerProcess(name, args.port + offset, env)
+        try:
+            server.wait_ready()
+            idle_rss = server.rss_mb()
+            for sessions in args.sessions:
+                result = await run_load(server, calls_for(name, mix), sessions, args.duration, args.warmup)
+                result = {'server': name, 'mix': args.mix, 'server_rss_idle_mb': round(idle_rss, 1), **result}
+                print(json.dumps(result))
+                results.append(result)
+        finally:
+            server.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--servers', nargs='+', default=['alpha', 'beta'], choices=['alpha', 'beta', 'gateway'])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--mix', default='lookup', choices=['lookup', 'large', 'search'])
+    parser.add_argument('--duration', type=float, default=10.0, help='measured seconds per run')
+    parser.add_argument('--warmup', type=float, default=2.0, help='unmeasured seconds before every run')
+    parser.add_argument('--products', type=int, default=10_000, help='products of the beta catalog')
+    parser.add_argument('--codes', type=int, default=200, help='product codes per call of the large mix')
+    parser.add_argument('--port', type=int, default=9110, help='port of the first server')
+    parser.add_argument('--data', help='directory caching the generated catalogs')
+    parser.add_argument('--output', default=os.path.join(SERVER_DIR, 'benchmark', 'results'))
+    parser.add_argument('--compare', help='git sha or JSON file of an earlier run')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        # read before running: a run of the same revision overwrites the file
+        path = args.compare if os.path.exists(args.compare) else os.path.join(args.output, f'{args.compare}.json')
+        baseline = load_runs(path)
+
+    results = asyncio.run(main_async(args))
+
+    revision = git_revision()
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f'{revision}.json')
+    with open(path, 'w') as output:
+        json.dump({
+            'revision': revision,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'host': {'cpus': os.cpu_count(), 'python': sys.version.split()[0], 'platform': platform.platform()},
+            'args': {key: value for key, value in vars(args).items() if key not in ('output', 'compare', 'data')},
+            'runs': results,
+        }, output, indent=2, ensure_ascii=False)
+    print(f'results written to {path}')
+
+    if baseline is not None:
+        compare(results, baseline)
+
+if __name__ == '__main__':
+    main()
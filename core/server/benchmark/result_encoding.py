@@ -0,0 +1,111 @@
+"""
+Bytes on the wire per tool result for every TOOL_RESULT_ENCODING, and cost of cursor pagination.
+
+Calls the beta tools in-process through a FastMCP client and measures the serialized `CallToolResult`
+(the JSON-RPC result as sent over streamable HTTP, without SSE framing). `model_chars` is the tool output
+as the client hands it to the model: for `both` as the previous client did (`json.dumps` of the repr text
+blocks, non-ASCII escaped), otherwise compact UTF-8 JSON of the structured result or text.
+
+The pagination part fills a `--products` catalog and pages through a price range with `find_products_by_price`,
+reporting the latency of the first and of the last page (keyset cursors: the last page costs like the first).
+
+usage (run from core/server):
+    python -m benchmark.result_encoding --products 100000 --page-size 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from fastmcp import Client
+from mcp.types import CallToolResult
+
+import beta
+from benchmark.catalog_load import make_products
+from catalog import InMemoryProductCatalog
+from encoding import ResultEncoding, to_json
+
+CALLS = [
+    ('get_product_info', {'product_code': ['JEJU001', 'TOKYO002', 'EURO003', 'BALI004', 'VIET005']}),
+    ('find_products_by_price', {'min_price': 0, 'max_price': 10_000_000, 'limit': 20}),
+    ('search_products', {'query': '휴양 스파', 'k': 5}),
+]
+
+
+def model_chars(result: CallToolResult, mode: str) -> int:
+    """size of the tool output McpTool gives to the model; `both` is measured with the previous client"""
+    if mode == 'both':
+        return len(json.dumps([block.text for block in result.content]))
+    if result.structuredContent is not None:
+        structured = result.structuredContent
+        return len(to_json([structured['result'] if structured.keys() == {'result'} else structured]))
+    return len(to_json([block.text for block in result.content]))
+
+
+async def encodings(client: Client) -> None:
+    for mode in ('both', 'json', 'structured', 'structured_only'):
+        ResultEncoding.mode = mode
+        for name, arguments in CALLS:
+            result = await client.call_tool_mcp(name, arguments)
+            assert not result.isError, result.content
+            print(json.dumps({
+                'encoding': mode,
+                'tool': name,
+                'wire_bytes': len(result.model_dump_json(by_alias=True, exclude_none=True).encode()),
+                'model_chars': model_chars(result, mode),
+            }))
+
+
+async def timed_call(client: Client, arguments: dict) -> tuple[float, CallToolResult]:
+    start = time.perf_counter()
+    result = await client.call_tool_mcp('find_products_by_price', arguments)
+    return time.perf_counter() - start, result
+
+
+async def pagination(client: Client, products: int, page_size: int) -> None:
+    ResultEncoding.mode = 'structured_only'
+    beta.catalog = InMemoryProductCatalog(make_products(products))
+    beta.catalog.price_range(0, 0)  # sort the indexes before timing
+    arguments = {'min_price': 0, 'max_price': 10_000_000, 'limit': page_size}
+
+    latencies, pages, wire_bytes, cursor = [], 0, 0, None
+    while True:
+        latency, result = await timed_call(client, {**arguments, 'cursor': cursor} if cursor else arguments)
+        latencies.append(latency)
+        pages += 1
+        wire_bytes += len(result.model_dump_json(by_alias=True, exclude_none=True).encode())
+        cursor = result.structuredContent['next_cursor']
+        if cursor is None:
+            break
+
+    everything_latency, everything = await timed_call(client, {**arguments, 'limit': products})
+    print(json.dumps({
+        'products': products,
+        'page_size': page_size,
+        'pages': pages,
+        'first_page_ms': round(latencies[0] * 1000, 2),
+        'last_page_ms': round(latencies[-1] * 1000, 2),
+        'page_p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'page_bytes_avg': wire_bytes // pages,
+        'single_response_bytes': len(everything.model_dump_json(by_alias=True, exclude_none=True).encode()),
+        'single_response_ms': round(everything_latency * 1000, 2),
+    }))
+
+
+async def main_async(products: int, page_size: int) -> None:
+    async with Client(beta.mcp) as client:
+        await encodings(client)
+        await pagination(client, products, page_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--page-size', type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.products, args.page_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Startup time, memory and lookup latency of the alpha user store.
+
+Generates `--users` synthetic users and compares the columnar UserStore (built in memory, then saved
+and reopened memory-mapped like the alpha server does with USER_STORE_PATH) against `dict`, one Python
+dict of dicts as the per-call `nams_space` mappings would look at scale. Resident memory growth is read
+from /proc/self/statm; for the memory-mapped store `mmap_anon_growth_mb` (RssAnon) leaves out the file
+pages, which live in the shared page cache and can be evicted. `batched_lookup` goes through
+BatchedUserLookup with `--batch` concurrent gets.
+
+usage (run from core/server):
+    python -m benchmark.user_store --users 1000000
+    python -m benchmark.user_store --users 10000000 --stores columnar
+"""
+import argparse
+import asyncio
+import gc
+import json
+import random
+import tempfile
+import time
+
+from benchmark.catalog_load import DESTINATIONS, rss_mb, timed_ms
+from users import BatchedUserLookup, User, UserStore
+
+NAMES = ['Kim', 'Lee', 'Park', 'Choi', 'Jung', 'Cooper', 'Smith', 'Tanaka', 'Garcia', 'Rossi']
+
+
+def anon_mb() -> float:
+    with open('/proc/self/status') as status:
+        line = next(line for line in status if line.startswith('RssAnon:'))
+    return int(line.split()[1]) / 2 ** 10
+
+
+def make_users(count: int):
+    rng = random.Random(0)
+    for i in range(count):
+        yield User(
+            user_id=f"M{i:08d}",
+            name=f"{rng.choice(NAMES)} {i}",
+            address=f"{rng.randint(1, 999)} {rng.choice(DESTINATIONS)} street",
+            booked_items=[f"{rng.choice(DESTINATIONS)[:4].upper()}{rng.randint(0, 999):03d}"
+                          for _ in range(rng.randint(0, 4))],
+        )
+
+
+def run_dict(count: int, lookup_ids: list[str], repeat: int) -> dict:
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    users = {user.user_id: {'name': user.name, 'address': user.address, 'booked_items': user.booked_items}
+             for user in make_users(count)}
+    build_s = time.perf_counter() - start
+    rss_growth = rss_mb() - rss_before
+    return {
+        'store': 'dict',
+        'users': count,
+        'build_s': round(build_s, 2),
+        'rss_growth_mb': round(rss_growth, 1),
+        'bytes_per_user': round(rss_growth * 2 ** 20 / count, 1),
+        'lookup_ms': timed_ms(lambda: users.get(lookup_ids[0]), repeat),
+        f"lookup_{len(lookup_ids)}_ms": timed_ms(lambda: [users.get(user_id) for user_id in lookup_ids], repeat),
+    }
+
+
+async def batched(lookup: BatchedUserLookup, lookup_ids: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await lookup.get_many(lookup_ids)
+    return round((time.perf_counter() - start) / repeat * 1000, 4)
+
+
+def run_columnar(count: int, lookup_ids: list[str], repeat: int, directory: str) -> dict:
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    store = UserStore.build(list(make_users(count)))
+    build_s = time.perf_counter() - start
+    gc.collect()
+    rss_growth = rss_mb() - rss_before
+    store.save(directory)
+    nbytes = store.nbytes
+    del store
+    gc.collect()
+
+    rss_before, anon_before = rss_mb(), anon_mb()
+    start = time.perf_counter()
+    store = UserStore.load(directory)
+    store.get_many(lookup_ids)
+    startup_ms = (time.perf_counter() - start) * 1000
+    assert all(user is not None for user in store.get_many(lookup_ids))
+    assert store.get_many(['M99999999X', 'unknown']) == [None, None]
+
+    lookup = BatchedUserLookup(store)
+    return {
+        'store': 'columnar',
+        'users': count,
+        'build_s': round(build_s, 2),
+        'rss_growth_mb': round(rss_growth, 1),
+        'bytes_per_user': round(nbytes / count, 1),
+        'data_mb': round(nbytes / 2 ** 20, 1),
+        'mmap_startup_ms': round(startup_ms, 2),
+        'mmap_rss_growth_mb': round(rss_mb() - rss_before, 1),
+        'mmap_anon_growth_mb': round(anon_mb() - anon_before, 1),
+        'lookup_ms': timed_ms(lambda: store.get_many(lookup_ids[:1]), repeat),
+        f"lookup_{len(lookup_ids)}_ms": timed_ms(lambda: store.get_many(lookup_ids), repeat),
+        f"batched_lookup_{len(lookup_ids)}_ms": asyncio.run(batched(lookup, lookup_ids, repeat)),
+        'batches': lookup.batches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--batch', type=int, default=32, help='user ids per batched lookup')
+    parser.add_argument('--repeat', type=int, default=1000)
+    parser.add_argument('--stores', nargs='+', default=['columnar', 'dict'])
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    lookup_ids = [f"M{rng.randrange(args.users):08d}" for _ in range(args.batch)]
+    with tempfile.TemporaryDirectory() as directory:
+        for store in args.stores:
+            if store == 'dict':
+                result = run_dict(args.users, lookup_ids, args.repeat)
+            else:
+                result = run_columnar(args.users, lookup_ids, args.repeat, directory)
+            print(json.dumps(result))
+            gc.collect()
+
+
+if __name__ == '__main__':
+    main()
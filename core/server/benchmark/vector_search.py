@@ -0,0 +1,84 @@
+"""
+Latency of `search_products` (top-k cosine search over the memory-mapped embedding matrix).
+
+Builds an index of `--products` synthetic packages: `--unique` distinct descriptions are embedded with
+the hashed n-gram embedder and shared by the products, the matrix is written as .npy and reopened
+memory-mapped like the beta server does with PRODUCT_INDEX_PATH.
+
+usage (run from core/server):
+    python -m benchmark.vector_search --products 1000000 --dim 256
+"""
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from benchmark.catalog_load import DESTINATIONS
+from catalog import Product
+from embedding import HashedNgramEmbedder, ProductVectorIndex, product_text
+
+THEMES = ['해변 휴양', '풀빌라 스파', '도시 자유여행', '미술관 투어', '트래킹 등반', '미식 투어', '온천 료칸', '크루즈']
+QUERIES = ['조용한 해변 휴양', '풀빌라 스파 포함', '미술관 가이드 투어', '온천 여행', 'relaxing beach resort']
+
+
+def make_products(count: int, unique: int) -> tuple[list[Product], np.ndarray]:
+    rng = random.Random(0)
+    templates = [
+        f"{rng.choice(DESTINATIONS)} {rng.choice(THEMES)} {rng.randint(2, 9)}일, {rng.choice(THEMES)} 포함 #{i}"
+        for i in range(unique)
+    ]
+    assignment = np.array([rng.randrange(unique) for _ in range(count)])
+    products = [
+        Product(code=f"P{i:07d}", name=templates[assignment[i]].split(',')[0],
+                price=rng.randrange(100_000, 5_000_000, 1_000), description=templates[assignment[i]])
+        for i in range(count)
+    ]
+    return products, assignment
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=1_000_000)
+    parser.add_argument('--unique', type=int, default=5000, help='distinct descriptions to embed')
+    parser.add_argument('--dim', type=int, nargs='+', default=[64, 256])
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    products, assignment = make_products(args.products, args.unique)
+    for dim in args.dim:
+        embedder = HashedNgramEmbedder(dim=dim)
+        unique_products = {}
+        for position, template in enumerate(assignment):
+            unique_products.setdefault(int(template), products[position])
+        start = time.perf_counter()
+        unique_vectors = embedder.embed_many([product_text(unique_products[i]) for i in range(args.unique)])
+        embed_us = (time.perf_counter() - start) / args.unique * 1e6
+
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            index = ProductVectorIndex.build(products, embedder, directory, vectors=unique_vectors[assignment])
+            build_s = time.perf_counter() - start
+
+            result = {'products': args.products, 'dim': dim, 'matrix_mb': round(index.vectors.nbytes / 2 ** 20, 1),
+                      'embed_us_per_product': round(embed_us, 1), 'build_s': round(build_s, 2)}
+            for label, max_price in (('no_filter', None), ('max_price_1.3M', 1_300_000)):
+                index.search(QUERIES[0], args.k, max_price)  # page the matrix in
+                latencies = []
+                for i in range(args.repeat):
+                    start = time.perf_counter()
+                    hits = index.search(QUERIES[i % len(QUERIES)], args.k, max_price)
+                    latencies.append(time.perf_counter() - start)
+                    assert len(hits) == args.k
+                result[f"{label}_p50_ms"] = round(statistics.median(latencies) * 1000, 2)
+                result[f"{label}_max_ms"] = round(max(latencies) * 1000, 2)
+            print(json.dumps(result))
+            del index
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,14 @@
-from typing import List
+from typing import Callable, List, Optional
 
 from fastmcp import FastMCP, Context
-from fastmcp.tools.tool import ToolResult, TextContent
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.tool import ToolResult
+
+from batch import register_batch_tool
+from catalog import Product, load_catalog, name_key
+from embedding import load_vector_index
+from encoding import decode_cursor, encode_cursor, tool_result
+from metrics import log_info, register_metrics
 
 mcp = FastMCP(
     name="MCP server Beta 🚀",
@@ -38,10 +45,25 @@ PROD_INFO = {
     }
 }
 
+catalog = load_catalog(PROD_INFO)
+vector_index = load_vector_index(catalog)
+
+
+def _after(cursor: Optional[str]) -> Optional[tuple]:
+    key = decode_cursor(cursor)
+    return None if key is None else tuple(key)
+
+
+def _page_result(page: list[Product], limit: int, cursor_of: Callable[[Product], str]) -> ToolResult:
+    """one page of products fetched with `limit + 1`, the extra product only tells whether a next page exists"""
+    result = {product.code: product.to_dict() for product in page[:limit]}
+    next_cursor = cursor_of(page[limit - 1]) if len(page) > limit else None
+    return tool_result(result, next_cursor=next_cursor)
+
 
 @mcp.tool(
     tags={'beta'},
-    meta={'author': 'anonymous'},
+    meta={'author': 'anonymous', 'idempotent': True, 'cache_ttl': 300},
     enabled=True
 )
 async def get_product_info(product_code: List[str], ctx: Context = None) -> ToolResult:
@@ -55,14 +77,102 @@ async def get_product_info(product_code: List[str], ctx: Context = None) -> Tool
     Returns:
         ToolResult: Product information including name, price and description for requested product codes
     """
-    await ctx.info('get_product_info tool invoked')
-    result = {}
-    for code in product_code:
-        result.update({code: PROD_INFO[code]})
-    return ToolResult(
-        content=TextContent(type="text", text=f"{result}"),
-        structured_content={"result": result}
-    )
+    await log_info(ctx, 'get_product_info tool invoked')
+    products = catalog.get_many(product_code)
+    unknown = [code for code in product_code if code not in products]
+    if unknown:
+        raise ToolError(f"unknown product codes: {unknown}")
+    result = {code: product.to_dict() for code, product in products.items()}
+    return tool_result(result)
+
+
+@mcp.tool(
+    tags={'beta'},
+    meta={'author': 'anonymous', 'idempotent': True, 'cache_ttl': 300},
+    enabled=True
+)
+async def find_products_by_price(min_price: int, max_price: int, limit: int = 20, cursor: Optional[str] = None,
+                                 ctx: Context = None) -> ToolResult:
+    """
+    Finds travel packages whose price (KRW) lies within the given range, cheapest first.
+
+    Args:
+        min_price (int): Lowest price to include
+        max_price (int): Highest price to include
+        limit (int): Maximum number of packages to return
+        cursor (str, optional): `next_cursor` of the previous page, to get the following packages
+        ctx (Context, optional): internal use only, ignore this parameter
+
+    Returns:
+        ToolResult: Product code, name, price and description of the matching packages,
+            and `next_cursor` when more packages match
+    """
+    await log_info(ctx, 'find_products_by_price tool invoked')
+    if limit < 1:
+        raise ToolError("limit must be at least 1")
+    page = catalog.price_range(min_price, max_price, limit + 1, after=_after(cursor))
+    return _page_result(page, limit, lambda last: encode_cursor(last.price, last.code))
+
+
+@mcp.tool(
+    tags={'beta'},
+    meta={'author': 'anonymous', 'idempotent': True, 'cache_ttl': 300},
+    enabled=True
+)
+async def find_products_by_name(prefix: str, limit: int = 20, cursor: Optional[str] = None,
+                                ctx: Context = None) -> ToolResult:
+    """
+    Finds travel packages whose name starts with the given prefix (case-insensitive), in name order.
+
+    Args:
+        prefix (str): Beginning of the package name, e.g. "제주도"
+        limit (int): Maximum number of packages to return
+        cursor (str, optional): `next_cursor` of the previous page, to get the following packages
+        ctx (Context, optional): internal use only, ignore this parameter
+
+    Returns:
+        ToolResult: Product code, name, price and description of the matching packages,
+            and `next_cursor` when more packages match
+    """
+    await log_info(ctx, 'find_products_by_name tool invoked')
+    if limit < 1:
+        raise ToolError("limit must be at least 1")
+    page = catalog.name_prefix(prefix, limit + 1, after=_after(cursor))
+    return _page_result(page, limit, lambda last: encode_cursor(name_key(last.name), last.code))
+
+
+@mcp.tool(
+    tags={'beta'},
+    meta={'author': 'anonymous', 'idempotent': True, 'cache_ttl': 300},
+    enabled=True
+)
+async def search_products(query: str, k: int = 5, max_price: Optional[int] = None, ctx: Context = None) \
+        -> ToolResult:
+    """
+    Searches travel packages by meaning of their name and description, e.g. "relaxing beach resort".
+    Use this when the product codes are not known yet.
+
+    Args:
+        query (str): Free text description of the wanted trip
+        k (int): Number of packages to return
+        max_price (int, optional): Only packages priced at or below this amount (KRW)
+        ctx (Context, optional): internal use only, ignore this parameter
+
+    Returns:
+        ToolResult: Best matching packages first, with code, name, price, description and similarity score
+    """
+    await log_info(ctx, 'search_products tool invoked')
+    hits = vector_index.search(query, k=k, max_price=max_price)
+    products = catalog.get_many([code for code, _ in hits])
+    result = [
+        {'code': code, **products[code].to_dict(), 'score': round(score, 4)}
+        for code, score in hits if code in products
+    ]
+    return tool_result(result)
+
+
+register_batch_tool(mcp)
+register_metrics(mcp)
 
 
 if __name__ == "__main__":
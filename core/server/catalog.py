@@ -0,0 +1,222 @@
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+# sorts after every character a product name can hold, closes a prefix range
+_PREFIX_END = '\U0010ffff'
+
+
+class Product(NamedTuple):
+    code: str
+    name: str
+    price: int
+    description: str
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'price': self.price, 'description': self.description}
+
+
+def name_key(name: str) -> str:
+    """normalized name used by the name index and prefix queries"""
+    return name.casefold()
+
+
+class ProductCatalog(ABC):
+    """
+    Storage of the travel packages served by the beta server.
+
+    Besides lookups by product code, implementations keep secondary indexes on price and name so
+    price-range and name-prefix queries take O(log n + k) for k returned products. Later pages start after
+    the sort key of the last product of the previous page (keyset pagination), so page n costs the same as page 1.
+    """
+
+    @abstractmethod
+    def add_many(self, products: Iterable[Product]) -> None:
+        ...
+
+    @abstractmethod
+    def get_many(self, codes: list[str]) -> dict[str, Product]:
+        """products of the given codes, unknown codes are left out"""
+
+    @abstractmethod
+    def price_range(self, min_price: int, max_price: int, limit: int = 20,
+                    after: Optional[tuple[int, str]] = None) -> list[Product]:
+        """products with min_price <= price <= max_price, cheapest first, after the (price, code) of a previous page"""
+
+    @abstractmethod
+    def name_prefix(self, prefix: str, limit: int = 20, after: Optional[tuple[str, str]] = None) -> list[Product]:
+        """
+        products whose name starts with prefix (case-insensitive), in name order,
+        after the (name key, code) of a previous page
+        """
+
+    @abstractmethod
+    def iter_products(self) -> Iterator[Product]:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryProductCatalog(ProductCatalog):
+    """
+    Dict by code plus sorted arrays for the secondary indexes, searched with bisect.
+    The sorted arrays are rebuilt lazily after writes, bulk loads pay one sort.
+    """
+
+    def __init__(self, products: Iterable[Product] = ()):
+        self.products: dict[str, Product] = {}
+        self._prices: list[int] = []
+        self._by_price: list[str] = []
+        self._names: list[str] = []
+        self._by_name: list[str] = []
+        self._dirty = False
+        self.add_many(products)
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        for product in products:
+            self.products[product.code] = product
+            self._dirty = True
+
+    def _reindex(self) -> None:
+        if not self._dirty:
+            return
+        by_price = sorted(self.products.values(), key=lambda product: (product.price, product.code))
+        self._prices = [product.price for product in by_price]
+        self._by_price = [product.code for product in by_price]
+        by_name = sorted((name_key(product.name), product.code) for product in self.products.values())
+        self._names = [key for key, _ in by_name]
+        self._by_name = [code for _, code in by_name]
+        self._dirty = False
+
+    def get_many(self, codes: list[str]) -> dict[str, Product]:
+        return {code: self.products[code] for code in codes if code in self.products}
+
+    @staticmethod
+    def _after(keys: list, codes: list[str], start: int, after: Optional[tuple]) -> int:
+        """first position past the (key, code) of `after`, ties on key are ordered by code"""
+        if after is None:
+            return start
+        key, code = after
+        low, high = bisect_left(keys, key), bisect_right(keys, key)
+        return max(start, bisect_right(codes, code, low, high))
+
+    def price_range(self, min_price: int, max_price: int, limit: int = 20,
+                    after: Optional[tuple[int, str]] = None) -> list[Product]:
+        self._reindex()
+        start = self._after(self._prices, self._by_price, bisect_left(self._prices, min_price), after)
+        end = min(bisect_right(self._prices, max_price), start + limit)
+        return [self.products[code] for code in self._by_price[start:end]]
+
+    def name_prefix(self, prefix: str, limit: int = 20, after: Optional[tuple[str, str]] = None) -> list[Product]:
+        self._reindex()
+        key = name_key(prefix)
+        start = self._after(self._names, self._by_name, bisect_left(self._names, key), after)
+        end = min(bisect_left(self._names, key + _PREFIX_END), start + limit)
+        return [self.products[code] for code in self._by_name[start:end]]
+
+    def iter_products(self) -> Iterator[Product]:
+        return iter(self.products.values())
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+
+class SqliteProductCatalog(ProductCatalog):
+    """
+    SQLite table with B-tree indexes on price and normalized name, read through a memory-mapped file.
+    Prefix queries are index range scans on [prefix, prefix + U+10FFFF).
+    """
+
+    def __init__(self, path: str = ':memory:', mmap_size: int = 1 << 30):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        if path != ':memory:':
+            self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS products (
+                code TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                name_key TEXT NOT NULL,
+                price INTEGER NOT NULL,
+                description TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS products_price ON products (price, code);
+            CREATE INDEX IF NOT EXISTS products_name_key ON products (name_key, code);
+        """)
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO products (code, name, name_key, price, description) VALUES (?, ?, ?, ?, ?)",
+                ((p.code, p.name, name_key(p.name), p.price, p.description) for p in products),
+            )
+
+    def _select(self, where: str, params: tuple) -> list[Product]:
+        rows = self.connection.execute(f"SELECT code, name, price, description FROM products {where}", params)
+        return [Product(*row) for row in rows]
+
+    def get_many(self, codes: list[str]) -> dict[str, Product]:
+        if not codes:
+            return {}
+        placeholders = ','.join('?' * len(codes))
+        found = {product.code: product for product in self._select(f"WHERE code IN ({placeholders})", tuple(codes))}
+        return {code: found[code] for code in codes if code in found}
+
+    def price_range(self, min_price: int, max_price: int, limit: int = 20,
+                    after: Optional[tuple[int, str]] = None) -> list[Product]:
+        if after is None:
+            return self._select(
+                "WHERE price BETWEEN ? AND ? ORDER BY price, code LIMIT ?", (min_price, max_price, limit)
+            )
+        return self._select(
+            "WHERE price BETWEEN ? AND ? AND (price, code) > (?, ?) ORDER BY price, code LIMIT ?",
+            (min_price, max_price, *after, limit)
+        )
+
+    def name_prefix(self, prefix: str, limit: int = 20, after: Optional[tuple[str, str]] = None) -> list[Product]:
+        key = name_key(prefix)
+        if after is None:
+            return self._select(
+                "WHERE name_key >= ? AND name_key < ? ORDER BY name_key, code LIMIT ?", (key, key + _PREFIX_END, limit)
+            )
+        return self._select(
+            "WHERE name_key >= ? AND name_key < ? AND (name_key, code) > (?, ?) ORDER BY name_key, code LIMIT ?",
+            (key, key + _PREFIX_END, *after, limit)
+        )
+
+    def iter_products(self) -> Iterator[Product]:
+        return (Product(*row) for row in self.connection.execute(
+            "SELECT code, name, price, description FROM products ORDER BY code"
+        ))
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def load_catalog(seed: dict[str, dict], backend: Optional[str] = None, path: Optional[str] = None) \
+        -> ProductCatalog:
+    """
+    Open the catalog selected by PRODUCT_CATALOG (`memory` or `sqlite`, file at PRODUCT_CATALOG_PATH).
+    An empty catalog is seeded with the given `{code: {name, price, description}}` mapping.
+    """
+    backend = backend or os.environ.get('PRODUCT_CATALOG', 'memory')
+    if backend == 'sqlite':
+        catalog = SqliteProductCatalog(path or os.environ.get('PRODUCT_CATALOG_PATH', 'products.db'))
+    elif backend == 'memory':
+        catalog = InMemoryProductCatalog()
+    else:
+        raise ValueError(f"unknown product catalog backend [{backend}]")
+
+    if len(catalog) == 0:
+        catalog.add_many(Product(code=code, **info) for code, info in seed.items())
+    return catalog
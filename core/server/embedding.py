@@ -0,0 +1,237 @@
+import hashlib
+import json
+import os
+import re
+import zlib
+from typing import Optional
+
+import numpy as np
+
+from catalog import Product, ProductCatalog
+
+_TOKEN = re.compile(r'\w+')
+
+# travel concepts with their English and Korean surface forms: a token starting with one of the forms also
+# yields the concept, so "relaxing beach resort" meets "발리 휴양 패키지" although they share no n-gram
+CONCEPTS = {
+    'beach': ('beach', 'seaside', 'ocean', '해변', '비치', '바다', '해수욕'),
+    'relax': ('relax', 'healing', 'resort', 'vacation', '휴양', '힐링', '휴식', '리조트'),
+    'resort': ('resort', 'villa', 'pool', '리조트', '풀빌라', '빌라'),
+    'spa': ('spa', 'massage', 'hot spring', 'onsen', '스파', '마사지', '온천'),
+    'hiking': ('hiking', 'hike', 'trekking', 'trek', 'climb', 'mountain', '등반', '트래킹', '하이킹', '한라산'),
+    'city': ('city', 'urban', 'downtown', '도시', '시내'),
+    'guided': ('tour', 'guide', 'sightseeing', '투어', '가이드', '관광'),
+    'theme_park': ('disney', 'theme park', 'amusement', '디즈니', '테마파크', '놀이공원'),
+    'culture': ('culture', 'museum', 'history', 'historic', 'ancient', '문화', '미술관', '박물관', '고대'),
+    'food': ('food', 'gourmet', 'culinary', '미식', '맛집'),
+    'flight': ('flight', 'airfare', 'airline', '항공'),
+    'jeju': ('jeju', '제주'),
+    'tokyo': ('tokyo', 'japan', '도쿄', '일본'),
+    'europe': ('europe', 'paris', 'rome', 'barcelona', '유럽', '파리', '로마', '바르셀로나'),
+    'bali': ('bali', 'ubud', 'kuta', '발리', '우붓', '꾸따'),
+    'vietnam': ('vietnam', 'danang', 'da nang', 'hoi an', 'hoian', '베트남', '다낭', '호이안'),
+}
+
+
+class HashedNgramEmbedder:
+    """
+    Deterministic, offline text embedder: word tokens and their character n-grams are hashed (crc32)
+    into a fixed number of signed buckets, the vector is L2 normalized so a dot product is the cosine.
+    Works for any script, Korean included, and needs no model download.
+
+    N-grams only match texts of the same language, the `CONCEPTS` a text mentions are added as features
+    weighted by `concept_weight` so a query in English finds the Korean catalog and the other way round.
+    """
+
+    def __init__(self, dim: int = 256, ngrams: tuple[int, ...] = (2, 3), concepts: dict[str, tuple[str, ...]] = None,
+                 concept_weight: float = 4.0):
+        self.dim = dim
+        self.ngrams = ngrams
+        self.concepts = CONCEPTS if concepts is None else concepts
+        self.concept_weight = concept_weight
+        # multi-word forms ('theme park') are matched on the joined tokens
+        self._forms = sorted(
+            ((form.casefold().replace(' ', ''), concept) for concept, forms in self.concepts.items() for form in forms),
+            key=lambda entry: -len(entry[0]),
+        )
+
+    @property
+    def signature(self) -> str:
+        """hash of the settings the vectors depend on, an index built with other settings is stale"""
+        settings = {'dim': self.dim, 'ngrams': list(self.ngrams), 'concepts': self.concepts,
+                    'concept_weight': self.concept_weight}
+        return hashlib.sha256(json.dumps(settings, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:16]
+
+    def features(self, text: str) -> list[str]:
+        features = []
+        for token in _TOKEN.findall(text.casefold()):
+            features.append(token)
+            padded = f"<{token}>"
+            for n in self.ngrams:
+                features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return features
+
+    def concept_features(self, text: str) -> list[str]:
+        tokens = _TOKEN.findall(text.casefold())
+        found = []
+        for i, token in enumerate(tokens):
+            pair = token + tokens[i + 1] if i + 1 < len(tokens) else token
+            found.extend(dict.fromkeys(
+                f"#{concept}" for form, concept in self._forms if token.startswith(form) or pair == form
+            ))
+        return found
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self.features(text):
+            digest = zlib.crc32(feature.encode())
+            vector[digest % self.dim] += 1.0 if digest & 0x80000000 else -1.0
+        for feature in self.concept_features(text):
+            digest = zlib.crc32(feature.encode())
+            vector[digest % self.dim] += self.concept_weight if digest & 0x80000000 else -self.concept_weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([self.embed(text) for text in texts])
+
+
+def product_text(product: Product) -> str:
+    return f"{product.name} {product.description}"
+
+
+def catalog_fingerprint(products: list[Product]) -> dict:
+    """row count, highest code and content hash of the products, independent of their order"""
+    digest = hashlib.sha256()
+    for product in sorted(products):
+        digest.update(json.dumps(product, ensure_ascii=False).encode())
+        digest.update(b'\n')
+    return {
+        'rows': len(products),
+        'max_code': max((product.code for product in products), default=None),
+        'sha256': digest.hexdigest(),
+    }
+
+
+class ProductVectorIndex:
+    """
+    Embedding matrix of the product catalog for top-k cosine search.
+
+    Rows are stored sorted by price, so a `max_price` filter is a prefix of the matrix found with
+    searchsorted and only that prefix is scored. The matrix, codes and prices are .npy files opened
+    memory-mapped, the OS page cache shares them between server processes. `index.json` next to them records
+    the embedding dim, the embedder signature and the fingerprint of the catalog the index was built from.
+    Products scoring at most `min_score` are unrelated to the query (hash collisions) and never returned.
+    """
+
+    FILES = ('vectors.npy', 'codes.npy', 'prices.npy')
+    METADATA = 'index.json'
+    MIN_SCORE = 0.1
+
+    def __init__(self, embedder: HashedNgramEmbedder, vectors: np.ndarray, codes: np.ndarray, prices: np.ndarray,
+                 min_score: float = MIN_SCORE):
+        self.embedder = embedder
+        self.vectors = vectors
+        self.codes = codes
+        self.prices = prices
+        self.min_score = min_score
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @classmethod
+    def build(cls, products: list[Product], embedder: HashedNgramEmbedder, directory: Optional[str] = None,
+              vectors: Optional[np.ndarray] = None, fingerprint: Optional[dict] = None) -> 'ProductVectorIndex':
+        """
+        Embed the products (or take precomputed `vectors` in product order) and sort them by price.
+        With a directory the arrays and their metadata (dim, embedder signature, `fingerprint`) are written there
+        and reopened memory-mapped.
+        """
+        prices = np.fromiter((product.price for product in products), dtype=np.int64, count=len(products))
+        order = np.argsort(prices, kind='stable')
+        codes = np.array([product.code for product in products])[order]
+        if vectors is None:
+            vectors = embedder.embed_many([product_text(product) for product in products])
+        vectors = np.ascontiguousarray(vectors[order], dtype=np.float32)
+        prices = prices[order]
+        if directory is None:
+            return cls(embedder, vectors, codes, prices)
+
+        os.makedirs(directory, exist_ok=True)
+        for name, array in zip(cls.FILES, (vectors, codes, prices)):
+            np.save(os.path.join(directory, name), array)
+        with open(os.path.join(directory, cls.METADATA), 'w') as f:
+            json.dump({'dim': embedder.dim, 'embedder': embedder.signature, 'rows': len(codes), **(fingerprint or {})}, f)
+        return cls.load(directory, embedder)
+
+    @classmethod
+    def load(cls, directory: str, embedder: HashedNgramEmbedder) -> 'ProductVectorIndex':
+        vectors, codes, prices = (np.load(os.path.join(directory, name), mmap_mode='r') for name in cls.FILES)
+        if vectors.shape[1] != embedder.dim:
+            raise ValueError(f"index at [{directory}] has dim {vectors.shape[1]}, embedder has {embedder.dim}")
+        return cls(embedder, vectors, codes, prices)
+
+    @classmethod
+    def exists(cls, directory: str) -> bool:
+        return all(os.path.exists(os.path.join(directory, name)) for name in cls.FILES)
+
+    @classmethod
+    def metadata(cls, directory: str) -> dict:
+        """dim and catalog fingerprint the index at the directory was built with, empty when not recorded"""
+        try:
+            with open(os.path.join(directory, cls.METADATA)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def search(self, query: str, k: int = 5, max_price: Optional[int] = None) -> list[tuple[str, float]]:
+        """
+        Top-k products by cosine similarity to the query, optionally only those priced <= max_price.
+        Products scoring at most `min_score` are left out, a query matching nothing returns an empty list.
+
+        Returns:
+            list[tuple[str, float]]: product code and score, best first
+        """
+        end = len(self.codes) if max_price is None else int(np.searchsorted(self.prices, max_price, side='right'))
+        if end == 0 or k <= 0:
+            return []
+        scores = self.vectors[:end] @ self.embedder.embed(query)
+        candidates = np.flatnonzero(scores > self.min_score)
+        k = min(k, len(candidates))
+        if k == 0:
+            return []
+        top = candidates[np.argpartition(scores[candidates], -k)[-k:]]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(str(self.codes[i]), float(scores[i])) for i in top]
+
+
+def load_vector_index(catalog: ProductCatalog, directory: Optional[str] = None) -> ProductVectorIndex:
+    """
+    Open the precomputed index at PRODUCT_INDEX_PATH, or build it from the catalog when it is missing
+    or out of date: built with another PRODUCT_EMBEDDING_DIM or embedder version, or from a catalog with other
+    rows, another highest code or other content. Without a path the index is kept in memory.
+    PRODUCT_SEARCH_MIN_SCORE sets the score a product has to exceed to be returned.
+    """
+    embedder = HashedNgramEmbedder(dim=int(os.environ.get('PRODUCT_EMBEDDING_DIM', 256)))
+    min_score = float(os.environ.get('PRODUCT_SEARCH_MIN_SCORE', ProductVectorIndex.MIN_SCORE))
+    directory = directory or os.environ.get('PRODUCT_INDEX_PATH')
+    products = list(catalog.iter_products())
+    if not directory:
+        index = ProductVectorIndex.build(products, embedder)
+    else:
+        fingerprint = catalog_fingerprint(products)
+        index = None
+        if ProductVectorIndex.exists(directory) and ProductVectorIndex.metadata(directory) == {
+            'dim': embedder.dim, 'embedder': embedder.signature, **fingerprint
+        }:
+            try:
+                index = ProductVectorIndex.load(directory, embedder)
+            except ValueError:
+                # the arrays do not match their metadata, rebuild them
+                pass
+        if index is None:
+            index = ProductVectorIndex.build(products, embedder, directory, fingerprint=fingerprint)
+    index.min_score = min_score
+    return index
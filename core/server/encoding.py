@@ -0,0 +1,56 @@
+import base64
+import json
+import os
+from typing import Any, Optional
+
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.tool import ToolResult, TextContent
+
+
+class ResultEncoding:
+    """
+    Wire form of tool results, from the environment:
+    - TOOL_RESULT_ENCODING: `structured_only` (default) sends only `structuredContent` (`{"result": ...}`), the
+      client derives text from it when it needs it (core/client `common.mcp.result.result_text`); `structured`
+      adds one compact JSON text block of it, for third-party clients reading text content only; `json` sends
+      only the compact JSON text block; `both` sends a Python repr text block plus the structured content
+      (previous behaviour, roughly twice the bytes)
+    """
+    mode = os.environ.get('TOOL_RESULT_ENCODING', 'structured_only')
+
+
+def to_json(value: Any) -> str:
+    """compact canonical JSON, non-ASCII kept as UTF-8"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def tool_result(result: Any, **extra: Any) -> ToolResult:
+    """
+    Result of a tool in the configured encoding. `extra` fields (e.g. `next_cursor`) are sent next to `result`.
+    """
+    payload = {'result': result, **extra}
+    mode = ResultEncoding.mode
+    if mode == 'structured_only':
+        return ToolResult(content=[], structured_content=payload)
+    text = result if isinstance(result, str) and not extra else to_json(payload if extra else result)
+    if mode == 'structured':
+        return ToolResult(content=TextContent(type="text", text=text), structured_content=payload)
+    if mode == 'json':
+        return ToolResult(content=TextContent(type="text", text=text))
+    if mode == 'both':
+        return ToolResult(content=TextContent(type="text", text=f"{result}"), structured_content=payload)
+    raise ValueError(f"unknown tool result encoding [{mode}]")
+
+
+def encode_cursor(*key: Any) -> str:
+    """opaque pagination cursor holding the sort key of the last returned item"""
+    return base64.urlsafe_b64encode(to_json(key).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[list]:
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise ToolError(f"invalid cursor [{cursor}]")
@@ -0,0 +1,44 @@
+import importlib.util
+import os
+
+from fastmcp import FastMCP
+
+import alpha
+import beta
+from batch import register_batch_tool
+from metrics import register_metrics
+
+
+def _import_resource_server():
+    """`resource.py` by path: `import resource` may resolve to (or shadow) the standard library module"""
+    spec = importlib.util.spec_from_file_location(
+        'mcp_server_resource', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resource.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+resource = _import_resource_server()
+
+mcp = FastMCP(
+    name="MCP gateway 🚀",
+    instructions="""
+        Single endpoint of the alpha (user information), beta (travel products) and resource servers.
+        Tools are namespaced with the server name, e.g. `alpha_get_user_name`.
+    """,
+)
+
+# in-process mounts: a call is forwarded to the server object without another HTTP hop,
+# each server keeps its own middleware and metrics (`data://alpha/app-status`, ...)
+mcp.mount(alpha.mcp, prefix='alpha')
+mcp.mount(beta.mcp, prefix='beta')
+mcp.mount(resource.mcp, prefix='resource')
+
+# one `batch_call` for the whole gateway, it can mix tools of every mounted server
+register_batch_tool(mcp)
+register_metrics(mcp)
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -0,0 +1,232 @@
+import json
+import os
+import random
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from fastmcp import FastMCP, Context
+from fastmcp.server.middleware import Middleware, MiddlewareContext, CallNext
+from fastmcp.tools.tool import ToolResult
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+# upper bounds in seconds of the latency histogram, Prometheus style (cumulative, plus +Inf)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# messages logged by the running tool call, flushed by ToolMetricsMiddleware
+_call_log: ContextVar[Optional[list[str]]] = ContextVar('tool_call_log', default=None)
+
+
+class ToolStats:
+    """counters and latency histogram of one tool"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def record(self, latency: float, request_bytes: int, response_bytes: int, error: bool) -> None:
+        self.calls += 1
+        self.errors += error
+        self.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.latency_sum += latency
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+
+    def quantile(self, q: float) -> Optional[float]:
+        """upper bound of the bucket holding the q-quantile, None without calls or above the last bound"""
+        if not self.calls:
+            return None
+        rank = q * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def to_dict(self) -> dict[str, Any]:
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None else round(seconds * 1000, 3)
+
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'latency_avg_ms': ms(self.latency_sum / self.calls) if self.calls else None,
+            'latency_p50_ms': ms(self.quantile(0.5)),
+            'latency_p95_ms': ms(self.quantile(0.95)),
+            'latency_p99_ms': ms(self.quantile(0.99)),
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+        }
+
+
+class ToolMetrics:
+    """per-tool metrics of one server process"""
+
+    def __init__(self, server: str):
+        self.server = server
+        self.started = time.time()
+        self.tools: dict[str, ToolStats] = {}
+
+    def record(self, tool: str, latency: float, request_bytes: int, response_bytes: int, error: bool) -> None:
+        stats = self.tools.get(tool)
+        if stats is None:
+            stats = self.tools[tool] = ToolStats()
+        stats.record(latency, request_bytes, response_bytes, error)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            'status': 'ok',
+            'name': self.server,
+            'uptime': round(time.time() - self.started, 1),
+            'calls': sum(stats.calls for stats in self.tools.values()),
+            'errors': sum(stats.errors for stats in self.tools.values()),
+            'tools': {tool: stats.to_dict() for tool, stats in sorted(self.tools.items())},
+        }
+
+    def prometheus(self) -> str:
+        """metrics in the Prometheus text exposition format"""
+        server = _label(self.server)
+        lines = [
+            '# HELP mcp_server_uptime_seconds Seconds since the server started.',
+            '# TYPE mcp_server_uptime_seconds gauge',
+            f'mcp_server_uptime_seconds{{server="{server}"}} {time.time() - self.started:.3f}',
+        ]
+        counters = (
+            ('mcp_tool_calls_total', 'Tool calls.', 'calls'),
+            ('mcp_tool_errors_total', 'Tool calls that failed.', 'errors'),
+            ('mcp_tool_request_bytes_total', 'JSON bytes of tool arguments.', 'request_bytes'),
+            ('mcp_tool_response_bytes_total', 'Bytes of tool results (text and structured content).', 'response_bytes'),
+        )
+        tools = sorted(self.tools.items())
+        for metric, help_text, attribute in counters:
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} counter']
+            lines += [f'{metric}{{server="{server}",tool="{_label(tool)}"}} {getattr(stats, attribute)}'
+                      for tool, stats in tools]
+
+        lines += ['# HELP mcp_tool_duration_seconds Tool call latency.', '# TYPE mcp_tool_duration_seconds histogram']
+        for tool, stats in tools:
+            labels = f'server="{server}",tool="{_label(tool)}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), stats.buckets):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'mcp_tool_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'mcp_tool_duration_seconds_sum{{{labels}}} {stats.latency_sum:.6f}')
+            lines.append(f'mcp_tool_duration_seconds_count{{{labels}}} {stats.calls}')
+        return '\n'.join(lines) + '\n'
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _json_size(value: Any) -> int:
+    if value is None:
+        return 0
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str).encode())
+
+
+def _result_size(result: ToolResult) -> int:
+    size = _json_size(result.structured_content)
+    for block in result.content:
+        text = getattr(block, 'text', None)
+        size += len(text.encode()) if text is not None else _json_size(block.model_dump(mode='json'))
+    return size
+
+
+class ToolLogConfig:
+    """
+    How tool log messages (`log_info`) reach the client, from the environment:
+    - TOOL_LOG_MODE: `all` sends every message as its own notification (previous behaviour),
+      `buffered` sends the messages of a call as one notification when it ends,
+      `sampled` does the same for a TOOL_LOG_SAMPLE_RATE fraction of calls and for every failed call,
+      `off` sends nothing
+    - TOOL_LOG_SAMPLE_RATE: fraction of calls logged in `sampled` mode
+    """
+    mode = os.environ.get('TOOL_LOG_MODE', 'sampled')
+    sample_rate = float(os.environ.get('TOOL_LOG_SAMPLE_RATE', 0.01))
+
+
+async def log_info(ctx: Optional[Context], message: str) -> None:
+    """log a tool message according to ToolLogConfig, instead of `await ctx.info(...)`"""
+    buffer = _call_log.get()
+    if buffer is not None and ToolLogConfig.mode != 'all':
+        buffer.append(message)
+    elif ctx is not None and ToolLogConfig.mode != 'off':
+        await ctx.info(message)
+
+
+class ToolMetricsMiddleware(Middleware):
+    """
+    Records calls, errors, latency and payload sizes of every tool call into ToolMetrics,
+    and flushes the messages the call logged with `log_info`.
+    """
+
+    def __init__(self, metrics: ToolMetrics):
+        self.metrics = metrics
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: CallNext) -> ToolResult:
+        name = context.message.name
+        request_bytes = _json_size(context.message.arguments)
+        token = _call_log.set([])
+        start = time.perf_counter()
+        error = False
+        response_bytes = 0
+        try:
+            result = await call_next(context)
+            response_bytes = _result_size(result)
+            return result
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.metrics.record(name, time.perf_counter() - start, request_bytes, response_bytes, error)
+            messages = _call_log.get()
+            _call_log.reset(token)
+            await self._flush(context.fastmcp_context, name, messages, error)
+
+    @staticmethod
+    async def _flush(ctx: Optional[Context], name: str, messages: list[str], error: bool) -> None:
+        mode = ToolLogConfig.mode
+        if not messages or ctx is None or mode in ('all', 'off'):
+            return
+        if mode == 'sampled' and not error and random.random() >= ToolLogConfig.sample_rate:
+            return
+        try:
+            await ctx.info(f"[{name}] " + ' | '.join(messages))
+        except Exception:
+            # the client may already be gone, logs never fail a call
+            pass
+
+
+def register_metrics(mcp: FastMCP) -> ToolMetrics:
+    """
+    Add the metrics middleware to a server and publish its metrics live, as the `data://app-status`
+    resource and as Prometheus text at `GET /metrics` (HTTP transport).
+    """
+    metrics = ToolMetrics(mcp.name)
+    mcp.add_middleware(ToolMetricsMiddleware(metrics))
+
+    @mcp.resource(
+        uri="data://app-status",
+        name="ApplicationStatus",
+        description="Live status of the server: uptime and per-tool calls, errors, latency and payload sizes.",
+        mime_type="application/json",
+        tags={"alpha", "beta"},
+        meta={"version": "3.0", "team": "infrastructure"}
+    )
+    async def get_application_status() -> dict:
+        return metrics.status()
+
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def prometheus_metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
+    return metrics
@@ -1,5 +1,7 @@
 from fastmcp import FastMCP
 
+from metrics import register_metrics
+
 mcp = FastMCP(
     name="MCP server Resource 🚀",
     instructions="""
@@ -7,15 +9,5 @@ mcp = FastMCP(
     """,
 )
 
-
-@mcp.resource(
-    uri="data://app-status",  # Explicit URI (required)
-    name="ApplicationStatus",  # Custom name
-    description="Provides the current status of the application.",  # Custom description
-    mime_type="application/json",  # Explicit MIME type
-    tags={"alpha", "beta"},  # Categorization tags
-    meta={"version": "2.1", "team": "infrastructure"}  # Custom metadata
-)
-async def get_application_status() -> dict:
-    """ Currently not in use anywhere """
-    return {"status": "ok", "uptime": 12345, "name": mcp.name}  # Example usage
+# `data://app-status`: live uptime and per-tool metrics of this server (alpha and beta publish their own)
+register_metrics(mcp)
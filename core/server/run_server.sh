@@ -1,4 +1,11 @@
 #!/bin/bash
+# usage: ./run_server.sh           gateway mounting alpha, beta and resource (port 9010)
+#        ./run_server.sh direct    alpha, beta and resource as separate servers (ports 9011-9013)
+
+if [ "$1" != "direct" ]; then
+    echo "Starting MCP gateway (port 9010)..."
+    exec fastmcp run gateway.py --transport http --port 9010
+fi
 
 # Handle Ctrl+C signal
 trap 'echo -e "\nShutting down all servers..."; kill $PID_ALPHA $PID_BETA $PID_RESO 2>/dev/null; exit 0' SIGINT
@@ -21,4 +28,4 @@ echo "Beta PID: $PID_BETA"
 echo "Resource PID: $PID_RESO"
 
 # Wait until processes terminate
-wait
\ No newline at end of file
+wait
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the server modules import each other as top-level modules, like `fastmcp run` does from core/server
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
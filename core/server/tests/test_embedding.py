@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from fastmcp import Client
+
+import beta
+from beta import PROD_INFO
+from catalog import InMemoryProductCatalog, Product, load_catalog
+from embedding import HashedNgramEmbedder, ProductVectorIndex, load_vector_index
+
+
+@pytest.fixture(scope='module')
+def index() -> ProductVectorIndex:
+    return ProductVectorIndex.build(list(load_catalog(PROD_INFO).iter_products()), HashedNgramEmbedder())
+
+
+@pytest.mark.parametrize('query, code', [
+    ('relaxing beach resort', 'BALI004'),
+    ('해변 휴양', 'BALI004'),
+    ('풀빌라 스파', 'BALI004'),
+    ('theme park in tokyo', 'TOKYO002'),
+    ('mountain hiking', 'JEJU001'),
+    ('museum tour in paris', 'EURO003'),
+    ('호이안 마사지', 'VIET005'),
+])
+def test_search_ranks_the_matching_package_first(index, query, code):
+    assert index.search(query, k=3)[0][0] == code
+
+
+def test_search_drops_unrelated_products(index):
+    hits = index.search('relaxing beach resort', k=3, max_price=1_300_000)
+    assert hits[0][0] == 'BALI004'
+    assert all(score > index.min_score for _, score in hits)
+    assert index.search('quantum chromodynamics', k=3) == []
+
+
+def test_search_products_tool_ranks_bali_first():
+    async def search() -> list[dict]:
+        async with Client(beta.mcp) as client:
+            result = await client.call_tool_mcp(
+                'search_products', {'query': 'relaxing beach resort', 'k': 3, 'max_price': 1_300_000}
+            )
+            return result.structuredContent['result']
+
+    assert asyncio.run(search())[0]['code'] == 'BALI004'
+
+
+def test_stale_index_is_rebuilt(tmp_path, monkeypatch):
+    catalog = InMemoryProductCatalog([Product('P1', 'apple', 100, 'red fruit'), Product('P2', 'pear', 50, 'green')])
+    load_vector_index(catalog, str(tmp_path))
+
+    monkeypatch.setenv('PRODUCT_EMBEDDING_DIM', '32')
+    assert load_vector_index(catalog, str(tmp_path)).vectors.shape == (2, 32)
+
+    edited = InMemoryProductCatalog([Product('P1', 'apple', 100, 'red fruit'), Product('P2', 'kiwi', 50, 'green')])
+    assert load_vector_index(edited, str(tmp_path)).search('kiwi', k=1)[0][0] == 'P2'
+    assert ProductVectorIndex.metadata(str(tmp_path))['max_code'] == 'P2'
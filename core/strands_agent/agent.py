@@ -1,15 +1,19 @@
 import logging
+import os
+import sys
 import uuid
 from typing import Literal
 
-from mcp.client.streamable_http import streamablehttp_client
 from pydantic import BaseModel, Field
 from strands import Agent
 from strands.models.openai import OpenAIModel
 from strands.tools.executors import ConcurrentToolExecutor
-from strands.tools.mcp.mcp_client import MCPClient, MCPAgentTool
 from strands.types.content import Message, ContentBlock
 
+# the MCP settings and transports are shared with the client app (core/client/common)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'client'))
+from common.mcp.agent_tools import StructuredResultText, ToolService  # noqa: E402
+
 # Configure the root strands logger
 logging.getLogger("strands").setLevel(logging.DEBUG)
 logging.basicConfig(
@@ -34,19 +38,6 @@ class ChatResponse(BaseModel):
     roomId: str = Field()
 
 
-class ToolService:
-    def __init__(self):
-        self.alpha = MCPClient(lambda: streamablehttp_client("http://localhost:9011/mcp"))
-        self.beta = MCPClient(lambda: streamablehttp_client("http://localhost:9012/mcp"))
-
-    def list_tools(self) -> list[MCPAgentTool]:
-        tools: list[MCPAgentTool] = []
-        with self.alpha, self.beta:
-            tools += self.alpha.list_tools_sync()
-            tools += self.beta.list_tools_sync()
-        return tools
-
-
 class PlanAndExecuteChatService:
     def __init__(self, request: PlanAndExecuteChattingRequest):
         self.request = request
@@ -62,11 +53,12 @@ class PlanAndExecuteChatService:
             model=model,
             tools=self.tool_service.list_tools(),
             tool_executor=ConcurrentToolExecutor(),
+            hooks=[StructuredResultText()],
             system_prompt="You are a helpful assistant."
         )
 
     async def complete(self) -> str:
-        with self.tool_service.alpha, self.tool_service.beta:
+        with self.tool_service:
             mms = Message(role='user', content=[ContentBlock(text=self.request.question)])
             result = self.llm([mms])
 